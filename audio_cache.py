@@ -0,0 +1,94 @@
+"""
+오디오 캐시 모듈
+- 비디오에서 추출한 오디오(MP3) 캐시 파일 이름과 추출 함수
+- 캐시 파일은 cache_manager의 audio 디렉토리에 파일 식별 키 이름으로 저장
+  (이름이 같은 다른 폴더의 비디오와 겹치지 않고, 비디오가 바뀌면 새로 추출)
+- pygame을 import하지 않음 (AudioManager와 일괄 준비(library_prepare) 작업 프로세스가 공유)
+- moviepy는 캐시가 없어 실제로 추출할 때만 import
+"""
+import os
+import threading
+
+from cache_manager import file_key
+from logger import get_logger
+
+logger = get_logger("AudioCache")
+
+
+def audio_cache_name(video_path):
+    """
+    추출된 오디오 캐시 파일 이름
+
+    Returns:
+        str: 파일 이름 (비디오 파일이 없으면 None)
+    """
+    key = file_key(video_path)
+    return f"{key}.mp3" if key else None
+
+
+def audio_cache_path(video_path, cache_dir):
+    """
+    추출된 오디오 캐시 파일 경로
+
+    Args:
+        video_path: 비디오 파일 경로
+        cache_dir: 캐시 디렉토리 (CacheManager.directory(AUDIO))
+
+    Returns:
+        str: 캐시 파일 경로 (존재 여부와 무관, 비디오 파일이 없으면 None)
+    """
+    name = audio_cache_name(video_path)
+    return os.path.join(cache_dir, name) if name else None
+
+
+def extract_audio_file(video_path, cache_path):
+    """
+    오디오 추출 (이미 있으면 재사용, 스레드/프로세스 안전)
+
+    Args:
+        video_path: 비디오 파일 경로
+        cache_path: 저장할 캐시 파일 경로 (None이면 비디오가 없어 추출하지 않음)
+
+    Returns:
+        tuple: (오디오 파일 경로 또는 None, 오디오 트랙이 없다고 확인되었는지)
+    """
+    if cache_path is None:
+        return None, False
+    try:
+        logger.info(f"Extracting audio from: {os.path.basename(video_path)}")
+
+        # 이미 추출된 파일이 있으면 재사용
+        if os.path.exists(cache_path):
+            logger.info(f"Using cached audio file: {cache_path}")
+            return cache_path, False
+
+        # moviepy로 오디오 추출 (import 비용이 커서 캐시가 없을 때만 로드)
+        from moviepy.editor import VideoFileClip
+        with VideoFileClip(video_path) as video_clip:
+            if video_clip.audio is None:
+                logger.warning("Video has no audio track")
+                return None, True
+
+            # 임시 파일에 쓴 뒤 교체 (중단되거나 동시에 추출해도 깨진 캐시를 남기지 않음)
+            partial_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.part.mp3"
+            try:
+                video_clip.audio.write_audiofile(
+                    partial_path,
+                    logger=None,  # moviepy 로그 비활성화
+                    verbose=False
+                )
+                os.replace(partial_path, cache_path)
+            finally:
+                # 교체 전에 실패하면 쓰다 만 임시 파일 정리
+                if os.path.exists(partial_path):
+                    try:
+                        os.remove(partial_path)
+                    except OSError:
+                        pass
+
+        logger.info(f"Audio extracted successfully: {cache_path}")
+        return cache_path, False
+
+    except Exception as e:
+        logger.error(f"Failed to extract audio: {e}", exc_info=True)
+        return None, False
@@ -3,12 +3,16 @@
 - 비디오에서 오디오 추출 및 캐싱
 - pygame.mixer 기반 오디오 재생 관리
 - 비디오/오디오 싱크 유지
+- 캐시가 없으면 백그라운드 스레드에서 추출 (첫 프레임 표시를 막지 않음)
+- 추출한 오디오는 cache_manager가 용량 예산/할당량 안에서 관리 (매니페스트로 조회)
 - Context Manager로 안전한 리소스 관리
 """
 import os
 import tempfile
+import threading
 import pygame
-from moviepy.editor import VideoFileClip
+from audio_cache import audio_cache_name, audio_cache_path, extract_audio_file
+from cache_manager import AUDIO
 from logger import get_logger
 
 logger = get_logger("AudioManager")
@@ -19,30 +23,60 @@ class AudioManager:
     오디오 추출 및 재생 관리 클래스
 
     개선사항:
-    1. 오디오 추출 캐싱 (temp 폴더 활용)
+    1. 오디오 추출 캐싱 (CacheManager, 없으면 temp 폴더)
     2. 싱크 유지를 위한 volume 조절 (stop 대신)
     3. Context Manager 패턴으로 안전한 리소스 정리
     4. 재시작/루프 시 싱크 유지
     """
 
-    def __init__(self):
-        """AudioManager 초기화"""
+    def __init__(self, cache=None):
+        """
+        AudioManager 초기화
+
+        Args:
+            cache: CacheManager (None이면 임시 폴더에 저장하고 용량을 관리하지 않음)
+        """
         # pygame.mixer 초기화
-        if not pygame.mixer.get_init():
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
-            logger.info("pygame.mixer initialized")
+        self._init_mixer()
 
         # 오디오 상태
         self.audio_file_path = None
         self.has_audio = False
         self.volume = 1.0
         self.muted = False
+        self.start_offset = 0.0  # play()/rewind() 시점의 미디어 위치 (초)
+
+        # 백그라운드 로드 (cleanup/재로드 시 이전 로드 결과는 버림)
+        self.load_generation = 0
+        self.loader_thread = None
+        self.lock = threading.Lock()
 
         # 캐시 디렉토리
-        self.temp_dir = tempfile.gettempdir()
+        self.cache = cache
+        self.cache_dir = cache.directory(AUDIO) if cache is not None else tempfile.gettempdir()
 
         logger.info("AudioManager initialized")
 
+    def _init_mixer(self):
+        """pygame.mixer 초기화 (deep idle에서 해제된 경우 재초기화)"""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+            logger.info("pygame.mixer initialized")
+
+    def release_mixer(self):
+        """
+        오디오 정지 및 pygame.mixer 해제 (deep idle)
+
+        오디오 장치와 디코딩 버퍼를 반환합니다. 다음 load_audio에서 자동으로 재초기화됩니다.
+        """
+        self.cleanup()
+        try:
+            if pygame.mixer.get_init():
+                pygame.mixer.quit()
+                logger.info("pygame.mixer released")
+        except Exception as e:
+            logger.error(f"Failed to release mixer: {e}")
+
     def extract_audio(self, video_path):
         """
         비디오에서 오디오 추출 (캐싱 포함)
@@ -53,38 +87,70 @@ class AudioManager:
         Returns:
             str: 추출된 오디오 파일 경로 (None이면 오디오 없음)
         """
-        try:
-            logger.info(f"Extracting audio from: {os.path.basename(video_path)}")
+        return self._extract(video_path)[0]
+
+    def _extract(self, video_path):
+        """
+        오디오 추출 (스레드 안전 - 인스턴스 상태를 바꾸지 않음)
+
+        Returns:
+            tuple: (오디오 파일 경로 또는 None, 오디오 트랙이 없다고 확인되었는지)
+        """
+        name = audio_cache_name(video_path)
+        cached = self._lookup(name)
+        if cached:
+            return cached, False
+        result = extract_audio_file(video_path, audio_cache_path(video_path, self.cache_dir))
+        if result[0] and self.cache is not None:
+            self.cache.record(AUDIO, name)
+        return result
+
+    def _lookup(self, name):
+        """캐시된 오디오 파일 경로 (매니페스트 조회, 없으면 None)"""
+        if name is None:
+            return None
+        if self.cache is not None:
+            return self.cache.lookup(AUDIO, name)
+        path = os.path.join(self.cache_dir, name)
+        return path if os.path.exists(path) else None
 
-            # 캐시된 오디오 파일 경로 생성
-            video_basename = os.path.splitext(os.path.basename(video_path))[0]
-            audio_temp_path = os.path.join(self.temp_dir, f"wallpaper_audio_{video_basename}.mp3")
+    def has_cached_audio(self, video_path):
+        """추출된 오디오가 캐시에 있는지 확인"""
+        return self._lookup(audio_cache_name(video_path)) is not None
 
-            # 이미 추출된 파일이 있으면 재사용
-            if os.path.exists(audio_temp_path):
-                logger.info(f"Using cached audio file: {audio_temp_path}")
-                return audio_temp_path
+    def prepare_audio(self, video_path, has_audio=None):
+        """
+        오디오 캐시 미리 준비 (재생하지 않음, 백그라운드 스레드용)
 
-            # moviepy로 오디오 추출
-            with VideoFileClip(video_path) as video_clip:
-                if video_clip.audio is None:
-                    logger.warning("Video has no audio track")
-                    return None
+        Args:
+            video_path: 비디오 파일 경로
+            has_audio: 메타데이터 캐시의 오디오 트랙 유무 (False면 아무것도 하지 않음)
 
-                video_clip.audio.write_audiofile(
-                    audio_temp_path,
-                    logger=None,  # moviepy 로그 비활성화
-                    verbose=False
-                )
+        Returns:
+            bool: 오디오 트랙 유무 (확인하지 못했으면 None)
+        """
+        if has_audio is False:
+            return False
+        if self.has_cached_audio(video_path):
+            return True
+        audio_file_path, track_missing = self._extract(video_path)
+        if audio_file_path:
+            return True
+        return False if track_missing else None
 
-            logger.info(f"Audio extracted successfully: {audio_temp_path}")
-            return audio_temp_path
+    def get_cache_path(self, video_path):
+        """
+        추출된 오디오 캐시 파일 경로
 
-        except Exception as e:
-            logger.error(f"Failed to extract audio: {e}", exc_info=True)
-            return None
+        Args:
+            video_path: 비디오 파일 경로
+
+        Returns:
+            str: 캐시 파일 경로 (존재 여부와 무관)
+        """
+        return audio_cache_path(video_path, self.cache_dir)
 
-    def load_audio(self, video_path, volume=1.0, muted=False):
+    def load_audio(self, video_path, volume=1.0, muted=False, start_position=None, on_detected=None):
         """
         오디오 로드 및 재생 시작
 
@@ -92,32 +158,103 @@ class AudioManager:
             video_path: 비디오 파일 경로
             volume: 초기 볼륨 (0.0 ~ 1.0)
             muted: 음소거 여부
+            start_position: 재생 시작 위치를 돌려주는 함수 (초, None이면 처음부터)
+            on_detected: 오디오 트랙 유무가 확인되면 호출 (bool 인자, 메타데이터 캐시 갱신용)
+
+        Returns:
+            bool: 성공 여부
+        """
+        self.volume = volume
+        self.muted = muted
+        with self.lock:
+            self.load_generation += 1
+        return self._load_and_play(video_path, self.load_generation, start_position, on_detected)
+
+    def load_audio_async(self, video_path, volume=1.0, muted=False, start_position=None,
+                         has_audio=None, on_detected=None):
+        """
+        오디오 로드 (캐시가 없으면 백그라운드 추출 후 재생)
+
+        추출에는 moviepy import와 디코딩이 필요해 수백 ms 이상 걸리므로
+        첫 프레임 표시 경로에서 분리합니다. 추출이 끝나면 start_position()이
+        돌려주는 비디오 위치에서 재생을 시작해 싱크를 맞춥니다.
+
+        Args:
+            video_path: 비디오 파일 경로
+            volume: 초기 볼륨 (0.0 ~ 1.0)
+            muted: 음소거 여부
+            start_position: 재생 시작 위치를 돌려주는 함수 (초)
+            has_audio: 메타데이터 캐시의 오디오 트랙 유무 (False면 추출하지 않음, None이면 모름)
+            on_detected: 오디오 트랙 유무가 확인되면 호출 (bool 인자)
+
+        Returns:
+            bool: 동기 로드한 경우 성공 여부, 백그라운드 로드를 시작한 경우 False
+        """
+        if has_audio is False:
+            logger.info("No audio track (cached probe), skipping extraction")
+            return False
+
+        if self.has_cached_audio(video_path):
+            return self.load_audio(video_path, volume, muted, start_position, on_detected)
+
+        self.volume = volume
+        self.muted = muted
+        with self.lock:
+            self.load_generation += 1
+            generation = self.load_generation
+        self.loader_thread = threading.Thread(
+            target=self._load_and_play, args=(video_path, generation, start_position, on_detected),
+            daemon=True, name="AudioLoader"
+        )
+        self.loader_thread.start()
+        logger.info("Audio extraction started in background")
+        return False
+
+    def _load_and_play(self, video_path, generation, start_position, on_detected=None):
+        """
+        오디오 추출 → 로드 → 재생 (동기/백그라운드 공용)
+
+        Args:
+            video_path: 비디오 파일 경로
+            generation: 로드 세대 (그 사이 cleanup/재로드되었으면 재생하지 않음)
+            start_position: 재생 시작 위치를 돌려주는 함수 (초, None이면 처음부터)
+            on_detected: 오디오 트랙 유무가 확인되면 호출 (bool 인자)
 
         Returns:
             bool: 성공 여부
         """
         try:
             # 오디오 추출
-            self.audio_file_path = self.extract_audio(video_path)
+            audio_file_path, track_missing = self._extract(video_path)
 
-            if not self.audio_file_path or not os.path.exists(self.audio_file_path):
+            if not audio_file_path or not os.path.exists(audio_file_path):
                 logger.warning("No audio track available")
-                self.has_audio = False
+                if track_missing and on_detected:
+                    on_detected(False)
                 return False
 
-            # 오디오 로드
-            pygame.mixer.music.load(self.audio_file_path)
+            if on_detected:
+                on_detected(True)
 
-            # 볼륨 및 음소거 설정
-            self.volume = volume
-            self.muted = muted
+            with self.lock:
+                if generation != self.load_generation:
+                    logger.debug("Audio load superseded, discarding")
+                    return False
 
-            # 재생 시작 (음소거 시에도 싱크 유지를 위해 재생)
-            pygame.mixer.music.set_volume(0.0 if muted else volume)
-            pygame.mixer.music.play(loops=-1)  # 무한 반복
+                self.audio_file_path = audio_file_path
 
-            self.has_audio = True
-            logger.info(f"Audio loaded and playing. Muted: {muted}, Volume: {int(volume * 100)}%")
+                # 오디오 로드
+                self._init_mixer()
+                pygame.mixer.music.load(self.audio_file_path)
+
+                # 재생 시작 (음소거 시에도 싱크 유지를 위해 재생)
+                start = start_position() if start_position else 0.0
+                pygame.mixer.music.set_volume(0.0 if self.muted else self.volume)
+                pygame.mixer.music.play(loops=-1, start=start)  # 무한 반복
+                self.start_offset = start
+
+                self.has_audio = True
+            logger.info(f"Audio loaded and playing at {start:.2f}s. Muted: {self.muted}, Volume: {int(self.volume * 100)}%")
             return True
 
         except Exception as e:
@@ -132,11 +269,11 @@ class AudioManager:
         Args:
             volume: 볼륨 (0.0 ~ 1.0)
         """
+        # 백그라운드 로드 중이면 값만 저장 (재생 시작 시 적용)
+        self.volume = max(0.0, min(1.0, volume))
         if not self.has_audio:
             return
 
-        self.volume = max(0.0, min(1.0, volume))
-
         # 음소거 상태가 아니면 볼륨 적용
         if not self.muted:
             pygame.mixer.music.set_volume(self.volume)
@@ -153,11 +290,11 @@ class AudioManager:
         - stop() 대신 set_volume()을 사용하여 싱크 유지
         - 음소거 시에도 오디오는 백그라운드에서 계속 재생
         """
+        # 백그라운드 로드 중이면 값만 저장 (재생 시작 시 적용)
+        self.muted = muted
         if not self.has_audio:
             return
 
-        self.muted = muted
-
         if muted:
             pygame.mixer.music.set_volume(0.0)  # 싱크 유지를 위해 재생은 계속
             logger.info("Audio muted")
@@ -180,10 +317,31 @@ class AudioManager:
 
         try:
             pygame.mixer.music.rewind()
+            # rewind()는 get_pos()를 초기화하지 않으므로 현재 경과 시간을 기준점으로 보정
+            self.start_offset = -max(0, pygame.mixer.music.get_pos()) / 1000.0
             logger.debug("Audio rewound")
         except Exception as e:
             logger.error(f"Failed to rewind audio: {e}")
 
+    def seek(self, position):
+        """
+        재생 위치 이동 (비디오 위치에 맞춤)
+
+        Args:
+            position: 미디어 위치 (초)
+        """
+        if not self.has_audio:
+            return
+
+        try:
+            with self.lock:
+                pygame.mixer.music.play(loops=-1, start=position)
+                pygame.mixer.music.set_volume(0.0 if self.muted else self.volume)
+                self.start_offset = position
+            logger.info(f"Audio seeked to {position:.2f}s")
+        except Exception as e:
+            logger.error(f"Failed to seek audio: {e}")
+
     def stop(self):
         """오디오 정지"""
         if not self.has_audio:
@@ -195,6 +353,26 @@ class AudioManager:
         except Exception as e:
             logger.error(f"Failed to stop audio: {e}")
 
+    def get_position(self, duration):
+        """
+        현재 오디오 재생 위치 (초, 루프 반영)
+
+        Args:
+            duration: 미디어 길이 (초)
+
+        Returns:
+            float: 재생 위치 (오디오가 없거나 길이를 모르면 None)
+        """
+        if not self.has_audio or not duration:
+            return None
+        try:
+            elapsed = pygame.mixer.music.get_pos()
+        except Exception:
+            return None
+        if elapsed < 0:
+            return None
+        return (elapsed / 1000.0 + self.start_offset) % duration
+
     def get_busy(self):
         """
         오디오가 재생 중인지 확인
@@ -211,14 +389,17 @@ class AudioManager:
         """리소스 정리"""
         logger.info("Cleaning up audio resources")
 
-        try:
-            if self.has_audio:
-                pygame.mixer.music.stop()
-        except Exception as e:
-            logger.error(f"Error stopping audio: {e}")
+        with self.lock:
+            # 진행 중인 백그라운드 로드는 결과를 버리도록 세대 증가
+            self.load_generation += 1
+            try:
+                if self.has_audio:
+                    pygame.mixer.music.stop()
+            except Exception as e:
+                logger.error(f"Error stopping audio: {e}")
 
-        self.has_audio = False
-        self.audio_file_path = None
+            self.has_audio = False
+            self.audio_file_path = None
 
         logger.info("Audio resources cleaned up")
 
@@ -0,0 +1,5 @@
+"""
+벤치마크 모음
+- 저장소 루트에서 `python -m benchmarks.<모듈>` 형태로 실행
+- 결과는 JSON으로 stdout에 출력
+"""
@@ -0,0 +1,88 @@
+"""
+지연시간 계측 오버헤드 벤치마크
+
+PerformanceMonitor.record_latency()를 hot path에서 켜둘 수 있는지 확인:
+- 계측 1회 비용 (perf_counter 2회 + record_latency)
+- 프레임당 계측 횟수 × 1회 비용이 프레임 예산(1/target_fps)에서 차지하는 비율
+- get_stats() (백분위수 계산) 비용
+
+실행:
+    python -m benchmarks.bench_instrumentation [--iterations N] [--fps FPS]
+"""
+import argparse
+import json
+import sys
+import time
+
+from performance_monitor import PerformanceMonitor, LATENCY_STAGES
+
+# 프레임 예산 대비 허용 오버헤드 (0.5%)
+MAX_OVERHEAD_RATIO = 0.005
+
+
+def measure_empty_loop(iterations):
+    """비교 기준: 계측 없이 perf_counter 2회만 호출하는 루프"""
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for _ in range(iterations):
+        t0 = perf_counter()
+        _ = perf_counter() - t0
+    return (perf_counter() - start) / iterations
+
+
+def measure_record_latency(monitor, iterations):
+    """perf_counter 2회 + record_latency 1회 비용"""
+    perf_counter = time.perf_counter
+    record = monitor.record_latency
+    start = perf_counter()
+    for _ in range(iterations):
+        t0 = perf_counter()
+        record('convert', perf_counter() - t0)
+    return (perf_counter() - start) / iterations
+
+
+def measure_get_stats(monitor, repeats=20):
+    """모든 단계 버퍼가 가득 찬 상태에서 get_stats() 비용"""
+    for stage in LATENCY_STAGES:
+        for i in range(monitor.latency_capacity):
+            monitor.record_latency(stage, (i % 50) / 1000.0)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        monitor.get_stats()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency instrumentation overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--fps", type=int, default=24)
+    args = parser.parse_args(argv)
+
+    monitor = PerformanceMonitor(target_fps=args.fps, min_fps=15, max_fps=60)
+
+    baseline = measure_empty_loop(args.iterations)
+    instrumented = measure_record_latency(monitor, args.iterations)
+    stats_cost = measure_get_stats(monitor)
+
+    frame_budget = 1.0 / args.fps
+    per_frame = instrumented * len(LATENCY_STAGES)
+    overhead_ratio = per_frame / frame_budget
+
+    result = {
+        'benchmark': 'instrumentation_overhead',
+        'iterations': args.iterations,
+        'baseline_ns': baseline * 1e9,
+        'record_latency_ns': instrumented * 1e9,
+        'per_frame_us': per_frame * 1e6,
+        'frame_budget_ms': frame_budget * 1000.0,
+        'overhead_ratio': overhead_ratio,
+        'get_stats_ms': stats_cost * 1000.0,
+        'threshold_ratio': MAX_OVERHEAD_RATIO,
+        'passed': overhead_ratio < MAX_OVERHEAD_RATIO
+    }
+    print(json.dumps(result, indent=2))
+    return 0 if result['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
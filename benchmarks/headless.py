@@ -0,0 +1,183 @@
+"""
+헤드리스 실행 환경
+- SDL_VIDEODRIVER=dummy / SDL_AUDIODRIVER=dummy로 창/사운드 장치 없이 pygame 실행
+- Windows 전용 모듈(win32gui, win32api, win32con, winreg)은 Windows가 아니면 빈 스텁으로 대체
+- HeadlessWallpaperApp: 데스크톱 통합(WorkerW)과 마우스 스레드를 제외한 WallpaperApp
+- 설정 파일은 임시 디렉토리를 사용 (사용자 설정을 건드리지 않음)
+
+단독 실행 시 시작 시간 측정:
+    python -m benchmarks.headless startup <video> [--size 1280x720]
+"""
+import time
+
+_PROCESS_T0 = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import types
+
+_installed = False
+
+
+def _stub_module(name, constants=None):
+    """모든 속성 접근에 0을 반환하는 함수를 돌려주는 스텁 모듈"""
+    module = types.ModuleType(name)
+    for key, value in (constants or {}).items():
+        setattr(module, key, value)
+
+    def __getattr__(attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        return lambda *args, **kwargs: 0
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def install_headless_environment(config_dir=None):
+    """
+    헤드리스 환경 설정 (wallpaper_app 모듈 import 전에 호출)
+
+    Args:
+        config_dir: 설정 파일 디렉토리 (None이면 임시 디렉토리)
+
+    Returns:
+        str: 사용 중인 설정 파일 경로
+    """
+    global _installed
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    if sys.platform != 'win32':
+        for name in ('win32gui', 'win32api', 'winreg'):
+            sys.modules.setdefault(name, _stub_module(name))
+        sys.modules.setdefault('win32con', _stub_module('win32con', {'SMTO_NORMAL': 0}))
+
+    import config
+    from logger import setup_logger
+    setup_logger()  # 플레이어처럼 비동기 로깅 (로그 파일은 쓰지 않음)
+    if not _installed:
+        config_dir = config_dir or tempfile.mkdtemp(prefix="wallpaper_bench_")
+        config.CONFIG_FILE = os.path.join(config_dir, "wallpaper_config.json")
+        _installed = True
+    return config.CONFIG_FILE
+
+
+def create_headless_app(video_path, size=(1280, 720), startup_origin=None):
+    """
+    HeadlessWallpaperApp 생성
+
+    Args:
+        video_path: 재생할 비디오
+        size: 가상 작업 영역 크기 (width, height)
+        startup_origin: 시작 타임라인 기준 시각 (main.py처럼 프로세스 시작 시각을 넘김)
+
+    Returns:
+        WallpaperApp 하위 클래스 인스턴스
+    """
+    install_headless_environment()
+    import pygame
+    import wallpaper_app
+
+    class HeadlessWallpaperApp(wallpaper_app.WallpaperApp):
+        """데스크톱 통합/마우스 입력 없이 동작하는 WallpaperApp"""
+
+        def _setup_screen(self):
+            self.work_area_width, self.work_area_height = size
+            self.work_area_left = 0
+            self.work_area_top = 0
+            self.screen = pygame.display.set_mode(size, pygame.NOFRAME)
+            self.hwnd = 0
+
+        def _setup_desktop_integration(self):
+            self.workerw = None
+
+        def start_mouse_thread(self):
+            # 입력이 없으므로 idle 모드로 들어가지 않도록 설정
+            self.idle_threshold = float('inf')
+            self.extended_idle_threshold = float('inf')
+
+    return HeadlessWallpaperApp(video_path=video_path, startup_origin=startup_origin)
+
+
+def wait_first_frame(app, timeout=10.0):
+    """
+    첫 디코딩 프레임이 화면에 그려질 때까지 process_frame 반복 (포스터 프레임 제외)
+
+    Returns:
+        bool: 제한 시간 내 성공 여부
+    """
+    import pygame
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        app.process_frame()
+        if app.frame_presented:
+            pygame.display.flip()
+            return True
+    return False
+
+
+def measure_startup(video_path, size):
+    """
+    시작 단계별 시간 측정 (이 프로세스 기준, 초)
+
+    Returns:
+        dict: import, init, load, first_frame, total, timeline_ms (앱 시작 타임라인)
+    """
+    install_headless_environment()
+    t_import = time.perf_counter()
+    import wallpaper_app  # noqa: F401 (import 비용 측정)
+    import_done = time.perf_counter()
+
+    app = create_headless_app(video_path, size, startup_origin=_PROCESS_T0)
+    init_done = time.perf_counter()
+
+    loaded = app.load_video(video_path)
+    load_done = time.perf_counter()
+
+    presented = loaded and wait_first_frame(app)
+    first_frame_done = time.perf_counter()
+    if presented:
+        app.report_startup_timeline()
+    timeline = app.startup_timeline.elapsed()
+
+    app.cleanup()
+    return {
+        'interpreter_to_module': t_import - _PROCESS_T0,
+        'import': import_done - t_import,
+        'init': init_done - import_done,
+        'load': load_done - init_done,
+        'first_frame': first_frame_done - load_done,
+        'total': first_frame_done - _PROCESS_T0,
+        'presented': presented,
+        'timeline_ms': timeline
+    }
+
+
+def parse_size(text):
+    """'1280x720' → (1280, 720)"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless player helpers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    startup = sub.add_parser("startup", help="measure time to first presented frame")
+    startup.add_argument("video")
+    startup.add_argument("--size", default="1280x720")
+    args = parser.parse_args(argv)
+
+    if args.command == "startup":
+        result = measure_startup(args.video, parse_size(args.size))
+        # 마지막 줄은 JSON (상위 프로세스가 파싱)
+        print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
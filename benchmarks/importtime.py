@@ -0,0 +1,143 @@
+"""
+import 시간 회귀 검사 (python -X importtime)
+
+- 헤드리스 환경에서 별도 프로세스로 `import wallpaper_app`을 실행하고 stderr의 importtime 출력을 파싱
+- wallpaper_app 모듈 누적 import 시간과 가장 비싼 모듈 목록 보고
+- 자동 시작 경로에서 지연 로드해야 하는 모듈(tkinter, moviepy, http.server)이
+  import되면 실패
+- 진입점(main)은 단일 인스턴스 확인 전에 cv2/pygame/numpy를 import하면 실패
+
+단독 실행이 import 회귀 검사입니다 (기준을 넘거나 위반이 있으면 종료 코드 1).
+benchmarks.run의 import_time 항목은 같은 측정을 전체 결과에 포함할 뿐입니다.
+
+실행 (저장소 루트):
+    python -m benchmarks.importtime [--max-ms 400] [--repeats 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_MAX_MS = 400  # wallpaper_app 누적 import 시간 기준 (thresholds.json의 import_time.best_ms 보정 전 값과 같음)
+
+# 첫 프레임 전에 import되면 안 되는 모듈 (지연 로드 대상)
+LAZY_MODULES = ('tkinter', 'moviepy', 'http.server')
+
+# 진입점(main)이 import하면 안 되는 모듈 (두 번째 실행은 인자만 전달하고 종료)
+ENTRY_FORBIDDEN_MODULES = ('cv2', 'pygame', 'numpy') + LAZY_MODULES
+
+_IMPORT_SCRIPT = (
+    "from benchmarks.headless import install_headless_environment; "
+    "install_headless_environment(); import {module}"
+)
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        dict: {모듈 이름: (self_us, cumulative_us)} (같은 이름은 처음 값 유지)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 헤더 줄
+        name = parts[2].strip()
+        modules.setdefault(name, (int(parts[0]), int(parts[1])))
+    return modules
+
+
+def find_violations(modules, forbidden):
+    """import된 모듈 중 forbidden 목록(하위 모듈 포함)에 해당하는 이름"""
+    return sorted(
+        name for name in modules
+        if any(name == lazy or name.startswith(lazy + '.') for lazy in forbidden)
+    )
+
+
+def measure_import(module='wallpaper_app', forbidden=LAZY_MODULES):
+    """
+    별도 프로세스에서 모듈 import 시간 측정 (1회)
+
+    Returns:
+        dict: total_ms, top(누적 시간 상위 모듈), lazy_violations
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_SCRIPT.format(module=module)],
+        capture_output=True, text=True, cwd=root
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = parse_importtime(result.stderr)
+    _, cumulative = modules.get(module, (0, 0))
+    top = sorted(
+        ((name, cum) for name, (_, cum) in modules.items() if '.' not in name and name != module),
+        key=lambda item: item[1], reverse=True
+    )[:10]
+    violations = find_violations(modules, forbidden)
+    return {
+        'total_ms': cumulative / 1000.0,
+        'top': [{'module': name, 'ms': cum / 1000.0} for name, cum in top],
+        'lazy_violations': violations
+    }
+
+
+def bench_import_time(repeats=3, module='wallpaper_app'):
+    """
+    여러 번 측정하여 최솟값 보고 (디스크 캐시/노이즈 영향 최소화)
+
+    Returns:
+        dict: best_ms, runs_ms, top, lazy_violation_count, lazy_violations,
+              entry_ms, entry_violation_count, entry_violations (main 진입점)
+    """
+    runs = [measure_import(module) for _ in range(repeats)]
+    best = min(runs, key=lambda run: run['total_ms'])
+    entry = min((measure_import('main', ENTRY_FORBIDDEN_MODULES) for _ in range(repeats)),
+                key=lambda run: run['total_ms'])
+    return {
+        'module': module,
+        'best_ms': best['total_ms'],
+        'runs_ms': [run['total_ms'] for run in runs],
+        'top': best['top'],
+        'lazy_violation_count': len(best['lazy_violations']),
+        'lazy_violations': best['lazy_violations'][:20],
+        'entry_ms': entry['total_ms'],
+        'entry_violation_count': len(entry['lazy_violations']),
+        'entry_violations': entry['lazy_violations'][:20]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check import time of the player entry module")
+    parser.add_argument("--module", default="wallpaper_app")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS,
+                        help="fail if best cumulative import time exceeds this (0 disables)")
+    args = parser.parse_args(argv)
+
+    result = bench_import_time(args.repeats, args.module)
+    print(json.dumps(result, indent=2))
+
+    failures = []
+    if result['lazy_violation_count']:
+        failures.append(f"lazy modules imported: {', '.join(result['lazy_violations'])}")
+    if result['entry_violation_count']:
+        failures.append(f"entry point imports: {', '.join(result['entry_violations'])}")
+    if args.max_ms and result['best_ms'] > args.max_ms:
+        failures.append(f"import time {result['best_ms']:.1f} ms > {args.max_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print("PASS", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+FPS 컨트롤러 오프라인 재생
+
+controller_trace.csv (설정 controller_trace=true 시 로그 폴더에 기록됨)를
+여러 컨트롤러에 다시 입력하여 안정성과 예산 준수 여부를 비교합니다.
+
+부하 모델:
+    기록된 CPU/프레임 시간은 당시 fps, scale에서 측정된 값이므로
+    재생 중인 컨트롤러의 fps, scale에 맞춰 비례 보정합니다.
+        cost ∝ fps × scale²  (CPU)
+        cost ∝ scale²        (프레임 처리 시간)
+    끊김 비율(drop_rate)은 기록값을 그대로 사용합니다 (이전 트레이스에는 없으면 0).
+    --open-loop를 주면 보정 없이 기록값을 그대로 사용합니다.
+
+회귀 검사:
+    traces/에 저장된 기록 트레이스와 합성 트레이스를 기본 컨트롤러로 재생하고
+    진동 횟수, 예산 초과 비율, 데드라인 초과 비율을 thresholds.json의 controller.* 기준과 비교합니다
+    (benchmarks.run의 controller 항목, 또는 --check 단독 실행 - 실패 시 종료 코드 1).
+
+실행:
+    python -m benchmarks.replay_controller controller_trace.csv
+    python -m benchmarks.replay_controller --synthetic --controllers aimd,step
+    python -m benchmarks.replay_controller --check
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+
+from fps_controller import CONTROLLERS, create_controller
+
+# 저장소에 포함된 기록 트레이스 (controller_trace=true로 헤드리스 재생 중 기록, 중간에 CPU 부하 프로세스 실행)
+RECORDED_TRACE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces", "controller_720p_spikes.csv")
+
+
+def load_trace(path):
+    """트레이스 CSV 로드 → [{time, cpu, frame_time_ms, fps, scale}]"""
+    samples = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            samples.append({
+                'time': float(row['time']),
+                'cpu': float(row['cpu']),
+                'frame_time_ms': float(row['frame_time_ms']),
+                'drop_rate': float(row.get('drop_rate') or 0.0),
+                'fps': float(row['fps']),
+                'scale': float(row['scale'])
+            })
+    return samples
+
+
+def synthetic_trace(duration=600, interval=2.0, fps=30, scale=0.9):
+    """
+    합성 트레이스: 평상시 부하 + 주기적 백그라운드 부하 스파이크
+
+    - 기본 CPU 30%, 프레임 시간 12ms
+    - 120초마다 40초간 CPU +45%, 프레임 시간 +20ms
+    - 작은 사인파 노이즈
+    """
+    samples = []
+    t = 0.0
+    while t < duration:
+        spike = 1.0 if (t % 120) < 40 and t >= 60 else 0.0
+        noise = math.sin(t / 7.0) * 4.0
+        samples.append({
+            'time': t,
+            'cpu': 30.0 + 45.0 * spike + noise,
+            'frame_time_ms': 12.0 + 20.0 * spike + noise / 2.0,
+            'drop_rate': 8.0 * spike,
+            'fps': float(fps),
+            'scale': scale
+        })
+        t += interval
+    return samples
+
+
+def count_reversals(values):
+    """변화 방향이 바뀐 횟수 (진동 지표)"""
+    reversals = 0
+    last_direction = 0
+    for prev, cur in zip(values, values[1:]):
+        direction = (cur > prev) - (cur < prev)
+        if direction and last_direction and direction != last_direction:
+            reversals += 1
+        if direction:
+            last_direction = direction
+    return reversals
+
+
+def replay(samples, controller_name, cpu_budget, frame_deadline_ms, open_loop=False):
+    """
+    트레이스 하나를 컨트롤러 하나로 재생
+
+    Returns:
+        dict: 재생 결과 지표
+    """
+    if not samples:
+        return {'controller': controller_name, 'samples': 0}
+
+    base_fps = int(max(s['fps'] for s in samples))
+    base_scale = max(s['scale'] for s in samples)
+    controller = create_controller(
+        controller_name,
+        min_fps=15,
+        max_fps=max(15, base_fps),
+        min_scale=0.5,
+        max_scale=base_scale,
+        cpu_budget=cpu_budget,
+        frame_deadline_ms=frame_deadline_ms
+    )
+    controller.reset(base_fps, base_scale)
+
+    fps_values, scale_values = [], []
+    over_budget = 0
+    over_deadline = 0
+    fps, scale = controller.fps, controller.scale
+
+    for sample in samples:
+        if open_loop:
+            cpu = sample['cpu']
+            frame_time = sample['frame_time_ms']
+        else:
+            area_ratio = (scale / sample['scale']) ** 2
+            cpu = sample['cpu'] * (fps / sample['fps']) * area_ratio
+            frame_time = sample['frame_time_ms'] * area_ratio
+
+        deadline = frame_deadline_ms or 1000.0 / fps * 0.8
+        if cpu > cpu_budget:
+            over_budget += 1
+        if frame_time > deadline:
+            over_deadline += 1
+
+        sample_input = {'cpu': cpu, 'frame_time_ms': frame_time, 'drop_rate': sample.get('drop_rate', 0.0)}
+        fps, scale = controller.update(sample_input, sample['time'])
+        fps_values.append(fps)
+        scale_values.append(scale)
+
+    return {
+        'controller': controller_name,
+        'samples': len(samples),
+        'fps_reversals': count_reversals(fps_values),
+        'scale_reversals': count_reversals(scale_values),
+        'oscillations': count_reversals(fps_values) + count_reversals(scale_values),
+        'fps_changes': sum(1 for a, b in zip(fps_values, fps_values[1:]) if a != b),
+        'mean_fps': sum(fps_values) / len(fps_values),
+        'min_fps': min(fps_values),
+        'min_scale': min(scale_values),
+        'over_budget_ratio': over_budget / len(samples),
+        'over_deadline_ratio': over_deadline / len(samples),
+        'final_fps': fps_values[-1],
+        'final_scale': scale_values[-1]
+    }
+
+
+def bench_controller_replay(controllers=('aimd',), cpu_budget=50.0, trace_path=RECORDED_TRACE):
+    """
+    기록/합성 트레이스 재생 결과 (thresholds.json의 controller.<트레이스>.<컨트롤러>.* 기준 대상)
+
+    Returns:
+        dict: {'recorded': {컨트롤러: 결과}, 'synthetic': {컨트롤러: 결과}}
+    """
+    traces = {'recorded': load_trace(trace_path), 'synthetic': synthetic_trace()}
+    return {
+        trace_name: {name: replay(samples, name, cpu_budget, None) for name in controllers}
+        for trace_name, samples in traces.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay controller traces offline")
+    parser.add_argument("trace", nargs="?", help="controller_trace.csv path")
+    parser.add_argument("--synthetic", action="store_true", help="use a generated load-spike trace")
+    parser.add_argument("--controllers", default=",".join(CONTROLLERS), help="comma separated controller names")
+    parser.add_argument("--cpu-budget", type=float, default=50.0)
+    parser.add_argument("--frame-deadline-ms", type=float, default=None)
+    parser.add_argument("--open-loop", action="store_true", help="do not rescale load by fps/scale")
+    parser.add_argument("--check", action="store_true",
+                        help="replay the checked-in traces and fail on controller.* thresholds")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        from benchmarks.run import THRESHOLDS_FILE, check_thresholds
+        results = {'controller': bench_controller_replay(cpu_budget=args.cpu_budget)}
+        with open(THRESHOLDS_FILE, 'r', encoding='utf-8') as f:
+            checks = [check for check in json.load(f).get('checks', [])
+                      if check['metric'].startswith('controller.')]
+        verdicts = check_thresholds(results, {'checks': checks})
+        failed = [v for v in verdicts if v['passed'] is not True]
+        print(json.dumps(dict(results, thresholds=verdicts, passed=not failed), indent=2))
+        return 1 if failed else 0
+
+    if args.trace:
+        samples = load_trace(args.trace)
+    elif args.synthetic:
+        samples = synthetic_trace()
+    else:
+        parser.error("trace path or --synthetic is required")
+
+    results = [
+        replay(samples, name.strip(), args.cpu_budget, args.frame_deadline_ms, args.open_loop)
+        for name in args.controllers.split(",") if name.strip()
+    ]
+    print(json.dumps({'benchmark': 'controller_replay', 'results': results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
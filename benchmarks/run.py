@@ -0,0 +1,955 @@
+"""
+헤드리스 엔드투엔드 벤치마크
+
+측정 항목:
+- decode: ThreadedVideoCapture._reader 디코딩 처리량 (클립별 fps, decode p95)
+- main_loop: WallpaperApp.run() 메인 루프 프레임 처리 시간 p50/p95/p99,
+  단계별 지연시간 (process_frame의 convert/scale 포함), RSS 최고치
+- ui_render: UIManager.render 1회 비용
+- extract_audio: AudioManager.extract_audio 최초(추출)/캐시 재사용 시간 (moviepy 필요)
+- startup: 별도 프로세스에서 import → 첫 프레임 표시까지 시간 (시작 타임라인 포함)
+- deep_idle: deep idle 진입 전후 RSS, 복귀 후 첫 프레임까지 시간
+- playlist: 짧은 간격의 플레이리스트 재생 - prefetch 사용/낭비 횟수, 교체 구간 최대 프레임 시간,
+  크로스페이드 프레임당 비용
+- schedule: 주입한 시계로 시간대 전환 재현 - 전환 전 prefetch 사용 여부
+- input: 가상 마우스로 입력 스레드 실행 - 고정 50Hz 대비 적응형 폴링의 샘플 수/CPU/이동 감지 지연
+- control: 제어 서버 명령 왕복 시간 (재생 중, pause 후)
+- second_launch: 이미 실행 중일 때 `python main.py VIDEO`가 인자를 전달하고 끝나기까지 시간,
+  cv2/pygame/numpy import 여부
+- prepare: 라이브러리 일괄 준비 - 처음/다시 실행 시간, 준비한 클립의 첫 로드가 캐시를 쓰는지
+- thumbnails: 설정 창 썸네일 작업 풀 - 캐시 없이/캐시로 클립 폴더 썸네일을 준비하는 시간
+- cache: 디스크 캐시 관리자 - 예산/할당량 초과 여부, 매니페스트 조회 시간, 매니페스트 손실 후 복구
+- library: 라이브러리 카탈로그 - 가짜 비디오 파일 폴더의 첫 검색/재검색 시간, 인덱스 쿼리 시간
+- controller: 저장된 기록 트레이스와 합성 트레이스를 FPS 컨트롤러로 재생 - 진동 횟수, 예산/데드라인 초과 비율
+- import_time: python -X importtime으로 wallpaper_app 모듈 import 시간, 지연 로드 대상 모듈 import 여부
+  (main 진입점은 무거운 모듈을 import하지 않는지)
+
+결과는 JSON으로 출력하고 thresholds.json의 기준과 비교합니다 (회귀 시 종료 코드 1).
+시간 기준은 같은 머신에서 측정한 보정값(calibration: 720p 클립 cv2 디코딩 fps)으로 환산합니다.
+
+실행 (Linux, 저장소 루트):
+    python -m benchmarks.run [--quick] [--output result.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.headless import install_headless_environment, create_headless_app, parse_size, wait_first_frame
+from benchmarks import synthetic
+from benchmarks.importtime import ENTRY_FORBIDDEN_MODULES, bench_import_time, find_violations, parse_importtime
+from benchmarks.replay_controller import bench_controller_replay
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+
+class RssSampler:
+    """백그라운드에서 RSS를 주기적으로 샘플링하여 최고치 기록"""
+
+    def __init__(self, interval=0.05):
+        import psutil
+        self.process = psutil.Process(os.getpid())
+        self.interval = interval
+        self.peak = 0
+        self.stopped = False
+        self.thread = None
+
+    def _run(self):
+        while not self.stopped:
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self.thread = threading.Thread(target=self._run, daemon=True, name="RssSampler")
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stopped = True
+        self.thread.join()
+        return False
+
+
+def bench_decode(clips, duration):
+    """클립별 디코딩 처리량 (큐를 최대한 빨리 비우면서 측정)"""
+    from performance_monitor import PerformanceMonitor
+    from video_capture import ThreadedVideoCapture
+
+    results = {}
+    for name, clip in clips.items():
+        monitor = PerformanceMonitor(target_fps=clip['fps'], min_fps=1, max_fps=clip['fps'])
+        with RssSampler() as rss:
+            capture = ThreadedVideoCapture(
+                clip['path'], queue_size=60, target_fps=clip['fps'],
+                video_fps=clip['fps'], perf_monitor=monitor
+            )
+            with capture:
+                frames = 0
+                start = time.perf_counter()
+                while time.perf_counter() - start < duration:
+                    ret, _ = capture.read(timeout=1.0)
+                    if ret:
+                        frames += 1
+                elapsed = time.perf_counter() - start
+        decode = monitor.get_latency_stats().get('decode', {})
+        results[name] = {
+            'fps': frames / elapsed,
+            'decode_p95_ms': decode.get('p95', 0.0),
+            'loops': capture.loop_count,
+            'rss_peak_mb': rss.peak / 1e6
+        }
+    return results
+
+
+def measure_calibration(clip_path, frames=90, repeats=3):
+    """
+    보정용 기준 작업량: cv2로 클립을 직접 디코딩 (가장 빠른 회의 fps)
+
+    벤치마크 코드와 무관한 고정 작업이라 머신 속도와 실행 중 부하만 반영합니다.
+    """
+    import cv2
+
+    best = 0.0
+    for _ in range(repeats):
+        capture = cv2.VideoCapture(clip_path)
+        decoded = 0
+        start = time.perf_counter()
+        while decoded < frames:
+            ret, _ = capture.read()
+            if not ret:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                continue
+            decoded += 1
+        best = max(best, decoded / (time.perf_counter() - start))
+        capture.release()
+    return best
+
+
+def bench_calibration(runs_fps, reference_fps):
+    """
+    보정 결과 (벤치마크 전후로 측정한 값 중 느린 쪽 기준)
+
+    Returns:
+        dict: decode_fps, runs_fps, reference_fps,
+              factor (기준 머신보다 느린 배수, 1 이상 - 시간 기준에 곱함)
+    """
+    decode_fps = min(runs_fps)
+    factor = max(1.0, reference_fps / decode_fps) if reference_fps and decode_fps > 0 else 1.0
+    return {
+        'decode_fps': decode_fps,
+        'runs_fps': runs_fps,
+        'reference_fps': reference_fps,
+        'factor': factor
+    }
+
+
+def bench_main_loop(clips, names, duration, size):
+    """WallpaperApp.run()을 일정 시간 실행하고 PerformanceMonitor 통계 수집"""
+    results = {}
+    for name in names:
+        if name not in clips:
+            continue
+        app = create_headless_app(clips[name]['path'], size)
+        timer = threading.Timer(duration, lambda: setattr(app, 'running', False))
+        with RssSampler() as rss:
+            timer.start()
+            app.run()
+        timer.cancel()
+
+        stats = app.performance_monitor.get_stats()
+        latency = stats['latency']
+        frame = latency.get('frame', {})
+        results[name] = {
+            'frames': stats['total_frames'],
+            'fps': stats['total_frames'] / duration,
+            'frame_p50_ms': frame.get('p50', 0.0),
+            'frame_p95_ms': frame.get('p95', 0.0),
+            'frame_p99_ms': frame.get('p99', 0.0),
+            'stages_p95_ms': {stage: summary['p95'] for stage, summary in latency.items()},
+            'rss_peak_mb': rss.peak / 1e6
+        }
+    return results
+
+
+def bench_deep_idle(clip_path, size, warmup=2.0):
+    """
+    deep idle 메모리 절감과 복귀 지연시간
+
+    활성 재생 → idle → deep idle 진입을 check_idle_mode로 재현하고,
+    활동 복귀 후 디코딩 프레임이 다시 표시될 때까지의 시간을 측정합니다.
+    """
+    import gc
+    import psutil
+    import pygame
+
+    process = psutil.Process(os.getpid())
+    app = create_headless_app(clip_path, size)
+    app.load_video(app.video_path)
+    wait_first_frame(app)
+
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        app.process_frame()
+        pygame.display.flip()
+        app.clock.tick(app.performance_monitor.target_fps)
+    gc.collect()
+    rss_active = process.memory_info().rss
+
+    # idle + deep idle 진입 (임계값을 낮춰 한 번에 통과)
+    app.idle_threshold = 1.0
+    app.deep_idle_threshold = 2.0
+    app.extended_idle_threshold = float('inf')
+    app.last_activity_time = time.time() - 10.0
+    app.check_idle_mode()
+    entered = app.deep_idle and app.video_capture is None
+    gc.collect()
+    time.sleep(0.5)
+    rss_deep_idle = process.memory_info().rss
+
+    # 활동 복귀
+    restore_start = time.perf_counter()
+    app.last_activity_time = time.time()
+    app.check_idle_mode()
+    restored = time.perf_counter()
+    presented = wait_first_frame(app)
+    first_frame = time.perf_counter()
+
+    app.cleanup()
+    return {
+        'deep_idle_entered': entered,
+        'rss_active_mb': rss_active / 1e6,
+        'rss_deep_idle_mb': rss_deep_idle / 1e6,
+        'rss_released_mb': (rss_active - rss_deep_idle) / 1e6,
+        'restore_ms': (restored - restore_start) * 1000.0,
+        'restore_first_frame_ms': (first_frame - restore_start) * 1000.0,
+        'presented': presented
+    }
+
+
+def _run_with_settings(settings, video_path, duration, size, setup=None):
+    """
+    설정을 임시로 바꿔 WallpaperApp.run()을 duration초 실행
+
+    Args:
+        setup: app 생성 직후 호출할 함수 (예: 스케줄 시계 교체)
+
+    Returns:
+        WallpaperApp: 실행이 끝난 앱
+    """
+    import config
+    saved = config.load_config()
+    config.save_config(dict(saved, **settings))
+    try:
+        app = create_headless_app(video_path, size)
+        if setup:
+            setup(app)
+        timer = threading.Timer(duration, lambda: setattr(app, 'running', False))
+        timer.start()
+        app.run()
+        timer.cancel()
+    finally:
+        config.save_config(saved)
+    return app
+
+
+def _switch_stats(app):
+    """prefetch/전환 관련 통계 요약"""
+    stats = app.performance_monitor.get_stats()
+    latency = stats['latency']
+    frame = latency.get('frame', {})
+    prefetch = stats['prefetch']
+    return {
+        'frames': stats['total_frames'],
+        'prefetch_started': prefetch['started'],
+        'prefetch_used': prefetch['used'],
+        'prefetch_wasted': prefetch['wasted'],
+        'prefetch_failed': prefetch['failed'],
+        'prefetch_p50_ms': latency.get('prefetch', {}).get('p50', 0.0),
+        'prefetch_decode_p95_ms': latency.get('prefetch_decode', {}).get('p95', 0.0),
+        'crossfade_count': latency.get('crossfade', {}).get('count', 0),
+        'crossfade_p50_ms': latency.get('crossfade', {}).get('p50', 0.0),
+        'crossfade_p95_ms': latency.get('crossfade', {}).get('p95', 0.0),
+        'frame_p95_ms': frame.get('p95', 0.0),
+        'frame_max_ms': frame.get('max', 0.0)
+    }
+
+
+def bench_playlist(clip_paths, duration, size, interval=2.0, prefetch_lead=1.0):
+    """
+    플레이리스트 prefetch 효과
+
+    interval초마다 다음 클립으로 교체하도록 설정하고 WallpaperApp.run()을 실행해
+    prefetch가 교체에 사용되었는지, 교체 중 메인 루프 프레임 시간이 튀지 않는지 확인합니다.
+    """
+    app = _run_with_settings({
+        'playlist_enabled': True,
+        'playlist_items': list(clip_paths),
+        'playlist_advance': 'interval',
+        'playlist_interval': interval,
+        'playlist_prefetch_seconds': prefetch_lead
+    }, clip_paths[0], duration, size)
+    return _switch_stats(app)
+
+
+def bench_schedule(clip_paths, size, lead=2.0, switch_after=3.0):
+    """
+    시간대별 스케줄 전환
+
+    주입한 시계를 12:00 직전에서 시작해 실제 시간을 기다리지 않고 스케줄 전환을 재현하고,
+    전환 전에 다음 비디오가 미리 준비되어 교체에 사용되었는지 확인합니다.
+    """
+    import datetime
+    first, second = clip_paths[:2]
+    base = datetime.datetime(2026, 1, 1, 12, 0, 0) - datetime.timedelta(seconds=switch_after)
+    started = time.perf_counter()
+
+    def clock():
+        return base + datetime.timedelta(seconds=time.perf_counter() - started)
+
+    def use_clock(app):
+        # 시작 항목도 주입한 시계 기준으로 (run()이 video_path를 로드)
+        app.schedule.clock = clock
+        app.video_path = app.schedule.current_item()
+
+    app = _run_with_settings({
+        'schedule_enabled': True,
+        'schedule': [{'start': '00:00', 'video': first}, {'start': '12:00', 'video': second}],
+        'schedule_prefetch_seconds': lead
+    }, first, switch_after + 3.0, size, setup=use_clock)
+    result = _switch_stats(app)
+    result['switched'] = app.video_path == second
+    return result
+
+
+def bench_control(clip_path, size, other_path=None):
+    """
+    제어 명령 응답 지연 (localhost 제어 서버 → 프레임 경계 적용 → 응답)
+
+    재생 중(활성 루프)과 pause 후(idle 루프의 큐 대기)에 명령 왕복 시간을 측정합니다.
+    other_path가 있으면 pause 중 open이 deferred로 응답하는지, idle 상태의 open이
+    마우스 활동 없이 교체되는지 확인합니다.
+    """
+    from control_server import send_command
+
+    timings = {}
+    errors = []
+
+    def client(app):
+        deadline = time.perf_counter() + 10.0
+        while time.perf_counter() < deadline and not (app.control_server and app.frame_presented):
+            time.sleep(0.05)
+        if app.control_server is None:
+            errors.append("control server not started")
+            return
+        port = app.control_server.port
+        for command, value in (('stats', None), ('set-volume', 0.3), ('set-fps', 20), ('set-scale', 0.75),
+                               ('pause', None), ('set-volume', 0.4), ('resume', None)):
+            time.sleep(0.3)
+            start = time.perf_counter()
+            response = send_command(command, value, port=port)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            key = f"{command}_paused" if app.manual_pause and command != 'pause' else command
+            timings[key + '_ms'] = elapsed
+            if not response.get('ok'):
+                errors.append(f"{command}: {response.get('error')}")
+        time.sleep(0.3)
+        timings['resumed'] = not app.is_idle
+        monitor = app.performance_monitor
+        timings['applied'] = monitor.original_target_fps == 20 and monitor.scale == 0.75
+        if other_path is None:
+            return
+
+        app.last_activity_time = 0.0  # idle 타이머 만료
+        deadline = time.perf_counter() + 3.0
+        while time.perf_counter() < deadline and not app.is_idle:
+            time.sleep(0.05)
+        response = send_command('open', other_path, port=port)
+        deadline = time.perf_counter() + 5.0
+        while time.perf_counter() < deadline and app.video_path != other_path:
+            time.sleep(0.05)
+        timings['idle_open_switched'] = app.video_path == other_path
+        # 교체 준비 디코딩은 재생 중인 리더와 다른 'swap_*' 단계에 기록
+        timings['swap_decode_count'] = app.performance_monitor.get_stats()['latency'].get(
+            'swap_decode', {}).get('count', 0)
+
+        send_command('pause', port=port)
+        response = send_command('open', clip_path, port=port)
+        timings['paused_open_deferred'] = bool(response.get('ok') and response['result'].get('deferred'))
+        time.sleep(0.5)
+        timings['paused_open_held'] = app.video_path == other_path
+        send_command('resume', port=port)
+
+    def start_client(app):
+        threading.Thread(target=client, args=(app,), daemon=True, name="ControlClient").start()
+
+    app = _run_with_settings({'control_enabled': True, 'control_port': 0}, clip_path,
+                             5.0 if other_path is None else 12.0, size, setup=start_client)
+    result = dict(timings)
+    result['errors'] = errors
+    result['max_command_ms'] = max((v for k, v in timings.items() if k.endswith('_ms')), default=None)
+    return result
+
+
+_SECOND_LAUNCH_SCRIPT = (
+    "import runpy, sys; "
+    "from benchmarks.headless import install_headless_environment; "
+    "install_headless_environment({config_dir!r}); "
+    "sys.argv = ['main.py', {video!r}]; "
+    "runpy.run_path('main.py', run_name='__main__')"
+)
+
+
+def bench_second_launch(clip_path, repeats=3):
+    """
+    두 번째 실행 (단일 인스턴스)
+
+    이 프로세스가 인스턴스 잠금과 제어 서버를 잡고 있는 상태에서 `python main.py VIDEO`를
+    실행해 비디오 경로가 전달되는지, 종료까지 걸린 시간, 무거운 모듈 import 여부를 확인합니다.
+    """
+    import config
+    from control_server import ControlServer
+    from single_instance import LOCK_FILE_NAME, InstanceLock
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    lock = InstanceLock(os.path.join(config.get_data_dir(), LOCK_FILE_NAME))
+    if not lock.acquire():
+        return {'error': "instance lock is already held"}
+
+    received = []
+    server = ControlServer(lambda: {}, port=0)
+    server.start()
+    stop = threading.Event()
+
+    def apply_commands():
+        while not stop.is_set():
+            for command in server.wait(0.1):
+                received.append(command.value)
+                command.complete({'video': command.value})
+
+    applier = threading.Thread(target=apply_commands, daemon=True, name="ControlApplier")
+    applier.start()
+    saved = config.load_config()
+    config.save_config(dict(saved, control_enabled=True, control_port=server.port))
+    runs_ms = []
+    violations = []
+    exit_codes = []
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            # 같은 (임시) 설정 디렉토리 → 같은 잠금 파일과 제어 포트
+            script = _SECOND_LAUNCH_SCRIPT.format(config_dir=config.get_data_dir(), video=clip_path)
+            result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                                    capture_output=True, text=True, cwd=root)
+            runs_ms.append((time.perf_counter() - start) * 1000.0)
+            exit_codes.append(result.returncode)
+            violations = find_violations(parse_importtime(result.stderr), ENTRY_FORBIDDEN_MODULES)
+    finally:
+        config.save_config(saved)
+        stop.set()
+        applier.join(timeout=1.0)
+        server.stop()
+        lock.release()
+
+    return {
+        'best_ms': min(runs_ms),
+        'runs_ms': runs_ms,
+        'exit_codes': exit_codes,
+        'forwarded': received.count(os.path.abspath(clip_path)),
+        'heavy_import_count': len(violations),
+        'heavy_imports': violations[:20]
+    }
+
+
+def bench_prepare(clip_dir, clip_path, size, workers=2):
+    """
+    라이브러리 일괄 준비 (python main.py prepare)
+
+    합성 클립 폴더를 두 번 준비해 두 번째 실행이 모두 건너뛰는지 확인하고,
+    준비한 클립의 첫 로드가 프로브 캐시/포스터를 사용하는지 확인합니다.
+    """
+    import config
+    from library_catalog import CATALOG_FILE_NAME, LibraryCatalog
+    from library_prepare import prepare_library
+
+    first = prepare_library(clip_dir, workers=workers)
+    second = prepare_library(clip_dir, workers=workers)
+
+    app = create_headless_app(clip_path, size)
+    probe_cached = app.probe_cache.get(clip_path) is not None
+    poster_cached = app.poster_cache.has_poster(clip_path)
+    entry = LibraryCatalog(os.path.join(config.get_data_dir(), CATALOG_FILE_NAME)).get(clip_path) or {}
+    start = time.perf_counter()
+    app.load_video(clip_path, start_position=0.0)
+    presented = wait_first_frame(app)
+    first_frame_ms = (time.perf_counter() - start) * 1000.0
+    app.cleanup()
+
+    return {
+        'videos': first['total'],
+        'workers': workers,
+        'first_run_s': first['seconds'],
+        'prepared': first['prepared'],
+        'failed': first['failed'] + second['failed'],
+        'rerun_s': second['seconds'],
+        'rerun_prepared': second['prepared'],
+        'probe_cached': probe_cached,
+        'poster_cached': poster_cached,
+        'catalog_poster': entry.get('poster_path') is not None,
+        'catalog_duration': entry.get('duration'),
+        'first_frame_ms': first_frame_ms,
+        'presented': presented
+    }
+
+
+def bench_thumbnails(clip_dir):
+    """
+    설정 창 썸네일 그리드의 작업 풀 (Tk 없이 ThumbnailLoader만)
+
+    빈 캐시로 클립 폴더 썸네일을 요청해 생성 시간을 재고,
+    같은 캐시로 다시 요청해 캐시된 썸네일의 로드 시간을 잽니다.
+    """
+    import shutil
+    from cache_manager import CacheManager
+    from playlist import scan_folder
+    from thumbnail_grid import ThumbnailLoader
+
+    videos = scan_folder(clip_dir)
+    cache_root = tempfile.mkdtemp(prefix="wallpaper_bench_thumbs_")
+
+    def load_all():
+        loader = ThumbnailLoader(CacheManager(cache_root))
+        start = time.perf_counter()
+        for path in videos:
+            loader.request(path)
+        results = {}
+        while len(results) < len(videos):
+            for path, data in loader.poll():
+                results[path] = data
+            time.sleep(0.005)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        loader.close()
+        return elapsed_ms, results
+
+    try:
+        cold_ms, cold = load_all()
+        warm_ms, warm = load_all()
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    return {
+        'videos': len(videos),
+        'cold_ms': cold_ms,
+        'cold_per_video_ms': cold_ms / max(1, len(videos)),
+        'warm_ms': warm_ms,
+        'warm_per_video_ms': warm_ms / max(1, len(videos)),
+        'failed': sum(1 for data in warm.values() if not data),
+        'png_bytes_max': max((len(data) for data in warm.values() if data), default=0)
+    }
+
+
+def bench_cache(count=2000, file_bytes=4096, lookups=5000):
+    """
+    디스크 캐시 관리자 (CacheManager)
+
+    작은 예산/할당량으로 파일을 계속 기록해 LRU 제거가 한도를 지키는지 확인하고,
+    항목이 많을 때 매니페스트 조회 시간과 매니페스트를 잃은 뒤 다시 등록하는 시간을 잽니다.
+    """
+    import random
+    import shutil
+    from cache_manager import AUDIO, POSTER, CacheManager
+
+    root = tempfile.mkdtemp(prefix="wallpaper_bench_cache_")
+    budget = count * file_bytes // 2
+    quotas = {AUDIO: budget // 2}
+    try:
+        cache = CacheManager(root, budget, quotas)
+        over_budget = over_quota = 0
+        start = time.perf_counter()
+        for index in range(count):
+            artifact_type = AUDIO if index % 2 else POSTER
+            cache.write_bytes(artifact_type, f"{index:06d}.bin", b'\0' * file_bytes)
+            stats = cache.stats()
+            over_budget += stats['total_bytes'] > budget
+            over_quota += stats['types'].get(AUDIO, {}).get('bytes', 0) > quotas[AUDIO]
+        write_ms = (time.perf_counter() - start) * 1000.0 / count
+
+        names = [(AUDIO if index % 2 else POSTER, f"{index:06d}.bin") for index in range(count)]
+        start = time.perf_counter()
+        hits = sum(cache.lookup(*random.choice(names)) is not None for _ in range(lookups))
+        lookup_us = (time.perf_counter() - start) * 1e6 / lookups
+        cache.flush()
+        files = sum(usage['files'] for usage in cache.stats()['types'].values())
+
+        # 매니페스트 손실 (강제 종료 등) 후 디렉토리에서 다시 등록
+        os.remove(cache.manifest_path)
+        start = time.perf_counter()
+        recovered = CacheManager(root, budget, quotas).stats()
+        recover_ms = (time.perf_counter() - start) * 1000.0
+        recovered_files = sum(usage['files'] for usage in recovered['types'].values())
+        purged = CacheManager(root).purge()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'writes': count,
+        'budget_bytes': budget,
+        'write_ms': write_ms,
+        'over_budget': over_budget,
+        'over_quota': over_quota,
+        'files': files,
+        'lookup_us': lookup_us,
+        'lookup_hit_rate': hits / lookups,
+        'recover_ms': recover_ms,
+        'recovered_lost': files - recovered_files,
+        'purge_left': recovered_files - purged['files']
+    }
+
+
+def bench_library(count=2000, queries=50):
+    """
+    라이브러리 카탈로그 (SQLite)
+
+    빈 가짜 비디오 파일 폴더를 검색한 뒤 변경 없이/파일 하나 수정+삭제 후 다시 검색하고,
+    설정 창/플레이리스트가 쓰는 쿼리와 재생 기록 시간을 측정합니다.
+    """
+    import shutil
+    from library_catalog import LibraryCatalog
+
+    root = tempfile.mkdtemp(prefix="wallpaper_bench_library_")
+    folder = os.path.join(root, "videos")
+    os.makedirs(folder)
+    try:
+        for index in range(count):
+            with open(os.path.join(folder, f"clip_{index:05d}.mp4"), 'wb') as f:
+                f.write(b'\0' * 16)
+        catalog = LibraryCatalog(os.path.join(root, "library.db"))
+
+        start = time.perf_counter()
+        first = catalog.scan(folder)
+        first_scan_ms = (time.perf_counter() - start) * 1000.0
+        start = time.perf_counter()
+        rescan = catalog.scan(folder)
+        rescan_ms = (time.perf_counter() - start) * 1000.0
+
+        with open(os.path.join(folder, "clip_00000.mp4"), 'ab') as f:
+            f.write(b'\0')
+        os.remove(os.path.join(folder, "clip_00001.mp4"))
+        changed = catalog.scan(folder)
+
+        start = time.perf_counter()
+        for index in range(queries):
+            catalog.record_play(os.path.join(folder, f"clip_{index + 2:05d}.mp4"))
+        record_play_ms = (time.perf_counter() - start) * 1000.0 / queries
+
+        timings = {}
+        for name, query in (('folder', lambda: catalog.paths(folder)),
+                            ('recent', lambda: catalog.recent(20)),
+                            ('search', lambda: catalog.query(text="0019", limit=20))):
+            start = time.perf_counter()
+            for _ in range(queries):
+                rows = query()
+            timings[name] = ((time.perf_counter() - start) * 1000.0 / queries, len(rows))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'videos': count,
+        'first_scan_ms': first_scan_ms,
+        'added': first['added'],
+        'rescan_ms': rescan_ms,
+        'rescan_changed': rescan['added'] + rescan['updated'] + rescan['missing'],
+        'changed_updated': changed['updated'],
+        'changed_missing': changed['missing'],
+        'record_play_ms': record_play_ms,
+        'folder_query_ms': timings['folder'][0],
+        'folder_rows': timings['folder'][1],
+        'recent_query_ms': timings['recent'][0],
+        'recent_rows': timings['recent'][1],
+        'search_query_ms': timings['search'][0],
+        'search_rows': timings['search'][1]
+    }
+
+
+def bench_input(clip_path, size, duration=6.0):
+    """
+    마우스 입력 스레드 비용과 반응성 (가상 입력 소스)
+
+    고정 50Hz 폴링과 적응형 폴링을 같은 스크립트(정지 → 이동 반복)로 실행해
+    초당 샘플 수, 스레드 CPU 시간, 이동 시작 → 감지까지 지연을 비교합니다.
+    """
+    import psutil
+    from input_source import InputSampler, SyntheticInputSource
+
+    width, height = size
+    segment = ((1.2, (100, 100), (100, 100), False), (0.3, (100, 100), (width // 2, height // 2), False),
+               (1.2, (width // 2, height // 2), (width // 2, height // 2), False),
+               (0.3, (width // 2, height // 2), (100, 100), False))
+    script = segment * max(1, int(duration / sum(part[0] for part in segment)))
+    total = sum(part[0] for part in script)
+
+    class RecordingSampler(InputSampler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.moved_times = []
+
+        def sample(self):
+            result = super().sample()
+            if result is not None and result.moved:
+                self.moved_times.append(time.perf_counter())
+            return result
+
+    app = create_headless_app(clip_path, size)
+    app.idle_threshold = float('inf')
+    process = psutil.Process(os.getpid())
+    results = {}
+    for mode in ('fixed_50hz', 'adaptive'):
+        source = SyntheticInputSource(script)
+        sampler = RecordingSampler(source, app.hwnd, (0, 0, width, height))
+        if mode == 'fixed_50hz':
+            sampler.max_interval = sampler.idle_interval = sampler.min_interval
+        app.input_sampler = sampler
+        app.running = True
+        thread = threading.Thread(target=app._mouse_input_loop, daemon=True, name="MouseInput")
+        thread.start()
+        time.sleep(0.05)
+        cpu_before = {t.id: t.user_time + t.system_time for t in process.threads()}.get(thread.native_id, 0.0)
+        time.sleep(total)
+        cpu_after = {t.id: t.user_time + t.system_time for t in process.threads()}.get(thread.native_id, 0.0)
+        app.running = False
+        thread.join(timeout=1.0)
+
+        # 이동 구간 시작 → 첫 감지까지 지연
+        delays = []
+        for start in source.movement_times():
+            seen = [t for t in sampler.moved_times if t >= start]
+            if seen and seen[0] - start < 1.0:
+                delays.append((seen[0] - start) * 1000.0)
+        results[mode] = {
+            'samples_per_s': sampler.samples / total,
+            'thread_cpu_ms_per_s': (cpu_after - cpu_before) * 1000.0 / total,
+            'window_at_calls': source.calls.get('window_at', 0),
+            'window_class_calls': source.calls.get('window_class', 0),
+            'move_detect_max_ms': max(delays) if delays else None
+        }
+    app.cleanup()
+    return results
+
+
+def bench_ui_render(size, iterations):
+    """UIManager.render 1회 비용 (아이콘 표시 + 호버 상태)"""
+    import pygame
+    from ui_manager import UIManager
+
+    pygame.init()
+    screen = pygame.display.set_mode(size, pygame.NOFRAME)
+    ui = UIManager(*size)
+    ui.show_icons = True
+    ui.hovered_button = 'mute'
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        ui.render(screen, muted=bool(i & 1), volume=(i % 100) / 100.0)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return {'iterations': iterations, 'per_call_ms': elapsed / iterations * 1000.0}
+
+
+def bench_extract_audio():
+    """오디오 추출 시간 (콜드: 새 캐시 디렉토리, 웜: 캐시 재사용)"""
+    clip = synthetic.ensure_audio_clip()
+    if clip is None:
+        return {'skipped': 'moviepy not available'}
+
+    import pygame
+    from audio_manager import AudioManager
+    from cache_manager import CacheManager
+
+    pygame.init()
+    manager = AudioManager(CacheManager(tempfile.mkdtemp(prefix="wallpaper_bench_audio_")))
+
+    start = time.perf_counter()
+    manager.extract_audio(clip)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    manager.extract_audio(clip)
+    warm = time.perf_counter() - start
+
+    manager.cleanup()
+    pygame.quit()
+    return {'cold_s': cold, 'warm_s': warm}
+
+
+def bench_startup(clip_path, size, repeats):
+    """별도 프로세스에서 시작 시간 측정 (import 비용 포함)"""
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.headless", "startup", clip_path, "--size", f"{size[0]}x{size[1]}"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout
+        wall = time.perf_counter() - start
+        # 로그는 백그라운드 리스너가 출력하므로 결과 줄 뒤(같은 줄 포함)에 올 수 있음
+        line = [line for line in output.splitlines() if line.startswith('{')][-1]
+        result = json.JSONDecoder().raw_decode(line)[0]
+        result['wall'] = wall
+        runs.append(result)
+
+    best = min(runs, key=lambda r: r['total'])
+    return {'runs': len(runs), 'best': best, 'median_total': sorted(r['total'] for r in runs)[len(runs) // 2]}
+
+
+def lookup(results, dotted):
+    """'a.b.c' 경로로 결과 값 조회 (없으면 None)"""
+    value = results
+    for key in dotted.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def check_thresholds(results, thresholds, quick=False):
+    """
+    기준 비교
+
+    thresholds.json 형식:
+        {"calibration": {"reference_fps": 400},
+         "checks": [{"metric": "decode.720p_mp4v_30.fps", "min": 60, "scale": true}, ...]}
+    "quick": {"max": ...}가 있으면 --quick 실행에서 그 기준을 대신 사용
+    (짧은 실행은 워밍업 프레임 비중이 커서 꼬리 지연시간이 높게 나옴)
+    "scale": true인 시간 기준은 calibration.factor로 환산 (max는 곱하고 min은 나눔):
+    기준값은 reference_fps 머신 기준이고, 더 느리거나 부하가 걸린 머신에서는 그만큼 완화
+
+    Returns:
+        list: 각 기준의 판정 결과
+    """
+    factor = lookup(results, 'calibration.factor') or 1.0
+    verdicts = []
+    for check in thresholds.get('checks', []):
+        if quick and 'quick' in check:
+            check = dict(check, **check['quick'])
+        if check.get('scale'):
+            check = dict(check)
+            if 'max' in check:
+                check['max'] = check['max'] * factor
+            if 'min' in check:
+                check['min'] = check['min'] / factor
+        value = lookup(results, check['metric'])
+        verdict = {'metric': check['metric'], 'value': value, 'passed': True}
+        if value is None:
+            verdict['passed'] = None  # 측정되지 않음 (건너뜀)
+        else:
+            if 'min' in check and value < check['min']:
+                verdict['passed'] = False
+            if 'max' in check and value > check['max']:
+                verdict['passed'] = False
+            verdict.update({k: check[k] for k in ('min', 'max') if k in check})
+        verdicts.append(verdict)
+    return verdicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless end-to-end benchmarks")
+    parser.add_argument("--quick", action="store_true", help="shorter runs, fewer clips")
+    parser.add_argument("--size", default="1280x720", help="virtual work area size")
+    parser.add_argument("--output", help="write JSON result to this file")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    parser.add_argument(
+        "--only", help="comma separated: decode,main_loop,ui_render,extract_audio,startup,deep_idle,import_time,playlist,schedule,input,control,second_launch,prepare,library,thumbnails,cache,controller"
+    )
+    args = parser.parse_args(argv)
+
+    install_headless_environment()
+    size = parse_size(args.size)
+    duration = 3.0 if args.quick else 8.0
+    selected = set(args.only.split(',')) if args.only else {
+        'decode', 'main_loop', 'ui_render', 'extract_audio', 'startup', 'deep_idle', 'import_time', 'playlist',
+        'schedule', 'input', 'control', 'second_launch', 'prepare', 'library', 'thumbnails', 'cache', 'controller'
+    }
+
+    clips = synthetic.ensure_clips(duration=5.0)
+    if args.quick:
+        clips = {name: clip for name, clip in clips.items() if name in ('360p_mjpg_24', '720p_mp4v_30')}
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            thresholds = json.load(f)
+
+    results = {
+        'platform': sys.platform,
+        'python': sys.version.split()[0],
+        'size': list(size),
+        'clips': {name: {k: v for k, v in clip.items() if k != 'path'} for name, clip in clips.items()}
+    }
+    calibration_clip = clips['720p_mp4v_30']['path']
+    calibration_runs = [measure_calibration(calibration_clip)]
+    if 'decode' in selected:
+        results['decode'] = bench_decode(clips, duration)
+    if 'main_loop' in selected:
+        results['main_loop'] = bench_main_loop(clips, ('720p_mp4v_30', '1080p_mp4v_30'), duration, size)
+    if 'ui_render' in selected:
+        results['ui_render'] = bench_ui_render(size, 200 if args.quick else 1000)
+    if 'extract_audio' in selected:
+        results['extract_audio'] = bench_extract_audio()
+    if 'startup' in selected and '720p_mp4v_30' in clips:
+        results['startup'] = bench_startup(clips['720p_mp4v_30']['path'], size, 1 if args.quick else 3)
+    if 'deep_idle' in selected:
+        clip = clips.get('1080p_mp4v_30') or clips.get('720p_mp4v_30')
+        if clip:
+            results['deep_idle'] = bench_deep_idle(clip['path'], size)
+    if 'playlist' in selected:
+        paths = [clip['path'] for name, clip in clips.items() if name in ('720p_mp4v_30', '360p_mjpg_24')]
+        if len(paths) == 2:
+            results['playlist'] = bench_playlist(paths, max(duration, 7.0), size)
+    if 'schedule' in selected:
+        paths = [clip['path'] for name, clip in clips.items() if name in ('720p_mp4v_30', '360p_mjpg_24')]
+        if len(paths) == 2:
+            results['schedule'] = bench_schedule(paths, size)
+    if 'input' in selected and '360p_mjpg_24' in clips:
+        results['input'] = bench_input(clips['360p_mjpg_24']['path'], size, 3.0 if args.quick else 6.0)
+    if 'control' in selected and '360p_mjpg_24' in clips:
+        other = clips.get('720p_mp4v_30')
+        results['control'] = bench_control(clips['360p_mjpg_24']['path'], size, other and other['path'])
+    if 'second_launch' in selected and '360p_mjpg_24' in clips:
+        results['second_launch'] = bench_second_launch(clips['360p_mjpg_24']['path'], 1 if args.quick else 3)
+    if 'prepare' in selected and '720p_mp4v_30' in clips:
+        clip_path = clips['720p_mp4v_30']['path']
+        results['prepare'] = bench_prepare(os.path.dirname(clip_path), clip_path, size)
+    if 'thumbnails' in selected and '720p_mp4v_30' in clips:
+        results['thumbnails'] = bench_thumbnails(os.path.dirname(clips['720p_mp4v_30']['path']))
+    if 'cache' in selected:
+        results['cache'] = bench_cache(500 if args.quick else 2000)
+    if 'library' in selected:
+        results['library'] = bench_library(500 if args.quick else 2000)
+    if 'controller' in selected:
+        results['controller'] = bench_controller_replay()
+    if 'import_time' in selected:
+        results['import_time'] = bench_import_time(3)
+
+    calibration_runs.append(measure_calibration(calibration_clip))
+    results['calibration'] = bench_calibration(
+        calibration_runs, thresholds.get('calibration', {}).get('reference_fps')
+    )
+    results['thresholds'] = check_thresholds(results, thresholds, args.quick)
+    failed = [v for v in results['thresholds'] if v['passed'] is False]
+    results['passed'] = not failed
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+합성 비디오 생성
+- cv2.VideoWriter로 해상도/코덱/FPS 조합별 클립 생성
+- 움직이는 그라디언트 + 사각형 + 프레임 번호 (디코더가 실제로 일을 하도록)
+- moviepy가 있으면 오디오 트랙이 있는 클립도 생성 (extract_audio 벤치마크용)
+- 같은 설정의 클립은 캐시 디렉토리에서 재사용
+"""
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+# 기본 시나리오: (이름, 너비, 높이, fourcc, 확장자, fps)
+DEFAULT_CLIPS = (
+    ('360p_mjpg_24', 640, 360, 'MJPG', '.avi', 24),
+    ('720p_mp4v_30', 1280, 720, 'mp4v', '.mp4', 30),
+    ('1080p_mp4v_30', 1920, 1080, 'mp4v', '.mp4', 30),
+    ('1080p_mp4v_60', 1920, 1080, 'mp4v', '.mp4', 60),
+    ('720p_xvid_24', 1280, 720, 'XVID', '.avi', 24),
+)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "wallpaper_bench_clips")
+
+
+def render_frame(index, width, height, fps):
+    """
+    합성 프레임 한 장 생성 (BGR)
+
+    Args:
+        index: 프레임 번호
+        width, height: 해상도
+        fps: 초당 프레임 (움직임 속도 계산용)
+    """
+    t = index / float(fps)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = ((x + t * 60) % 256).astype(np.uint8)
+    frame[:, :, 1] = ((y + t * 40) % 256).astype(np.uint8)
+    frame[:, :, 2] = ((x[None, :] + y + t * 25) % 256 / 2).astype(np.uint8)
+
+    box = max(8, height // 6)
+    bx = int((width - box) * (0.5 + 0.5 * np.sin(t * 1.3)))
+    by = int((height - box) * (0.5 + 0.5 * np.cos(t * 0.9)))
+    cv2.rectangle(frame, (bx, by), (bx + box, by + box), (255, 255, 255), -1)
+    cv2.putText(frame, f"{index}", (20, max(40, height // 10)), cv2.FONT_HERSHEY_SIMPLEX,
+                max(1.0, height / 360.0), (0, 0, 0), 2)
+    return frame
+
+
+def make_clip(path, width, height, fourcc, fps, duration=5.0):
+    """
+    VideoWriter로 클립 생성
+
+    Returns:
+        str: 생성된 경로 (코덱을 사용할 수 없으면 None)
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    if not writer.isOpened():
+        return None
+    try:
+        for index in range(int(duration * fps)):
+            writer.write(render_frame(index, width, height, fps))
+    finally:
+        writer.release()
+    return path if os.path.exists(path) and os.path.getsize(path) > 0 else None
+
+
+def ensure_clips(cache_dir=DEFAULT_CACHE_DIR, clips=DEFAULT_CLIPS, duration=5.0):
+    """
+    시나리오 클립을 생성하거나 캐시에서 재사용
+
+    Returns:
+        dict: {이름: {path, width, height, codec, fps}} (생성 실패한 코덱은 제외)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    result = {}
+    for name, width, height, fourcc, ext, fps in clips:
+        path = os.path.join(cache_dir, f"{name}_{int(duration)}s{ext}")
+        if not os.path.exists(path):
+            path = make_clip(path, width, height, fourcc, fps, duration)
+        if path:
+            result[name] = {'path': path, 'width': width, 'height': height, 'codec': fourcc, 'fps': fps}
+    return result
+
+
+def ensure_audio_clip(cache_dir=DEFAULT_CACHE_DIR, duration=10.0):
+    """
+    오디오 트랙이 있는 클립 생성 (moviepy 필요)
+
+    Returns:
+        str: 클립 경로 (moviepy가 없으면 None)
+    """
+    path = os.path.join(cache_dir, f"audio_{int(duration)}s.mp4")
+    if os.path.exists(path):
+        return path
+    try:
+        from moviepy.editor import AudioClip, ColorClip
+    except ImportError:
+        return None
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    def tone(t):
+        return np.column_stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 660 * t)]) * 0.3
+
+    audio = AudioClip(tone, duration=duration, fps=44100)
+    clip = ColorClip((320, 180), color=(40, 80, 120), duration=duration).set_audio(audio)
+    clip.write_videofile(path, fps=24, codec='libx264', audio_codec='aac', logger=None, verbose=False)
+    clip.close()
+    return path
@@ -0,0 +1,473 @@
+"""
+디스크 캐시 관리 모듈
+- 파생 데이터를 캐시 루트 한 곳에 모음 (설정 cache_dir, 기본은 설정 파일 디렉토리의 cache)
+    <root>/cache_manifest.json   관리 파일 목록 (종류별 이름 -> 크기, 마지막 사용 시각)
+    <root>/audio/<key>.mp3       추출한 오디오 (AudioManager, 일괄 준비)
+    <root>/poster/<key>*.jpg     포스터/마지막 프레임/썸네일 (PosterCache)
+    <root>/index/                프로브 캐시 등 인덱스 (소유 클래스가 직접 기록, LRU 제거 대상 아님)
+- 전체 용량 예산과 종류별 할당량을 넘으면 오래 사용하지 않은 파일부터 제거 (LRU)
+- 조회는 매니페스트(dict)로 O(1) - 디렉토리를 훑지 않음
+  (매니페스트가 없거나 깨졌을 때만 한 번 디렉토리를 읽어 남아 있는 파일을 등록)
+- 쓰기는 임시 파일 + os.replace (중간에 종료되어도 깨진 파일이 남지 않음)
+- 다른 프로세스(설정 창, 일괄 준비)가 매니페스트를 바꾸면 다음 사용 때 다시 읽음
+- 사용 시각 갱신은 모아서 저장 (flush 또는 다음 쓰기 때)
+
+실행:
+    python main.py cache stats
+    python main.py cache purge [TYPE]
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import config
+from logger import get_logger
+
+logger = get_logger("CacheManager")
+
+MANIFEST_NAME = "cache_manifest.json"
+MANIFEST_VERSION = 1
+MB = 1024 * 1024
+
+AUDIO = 'audio'
+POSTER = 'poster'
+INDEX = 'index'
+PINNED_TYPES = (INDEX,)  # 매니페스트로 관리하지 않음 (통계/purge만)
+PROBE_INDEX_NAME = "video_probe_cache.json"  # INDEX: VideoProbeCache 파일
+
+STALE_TEMP_SECONDS = 3600  # 이보다 오래된 임시 파일은 중단된 쓰기로 보고 삭제
+
+
+def file_key(path):
+    """
+    파일 식별 키 (절대 경로 + 크기 + 수정 시각의 해시 - 파일이 바뀌면 키도 바뀜)
+
+    Returns:
+        str: 20자 16진수 키 (파일이 없으면 None)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def temp_path(path):
+    """원자적 쓰기용 임시 파일 경로 (프로세스/스레드끼리 겹치지 않음)"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _is_temp_name(name):
+    return name.endswith('.tmp') or '.part.' in name
+
+
+class CacheManager:
+    """
+    매니페스트 기반 디스크 캐시 (LRU, 용량 예산/종류별 할당량)
+
+    사용 예:
+        cache = open_cache()
+        path = cache.lookup(AUDIO, name)  # 없으면 None (있으면 최근 사용으로 갱신)
+        if path is None:
+            tmp = temp_path(cache.path(AUDIO, name))
+            ...  # tmp에 기록
+            path = cache.commit(AUDIO, name, tmp)
+    """
+
+    def __init__(self, root, budget_bytes=0, quotas=None):
+        """
+        Args:
+            root: 캐시 루트 디렉토리
+            budget_bytes: 전체 용량 예산 (0이면 제한 없음, 인덱스 제외)
+            quotas: 종류별 할당량 {종류: bytes} (없거나 0이면 제한 없음)
+        """
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.quotas = dict(quotas or {})
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.entries = None  # 종류 -> {이름: [크기, 마지막 사용 시각]} (dict 순서 = 오래 사용하지 않은 순)
+        self.totals = {}  # 종류 -> 바이트
+        self.loaded_mtime = None  # 읽거나 쓴 시점의 매니페스트 수정 시각
+        self.dirty = False  # 저장하지 않은 사용 시각 갱신
+        self.directories = set()  # 이미 만든 하위 디렉토리
+        self.lock = threading.RLock()
+
+    def directory(self, artifact_type):
+        """종류별 디렉토리 (없으면 생성)"""
+        path = os.path.join(self.root, artifact_type)
+        if artifact_type not in self.directories:
+            os.makedirs(path, exist_ok=True)
+            self.directories.add(artifact_type)
+        return path
+
+    def path(self, artifact_type, name):
+        """캐시 파일 경로 (존재 여부와 무관)"""
+        return os.path.join(self.directory(artifact_type), name)
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        mtime = self._file_mtime()
+        if self.entries is not None and mtime == self.loaded_mtime:
+            return
+        entries = None
+        if mtime is not None:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    entries = {artifact_type: {name: list(entry) for name, entry in files.items()}
+                               for artifact_type, files in data.get('entries', {}).items()}
+            except Exception as e:
+                logger.warning(f"Cache manifest unreadable, rebuilding: {e}")
+
+        if entries is None:
+            # 매니페스트 없음/깨짐 - 남아 있는 파일을 한 번 등록 (이후 조회는 매니페스트만 사용)
+            self.entries = self._adopt()
+            self._recount()
+            self._save()
+            return
+        self.entries = entries
+        self._recount()
+        self.loaded_mtime = mtime
+        self.dirty = False
+
+    def _recount(self):
+        self.totals = {artifact_type: sum(entry[0] for entry in files.values())
+                       for artifact_type, files in self.entries.items()}
+
+    def _adopt(self):
+        """캐시 디렉토리의 파일을 수정 시각 순으로 등록 (중단된 쓰기의 임시 파일은 삭제)"""
+        entries = {}
+        try:
+            artifact_types = os.listdir(self.root)
+        except OSError:
+            return entries
+        now = time.time()
+        for artifact_type in artifact_types:
+            directory = os.path.join(self.root, artifact_type)
+            if artifact_type in PINNED_TYPES or not os.path.isdir(directory):
+                continue
+            files = []
+            for entry in os.scandir(directory):
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if _is_temp_name(entry.name):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        self._delete(entry.path)
+                    continue
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+            entries[artifact_type] = {name: [size, mtime] for mtime, name, size in sorted(files)}
+        count = sum(len(files) for files in entries.values())
+        if count:
+            logger.info(f"Cache manifest rebuilt from {count} files in {self.root}")
+        return entries
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체"""
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = temp_path(self.manifest_path)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+            self.loaded_mtime = self._file_mtime()
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save cache manifest: {e}")
+
+    def flush(self):
+        """모아 둔 사용 시각 갱신 저장"""
+        with self.lock:
+            if self.dirty:
+                self._save()
+
+    def lookup(self, artifact_type, name):
+        """
+        캐시 파일 조회 (있으면 최근 사용으로 갱신)
+
+        Returns:
+            str: 파일 경로 (없으면 None)
+        """
+        if name is None:
+            return None
+        with self.lock:
+            self._load()
+            files = self.entries.get(artifact_type)
+            entry = files.get(name) if files else None
+            if entry is None:
+                return None
+            path = os.path.join(self.root, artifact_type, name)
+            if not os.path.exists(path):
+                # 캐시 밖에서 삭제됨
+                self._forget(artifact_type, name)
+                self._save()
+                return None
+            files[name] = files.pop(name)
+            entry[1] = time.time()
+            self.dirty = True
+            return path
+
+    def record(self, artifact_type, name):
+        """
+        이미 캐시 디렉토리에 있는 파일을 등록/갱신 (다른 프로세스가 기록한 파일 포함)
+
+        등록 후 할당량/예산을 넘으면 오래 사용하지 않은 파일부터 제거합니다.
+
+        Returns:
+            str: 파일 경로 (파일이 없으면 None)
+        """
+        path = self.path(artifact_type, name)
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return None
+        with self.lock:
+            self._load()
+            files = self.entries.setdefault(artifact_type, {})
+            previous = files.pop(name, None)
+            if previous is not None:
+                self.totals[artifact_type] -= previous[0]
+            files[name] = [size, time.time()]
+            self.totals[artifact_type] = self.totals.get(artifact_type, 0) + size
+            self._enforce(artifact_type, name)
+            self._save()
+        return path
+
+    def commit(self, artifact_type, name, tmp_path):
+        """임시 파일을 캐시 파일로 교체하고 등록"""
+        os.replace(tmp_path, self.path(artifact_type, name))
+        return self.record(artifact_type, name)
+
+    def write_bytes(self, artifact_type, name, data):
+        """데이터를 원자적으로 기록하고 등록"""
+        tmp_path = temp_path(self.path(artifact_type, name))
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            return self.commit(artifact_type, name, tmp_path)
+        except OSError:
+            self._delete(tmp_path)
+            raise
+
+    def remove(self, artifact_type, name):
+        """캐시 파일 삭제"""
+        with self.lock:
+            self._load()
+            self._delete(os.path.join(self.root, artifact_type, name))
+            if self._forget(artifact_type, name):
+                self._save()
+
+    def _forget(self, artifact_type, name):
+        files = self.entries.get(artifact_type)
+        entry = files.pop(name, None) if files else None
+        if entry is None:
+            return False
+        self.totals[artifact_type] -= entry[0]
+        return True
+
+    @staticmethod
+    def _delete(path):
+        """
+        파일 삭제
+
+        Returns:
+            bool: 파일이 더 이상 없으면 True (사용 중이라 지우지 못하면 False)
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        return True
+
+    def _enforce(self, artifact_type, keep_name):
+        """할당량/예산 초과분 제거 (방금 기록한 파일은 남김)"""
+        keep = (artifact_type, keep_name)
+        quota = self.quotas.get(artifact_type) or 0
+        if quota:
+            self._evict_until(lambda: self.totals.get(artifact_type, 0) <= quota, (artifact_type,), keep)
+        if self.budget_bytes:
+            self._evict_until(lambda: sum(self.totals.values()) <= self.budget_bytes, tuple(self.entries), keep)
+
+    def _oldest(self, artifact_types, keep):
+        """artifact_types 중 가장 오래 사용하지 않은 항목 (종류별 dict의 앞쪽만 비교)"""
+        oldest = None
+        for artifact_type in artifact_types:
+            for name, entry in self.entries.get(artifact_type, {}).items():
+                if (artifact_type, name) == keep:
+                    continue
+                if oldest is None or entry[1] < oldest[2]:
+                    oldest = (artifact_type, name, entry[1])
+                break
+        return oldest
+
+    def _evict_until(self, satisfied, artifact_types, keep):
+        # 사용 중이라 지우지 못한 파일(재생 중인 오디오 등)은 뒤로 보내고 다음 항목 시도
+        attempts = sum(len(self.entries.get(artifact_type, {})) for artifact_type in artifact_types)
+        while not satisfied() and attempts > 0:
+            attempts -= 1
+            oldest = self._oldest(artifact_types, keep)
+            if oldest is None:
+                break
+            artifact_type, name, _ = oldest
+            if self._delete(os.path.join(self.root, artifact_type, name)):
+                self._forget(artifact_type, name)
+                logger.debug(f"Cache evicted {artifact_type}/{name}")
+            else:
+                files = self.entries[artifact_type]
+                files[name] = files.pop(name)
+
+    def _pinned_files(self, artifact_type):
+        directory = os.path.join(self.root, artifact_type)
+        try:
+            return [entry for entry in os.scandir(directory) if entry.is_file()]
+        except OSError:
+            return []
+
+    def stats(self):
+        """
+        캐시 사용량
+
+        Returns:
+            dict: root, budget_bytes, total_bytes, types({종류: files, bytes, quota_bytes})
+        """
+        with self.lock:
+            self._load()
+            types = {
+                artifact_type: {'files': len(files), 'bytes': self.totals.get(artifact_type, 0),
+                                'quota_bytes': self.quotas.get(artifact_type) or 0}
+                for artifact_type, files in self.entries.items()
+            }
+            total = sum(self.totals.values())
+        for artifact_type in PINNED_TYPES:
+            files = self._pinned_files(artifact_type)
+            if files:
+                types[artifact_type] = {'files': len(files), 'bytes': sum(entry.stat().st_size for entry in files),
+                                        'quota_bytes': 0}
+        return {'root': self.root, 'budget_bytes': self.budget_bytes, 'total_bytes': total, 'types': types}
+
+    def purge(self, artifact_type=None):
+        """
+        캐시 파일 삭제
+
+        Args:
+            artifact_type: 삭제할 종류 (None이면 인덱스를 포함한 전체)
+
+        Returns:
+            dict: files, bytes (삭제한 파일 수, 바이트)
+        """
+        removed = {'files': 0, 'bytes': 0}
+        with self.lock:
+            self._load()
+            artifact_types = [artifact_type] if artifact_type else list(self.entries) + list(PINNED_TYPES)
+            for purge_type in artifact_types:
+                if purge_type in PINNED_TYPES:
+                    for entry in self._pinned_files(purge_type):
+                        size = entry.stat().st_size
+                        if self._delete(entry.path):
+                            removed['files'] += 1
+                            removed['bytes'] += size
+                    continue
+                for name, entry in list(self.entries.get(purge_type, {}).items()):
+                    if self._delete(os.path.join(self.root, purge_type, name)):
+                        self._forget(purge_type, name)
+                        removed['files'] += 1
+                        removed['bytes'] += entry[0]
+            self._save()
+        logger.info(f"Cache purged {artifact_type or 'all'}: {removed['files']} files, {removed['bytes'] // 1024} KB")
+        return removed
+
+
+def migrate_legacy_caches(cache, data_dir):
+    """
+    이전 버전 캐시 위치 정리 (매니페스트가 처음 만들어질 때 한 번)
+
+    - 설정 디렉토리의 poster_cache/*.jpg, video_probe_cache.json은 캐시 루트로 이동 (키 형식 동일)
+    - 임시 폴더의 wallpaper_audio_*.mp3는 파일 이름만으로 비디오를 알 수 없으므로 삭제
+    """
+    moved = 0
+    legacy_posters = os.path.join(data_dir, "poster_cache")
+    if os.path.isdir(legacy_posters):
+        directory = cache.directory(POSTER)
+        for path in glob.glob(os.path.join(legacy_posters, "*.jpg")):
+            try:
+                os.replace(path, os.path.join(directory, os.path.basename(path)))
+                moved += 1
+            except OSError:
+                pass
+        shutil.rmtree(legacy_posters, ignore_errors=True)
+
+    legacy_probe = os.path.join(data_dir, PROBE_INDEX_NAME)
+    if os.path.exists(legacy_probe):
+        try:
+            os.replace(legacy_probe, cache.path(INDEX, PROBE_INDEX_NAME))
+            moved += 1
+        except OSError:
+            pass
+
+    removed = 0
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), "wallpaper_audio_*.mp3")):
+        if CacheManager._delete(path):
+            removed += 1
+    if moved or removed:
+        logger.info(f"Legacy caches migrated: {moved} files moved, {removed} temp audio files removed")
+
+
+def open_cache(root=None):
+    """
+    설정의 위치/예산/할당량으로 CacheManager 생성
+
+    Args:
+        root: 캐시 루트 (None이면 config.get_cache_dir())
+
+    Returns:
+        CacheManager
+    """
+    root = root or config.get_cache_dir()
+    quotas = {artifact_type: mb * MB for artifact_type, mb in config.get_cache_quotas_mb().items() if mb}
+    cache = CacheManager(root, config.get_cache_budget_mb() * MB, quotas)
+    if not os.path.exists(cache.manifest_path):
+        migrate_legacy_caches(cache, config.get_data_dir())
+    return cache
+
+
+def run_cli(argv):
+    """
+    `python main.py cache ...` 명령줄 진입점
+
+    Returns:
+        int: 종료 코드 (0 성공, 2 잘못된 인자)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py cache", description="Inspect or clear the derived data cache")
+    parser.add_argument("action", choices=("stats", "purge"))
+    parser.add_argument("type", nargs="?", default=None, help="artifact type to purge (default: everything)")
+    args = parser.parse_args(argv)
+
+    cache = open_cache()
+    if args.action == 'purge':
+        removed = cache.purge(args.type)
+        print(f"Removed {removed['files']} files ({removed['bytes'] / MB:.1f} MB)")
+        return 0
+
+    stats = cache.stats()
+    budget = f"{stats['budget_bytes'] / MB:.0f} MB" if stats['budget_bytes'] else "unlimited"
+    print(f"Cache: {stats['root']}")
+    print(f"Total: {stats['total_bytes'] / MB:.1f} MB of {budget}")
+    for artifact_type, usage in sorted(stats['types'].items()):
+        quota = f" / {usage['quota_bytes'] / MB:.0f} MB" if usage['quota_bytes'] else ""
+        print(f"  {artifact_type:<8} {usage['files']:>6} files  {usage['bytes'] / MB:8.1f} MB{quota}")
+    return 0
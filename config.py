@@ -22,9 +22,42 @@ DEFAULT_CONFIG = {
     "icon_opacity": 100,  # 0-100 (사용자에게 표시되는 값, 제로로는 20-100%가 적용됨)
     "autostart": False,  # 윈도우 시작시 자동 실행
     "target_fps": 24,  # 목표 FPS (15/20/24/30/60, 낮을수록 CPU 절감) - 리팩토링 후 최적값
-    "resolution_scale": 0.9  # 해상도 스케일 (0.8-1.0, CPU 최적화)
+    "resolution_scale": 0.9,  # 해상도 스케일 (0.8-1.0, CPU 최적화)
+    "fps_controller": "aimd",  # 동적 FPS/해상도 컨트롤러 (aimd, step)
+    "cpu_budget": 50.0,  # 프로세스 CPU 예산 (%)
+    "frame_deadline_ms": None,  # 프레임 처리 시간 데드라인 (None이면 목표 FPS 기준 자동)
+    "max_drop_rate": 5.0,  # 허용 끊김 비율 (%), 초과 시 FPS/해상도 낮춤
+    "controller_trace": False,  # 컨트롤러 입력/출력 트레이스 기록 (오프라인 재생용)
+    "metrics_enabled": False,  # localhost 메트릭 서버 (Prometheus/JSON)
+    "metrics_port": 9464,  # 메트릭 서버 포트
+    "profile_seconds": 0,  # 시작 시 샘플링 프로파일러 실행 시간 (0이면 비활성)
+    "poster_last_frame": True,  # 종료 시 마지막 프레임 저장 (다음 시작 시 포스터 대신 표시)
+    "resume_playback": True,  # 재시작 시 마지막 재생 위치부터 이어서 재생
+    "deep_idle_seconds": 900,  # 이 시간 이상 idle이면 디코더/오디오 해제 (0이면 비활성)
+    "playlist_enabled": False,  # 플레이리스트 재생 (video_path 대신 목록을 순환)
+    "playlist_folder": None,  # 이 폴더의 비디오로 목록 구성 (None이면 playlist_items 사용)
+    "playlist_items": [],  # 명시적 비디오 경로 목록
+    "playlist_advance": "interval",  # 진행 정책: interval (재생 시간) / loops (반복 횟수)
+    "playlist_interval": 600,  # interval 정책의 항목당 재생 시간 (초)
+    "playlist_loops": 3,  # loops 정책의 항목당 반복 횟수
+    "playlist_shuffle": False,  # 셔플 재생
+    "playlist_prefetch_seconds": 10,  # 교체 몇 초 전에 다음 비디오를 미리 준비할지
+    "transition_seconds": 0.5,  # 비디오 교체 시 크로스페이드 시간 (0이면 바로 전환)
+    "schedule_enabled": False,  # 시간대별 스케줄 재생 (플레이리스트보다 우선)
+    "schedule": [],  # [{"start": "07:00", "video": 경로}, ...] 시작 시각별 비디오
+    "schedule_prefetch_seconds": 60,  # 스케줄 전환 몇 초 전에 다음 비디오를 미리 준비할지
+    "control_enabled": True,  # localhost 제어 서버 (python main.py ctl ...)
+    "control_port": 9465,  # 제어 서버 포트
+    "prepare_workers": 0,  # 일괄 준비(python main.py prepare) 작업 프로세스 수 (0이면 CPU 수 - 1)
+    "cache_dir": None,  # 파생 데이터 캐시 루트 (None이면 설정 파일 디렉토리의 cache)
+    "cache_budget_mb": 2048,  # 캐시 전체 용량 예산 (MB, 0이면 제한 없음)
+    "cache_quotas_mb": {"audio": 1536, "poster": 256}  # 종류별 할당량 (MB, 0이면 제한 없음)
 }
 
+def get_data_dir():
+    """설정 파일이 있는 디렉토리 (프로브/포스터 등 앱 데이터 캐시 위치)"""
+    return os.path.dirname(os.path.abspath(CONFIG_FILE))
+
 def load_config():
     """설정 파일을 로드합니다."""
     if os.path.exists(CONFIG_FILE):
@@ -94,9 +127,12 @@ def set_icon_opacity(opacity):
 
 def get_actual_icon_opacity():
     """실제 적용되는 아이콘 투명도를 반환합니다 (0.2-1.0)."""
-    user_value = get_icon_opacity()
+    return actual_icon_opacity(get_icon_opacity())
+
+def actual_icon_opacity(user_value):
+    """사용자 투명도 값(0-100)을 실제 투명도(0.2-1.0)로 변환합니다."""
     # 사용자 값 0-100을 실제 투명도 20-100%로 변환
-    return 0.2 + (user_value / 100.0) * 0.8
+    return 0.2 + (max(0, min(100, user_value)) / 100.0) * 0.8
 
 def get_autostart():
     """자동 시작 설정을 반환합니다."""
@@ -130,3 +166,148 @@ def set_resolution_scale(scale):
     config = load_config()
     config["resolution_scale"] = max(0.5, min(1.0, scale))
     return save_config(config)
+
+def get_fps_controller():
+    """동적 FPS 컨트롤러 이름을 반환합니다."""
+    config = load_config()
+    return config.get("fps_controller", "aimd")
+
+def get_cpu_budget():
+    """프로세스 CPU 예산(%)을 반환합니다."""
+    config = load_config()
+    return config.get("cpu_budget", 50.0)
+
+def get_frame_deadline_ms():
+    """프레임 처리 시간 데드라인(ms)을 반환합니다 (None이면 자동)."""
+    config = load_config()
+    return config.get("frame_deadline_ms")
+
+def get_max_drop_rate():
+    """허용 끊김 비율(%)을 반환합니다."""
+    config = load_config()
+    return config.get("max_drop_rate", 5.0)
+
+def get_controller_trace():
+    """컨트롤러 트레이스 기록 여부를 반환합니다."""
+    config = load_config()
+    return config.get("controller_trace", False)
+
+def get_metrics_enabled():
+    """메트릭 서버 활성화 여부를 반환합니다."""
+    config = load_config()
+    return config.get("metrics_enabled", False)
+
+def get_metrics_port():
+    """메트릭 서버 포트를 반환합니다."""
+    config = load_config()
+    return config.get("metrics_port", 9464)
+
+def get_profile_seconds():
+    """시작 시 프로파일링 시간(초)을 반환합니다 (0이면 비활성)."""
+    config = load_config()
+    return config.get("profile_seconds", 0)
+
+def get_poster_last_frame():
+    """종료 시 마지막 프레임을 포스터로 저장할지 여부를 반환합니다."""
+    config = load_config()
+    return config.get("poster_last_frame", True)
+
+def get_resume_playback():
+    """재시작 시 마지막 위치부터 재생할지 여부를 반환합니다."""
+    config = load_config()
+    return config.get("resume_playback", True)
+
+def get_deep_idle_seconds():
+    """deep idle 진입 시간(초)을 반환합니다 (0이면 비활성)."""
+    config = load_config()
+    return config.get("deep_idle_seconds", 900)
+
+def get_playlist_enabled():
+    """플레이리스트 재생 여부를 반환합니다."""
+    config = load_config()
+    return config.get("playlist_enabled", False)
+
+def get_playlist_folder():
+    """플레이리스트 폴더를 반환합니다 (None이면 playlist_items 사용)."""
+    config = load_config()
+    return config.get("playlist_folder")
+
+def get_playlist_items():
+    """플레이리스트 비디오 경로 목록을 반환합니다."""
+    config = load_config()
+    return config.get("playlist_items", [])
+
+def get_playlist_advance():
+    """플레이리스트 진행 정책을 반환합니다 ('interval' 또는 'loops')."""
+    config = load_config()
+    return config.get("playlist_advance", "interval")
+
+def get_playlist_interval():
+    """플레이리스트 항목당 재생 시간(초)을 반환합니다."""
+    config = load_config()
+    return config.get("playlist_interval", 600)
+
+def get_playlist_loops():
+    """플레이리스트 항목당 반복 횟수를 반환합니다."""
+    config = load_config()
+    return config.get("playlist_loops", 3)
+
+def get_playlist_shuffle():
+    """플레이리스트 셔플 여부를 반환합니다."""
+    config = load_config()
+    return config.get("playlist_shuffle", False)
+
+def get_playlist_prefetch_seconds():
+    """다음 비디오 prefetch를 교체 몇 초 전에 시작할지 반환합니다."""
+    config = load_config()
+    return config.get("playlist_prefetch_seconds", 10)
+
+def get_transition_seconds():
+    """비디오 교체 시 크로스페이드 시간(초)을 반환합니다 (0이면 비활성)."""
+    config = load_config()
+    return config.get("transition_seconds", 0.5)
+
+def get_schedule_enabled():
+    """시간대별 스케줄 재생 여부를 반환합니다."""
+    config = load_config()
+    return config.get("schedule_enabled", False)
+
+def get_schedule_entries():
+    """스케줄 항목 목록을 반환합니다 ([{"start": "HH:MM", "video": 경로}, ...])."""
+    config = load_config()
+    return config.get("schedule", [])
+
+def get_schedule_prefetch_seconds():
+    """스케줄 전환 몇 초 전에 다음 비디오 prefetch를 시작할지 반환합니다."""
+    config = load_config()
+    return config.get("schedule_prefetch_seconds", 60)
+
+def get_control_enabled():
+    """localhost 제어 서버 활성화 여부를 반환합니다."""
+    config = load_config()
+    return config.get("control_enabled", True)
+
+def get_control_port():
+    """제어 서버 포트를 반환합니다."""
+    config = load_config()
+    return config.get("control_port", 9465)
+
+def get_prepare_workers():
+    """일괄 준비 작업 프로세스 수를 반환합니다 (0이면 자동)."""
+    config = load_config()
+    return config.get("prepare_workers", 0)
+
+def get_cache_dir():
+    """파생 데이터 캐시 루트를 반환합니다 (설정하지 않았으면 설정 파일 디렉토리의 cache)."""
+    config = load_config()
+    return config.get("cache_dir") or os.path.join(get_data_dir(), "cache")
+
+def get_cache_budget_mb():
+    """캐시 전체 용량 예산(MB)을 반환합니다 (0이면 제한 없음)."""
+    config = load_config()
+    return config.get("cache_budget_mb", 2048)
+
+def get_cache_quotas_mb():
+    """캐시 종류별 할당량(MB)을 반환합니다 ({"audio": ..., "poster": ...})."""
+    config = load_config()
+    return {**DEFAULT_CONFIG["cache_quotas_mb"], **(config.get("cache_quotas_mb") or {})}
@@ -0,0 +1,319 @@
+"""
+제어 서버 모듈
+- localhost 전용 TCP 서버 (설정 control_enabled, control_port)
+- 줄 단위 JSON 프로토콜 (한 연결에서 여러 요청 가능)
+    요청: {"command": "set-volume", "value": 0.4}
+    응답: {"ok": true, "result": {...}} 또는 {"ok": false, "error": "..."}
+- 명령은 서버 스레드에서 검증 후 큐에 넣고, 렌더 루프가 프레임 경계에서 적용한 뒤 응답
+  (stats는 렌더 루프를 거치지 않고 서버 스레드에서 바로 수집)
+- 렌더 루프는 폴링하지 않음: 활성 상태에서는 매 프레임 큐를 비우기만 하고,
+  idle 상태에서는 1초 sleep 대신 큐에서 대기 (명령이 오면 바로 깨어남)
+
+명령:
+    pause / resume      재생 멈춤/재개 (idle 타이머와 별개로 resume까지 유지)
+    next                플레이리스트 다음 비디오
+    set-volume VALUE    볼륨 0.0 ~ 1.0 (설정 파일에도 저장)
+    set-fps VALUE       목표 FPS (이번 실행에만 적용)
+    set-scale VALUE     해상도 스케일 0.5 ~ 1.0 (이번 실행에만 적용)
+    reload              설정 파일의 비디오 다시 로드
+    open PATH           지정한 비디오 재생 (이번 실행에만 적용, 두 번째 실행이 인자 전달에 사용)
+    stats               메트릭 스냅샷 (metrics_server와 같은 형식)
+
+확인:
+    python main.py ctl stats
+    python main.py ctl set-volume 40
+"""
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+
+from logger import get_logger
+
+logger = get_logger("ControlServer")
+
+COMMANDS = ('pause', 'resume', 'next', 'set-volume', 'set-fps', 'set-scale', 'reload', 'open', 'stats')
+VALUE_COMMANDS = ('set-volume', 'set-fps', 'set-scale', 'open')
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def parse_request(line):
+    """
+    요청 한 줄 파싱 및 값 검증
+
+    Returns:
+        tuple: (command, value) - 값이 없는 명령은 value가 None
+
+    Raises:
+        ValueError: 잘못된 JSON, 알 수 없는 명령, 범위를 벗어난 값
+    """
+    try:
+        request = json.loads(line)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+
+    command = request.get('command')
+    if command not in COMMANDS:
+        raise ValueError(f"Unknown command: {command!r} (expected one of {', '.join(COMMANDS)})")
+    if command not in VALUE_COMMANDS:
+        return command, None
+
+    value = request.get('value')
+    if command == 'open':
+        if not isinstance(value, str) or not value:
+            raise ValueError("open requires a video path 'value'")
+        return command, value
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{command} requires a numeric 'value'")
+    if command == 'set-volume':
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("Volume must be between 0.0 and 1.0")
+        return command, float(value)
+    if command == 'set-fps':
+        if value != int(value) or value < 1:
+            raise ValueError("FPS must be a positive integer")
+        return command, int(value)
+    if not 0.5 <= value <= 1.0:
+        raise ValueError("Scale must be between 0.5 and 1.0")
+    return command, float(value)
+
+
+class ControlCommand:
+    """렌더 루프에 전달되는 명령 (적용 결과를 서버 스레드에 돌려줌)"""
+
+    __slots__ = ('command', 'value', 'result', 'error', 'done')
+
+    def __init__(self, command, value=None):
+        self.command = command
+        self.value = value
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def complete(self, result=None):
+        """적용 성공 (렌더 루프에서 호출)"""
+        self.result = result
+        self.done.set()
+
+    def fail(self, error):
+        """적용 실패 (렌더 루프에서 호출)"""
+        self.error = str(error)
+        self.done.set()
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    """줄 단위 JSON 요청 처리"""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self._reply({'ok': False, 'error': "Request too large"})
+                return
+            if not line.strip():
+                continue
+            self._reply(self.server.control.handle_line(line))
+
+    def _reply(self, response):
+        try:
+            self.wfile.write(json.dumps(response, default=float).encode('utf-8') + b"\n")
+        except OSError:
+            pass
+
+
+class _ControlTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = False  # Windows에서는 다른 프로세스가 같은 포트를 가로챌 수 있음
+
+
+class ControlServer:
+    """
+    localhost 제어 서버
+
+    사용 예:
+        server = ControlServer(app.collect_metrics, port=9465)
+        server.start()
+        for command in server.pending():     # 메인 루프에서 매 프레임 (대기 없음)
+            apply(command)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, stats, host="127.0.0.1", port=9465, reply_timeout=5.0):
+        """
+        Args:
+            stats: 메트릭 스냅샷 dict를 반환하는 함수 (서버 스레드에서 호출됨)
+            host: 바인드 주소 (기본 localhost만)
+            port: 포트 (0이면 임의 포트)
+            reply_timeout: 렌더 루프가 명령을 적용하기를 기다리는 최대 시간 (초)
+        """
+        self.stats = stats
+        self.host = host
+        self.port = port
+        self.reply_timeout = reply_timeout
+        self.commands = queue.SimpleQueue()
+        self.server = None
+        self.thread = None
+
+    def handle_line(self, line):
+        """
+        요청 한 줄 처리 (서버 스레드)
+
+        Returns:
+            dict: 응답
+        """
+        try:
+            command, value = parse_request(line)
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+
+        if command == 'stats':
+            try:
+                return {'ok': True, 'result': self.stats()}
+            except Exception as e:
+                logger.error(f"Failed to collect stats: {e}")
+                return {'ok': False, 'error': "Failed to collect stats"}
+
+        pending = ControlCommand(command, value)
+        self.commands.put(pending)
+        if not pending.done.wait(self.reply_timeout):
+            # 렌더 루프가 비디오 로드 등으로 바쁜 경우 - 명령은 나중에 적용됨
+            return {'ok': False, 'error': "Timed out waiting for the player (command still queued)"}
+        if pending.error is not None:
+            return {'ok': False, 'error': pending.error}
+        return {'ok': True, 'result': pending.result}
+
+    def pending(self):
+        """
+        도착한 명령 모두 가져오기 (대기 없음, 렌더 루프에서 호출)
+
+        Returns:
+            list: ControlCommand 목록
+        """
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def wait(self, timeout):
+        """
+        명령이 올 때까지 최대 timeout초 대기 (idle 루프의 sleep 대신)
+
+        Returns:
+            list: ControlCommand 목록 (시간이 지나면 빈 목록)
+        """
+        try:
+            first = self.commands.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        return [first] + self.pending()
+
+    def start(self):
+        """서버 스레드 시작 (실패해도 플레이어는 계속 동작)"""
+        try:
+            self.server = _ControlTCPServer((self.host, self.port), _ControlRequestHandler)
+            self.server.control = self
+            self.port = self.server.server_address[1]
+        except OSError as e:
+            logger.error(f"Failed to start control server on {self.host}:{self.port}: {e}")
+            self.server = None
+            return False
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name="ControlServer")
+        self.thread.start()
+        logger.info(f"Control server listening on {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        """서버 종료 (대기 중인 명령은 실패로 응답)"""
+        if self.server is None:
+            return
+        try:
+            self.server.shutdown()
+            self.server.server_close()
+        except Exception as e:
+            logger.error(f"Error stopping control server: {e}")
+        self.server = None
+        for command in self.pending():
+            command.fail("Player is shutting down")
+        logger.info("Control server stopped")
+
+
+def send_command(command, value=None, host="127.0.0.1", port=9465, timeout=10.0):
+    """
+    실행 중인 플레이어에 명령 전송 (클라이언트)
+
+    Returns:
+        dict: 응답 {'ok': ..., 'result'/'error': ...}
+
+    Raises:
+        OSError: 플레이어에 연결할 수 없음
+    """
+    request = {'command': command}
+    if value is not None:
+        request['value'] = value
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise OSError("Connection closed without a response")
+    return json.loads(line)
+
+
+def run_cli(argv, port=None):
+    """
+    `python main.py ctl ...` 명령줄 클라이언트
+
+    set-volume은 0~100 (%) 또는 0.0~1.0으로 받습니다.
+
+    Returns:
+        int: 종료 코드 (0 성공, 1 명령 실패, 2 연결 실패)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py ctl", description="Control a running Wallpaper Player")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("value", nargs="?", default=None,
+                        help="set-volume: 0-100 (%%), set-fps: frames per second, set-scale: 0.5-1.0, open: video path")
+    parser.add_argument("--port", type=int, default=port, help="control server port (default: from config)")
+    args = parser.parse_args(argv)
+
+    if args.command in VALUE_COMMANDS and args.value is None:
+        parser.error(f"{args.command} requires a value")
+    value = args.value
+    if args.command == 'open':
+        value = os.path.abspath(value)
+    elif value is not None:
+        try:
+            value = float(value)
+        except ValueError:
+            parser.error(f"{args.command} requires a number")
+        if args.command == 'set-volume' and value > 1.0:
+            value = value / 100.0
+        if args.command == 'set-fps' and value == int(value):
+            value = int(value)
+
+    if args.port is None:
+        import config
+        args.port = config.get_control_port()
+
+    try:
+        response = send_command(args.command, value, port=args.port)
+    except OSError as e:
+        print(f"Could not reach the player on 127.0.0.1:{args.port}: {e}", file=sys.stderr)
+        return 2
+
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    print(json.dumps(response.get('result'), indent=2, sort_keys=True, default=float))
+    return 0
@@ -0,0 +1,236 @@
+"""
+FPS/해상도 제어 모듈
+- PerformanceMonitor가 주기적으로 측정값(CPU, 프레임 처리 시간)을 넘기면
+  다음 목표 FPS와 해상도 스케일을 결정
+- 컨트롤러는 교체 가능 (create_controller로 이름 기반 생성)
+- 시간(now)을 인자로 받으므로 기록된 트레이스로 오프라인 재생 가능
+  (benchmarks/replay_controller.py 참고)
+"""
+import inspect
+from logger import get_logger
+
+logger = get_logger("FpsController")
+
+
+class FpsController:
+    """
+    컨트롤러 기본 클래스
+
+    update()는 측정값 하나를 받아 (fps, scale)을 반환합니다.
+    측정값(sample)은 dict:
+    - cpu: 프로세스 CPU 사용률 이동 평균 (%)
+    - frame_time_ms: 최근 구간 프레임 처리 시간 p95 (ms, 없으면 0)
+    - drop_rate: 최근 구간 사용자에게 보이는 끊김 비율 (%, starvation/late/overflow)
+    """
+
+    name = "base"
+
+    def __init__(self, min_fps=15, max_fps=60, min_scale=0.5, max_scale=1.0):
+        """
+        Args:
+            min_fps: 최소 FPS
+            max_fps: 최대 FPS
+            min_scale: 최소 해상도 스케일
+            max_scale: 최대 해상도 스케일
+        """
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+
+        self.fps = max_fps
+        self.scale = max_scale
+        self.original_fps = max_fps
+        self.original_scale = max_scale
+
+    def reset(self, fps, scale=None):
+        """
+        목표값 초기화 (비디오 로드/설정 변경 시)
+
+        Args:
+            fps: 사용자 목표 FPS (복구 상한)
+            scale: 사용자 해상도 스케일 (복구 상한, None이면 max_scale)
+        """
+        self.fps = max(self.min_fps, min(self.max_fps, fps))
+        self.original_fps = self.fps
+        if scale is not None:
+            self.scale = max(self.min_scale, min(self.max_scale, scale))
+        else:
+            self.scale = self.max_scale
+        self.original_scale = self.scale
+
+    def update(self, sample, now):
+        """
+        측정값 반영
+
+        Args:
+            sample: 측정값 dict (cpu, frame_time_ms)
+            now: 현재 시각 (초)
+
+        Returns:
+            tuple: (fps, scale)
+        """
+        return self.fps, self.scale
+
+
+class StepController(FpsController):
+    """
+    기존 ±5 FPS 규칙 (호환용)
+    - CPU > 80%: FPS -5
+    - CPU < 30%: FPS +5 (원래 목표까지)
+    - 변경 후 쿨다운 동안 유지, 해상도는 변경하지 않음
+    """
+
+    name = "step"
+
+    def __init__(self, min_fps=15, max_fps=60, min_scale=0.5, max_scale=1.0,
+                 high_cpu=80.0, low_cpu=30.0, step=5, cooldown=3.0):
+        super().__init__(min_fps, max_fps, min_scale, max_scale)
+        self.high_cpu = high_cpu
+        self.low_cpu = low_cpu
+        self.step = step
+        self.cooldown = cooldown
+        self.last_change_time = float('-inf')
+
+    def update(self, sample, now):
+        if now - self.last_change_time < self.cooldown:
+            return self.fps, self.scale
+
+        cpu = sample.get('cpu', 0.0)
+        new_fps = self.fps
+        if cpu > self.high_cpu:
+            new_fps = max(self.min_fps, self.fps - self.step)
+        elif cpu < self.low_cpu and self.fps < self.original_fps:
+            new_fps = min(self.original_fps, self.fps + self.step)
+
+        if new_fps != self.fps:
+            self.fps = new_fps
+            self.last_change_time = now
+        return self.fps, self.scale
+
+
+class AIMDController(FpsController):
+    """
+    AIMD (Additive Increase / Multiplicative Decrease) 컨트롤러
+
+    동작:
+    - 과부하 (CPU > 예산, 프레임 시간 > 데드라인, 또는 끊김 비율 > 허용치):
+      FPS를 곱셈으로 감소, FPS가 최소치면 해상도 스케일 감소
+    - 여유 (CPU, 프레임 시간, 끊김 비율 모두 예산의 headroom 비율 미만):
+      해상도 먼저 조금씩 복구한 뒤 FPS를 1씩 복구
+    - 그 사이 구간(히스테리시스 밴드)에서는 유지 → 진동 방지
+    - 감소 후 decrease_cooldown, 증가 후 increase_interval 동안 재조정하지 않음
+    """
+
+    name = "aimd"
+
+    def __init__(self, min_fps=15, max_fps=60, min_scale=0.5, max_scale=1.0,
+                 cpu_budget=50.0, frame_deadline_ms=None, max_drop_rate=5.0, headroom=0.7,
+                 decrease_factor=0.8, fps_increase_step=1, scale_step=0.05,
+                 decrease_cooldown=4.0, increase_interval=2.0):
+        """
+        Args:
+            cpu_budget: 프로세스 CPU 예산 (%)
+            frame_deadline_ms: 프레임 처리 시간 데드라인 (None이면 1000/fps의 80%)
+            max_drop_rate: 허용하는 끊김 비율 (%)
+            headroom: 복구를 시작할 예산 대비 비율
+            decrease_factor: 과부하 시 FPS 곱셈 감소 계수
+            fps_increase_step: 복구 시 FPS 증가량
+            scale_step: 해상도 스케일 증감량
+            decrease_cooldown: 감소 후 대기 시간 (초)
+            increase_interval: 증가 간 최소 간격 (초)
+        """
+        super().__init__(min_fps, max_fps, min_scale, max_scale)
+        self.cpu_budget = cpu_budget
+        self.frame_deadline_ms = frame_deadline_ms
+        self.max_drop_rate = max_drop_rate
+        self.headroom = headroom
+        self.decrease_factor = decrease_factor
+        self.fps_increase_step = fps_increase_step
+        self.scale_step = scale_step
+        self.decrease_cooldown = decrease_cooldown
+        self.increase_interval = increase_interval
+
+        self.last_decrease_time = float('-inf')
+        self.last_increase_time = float('-inf')
+
+    def get_deadline_ms(self):
+        """현재 FPS 기준 프레임 처리 시간 데드라인 (ms)"""
+        if self.frame_deadline_ms:
+            return self.frame_deadline_ms
+        return 1000.0 / self.fps * 0.8
+
+    def update(self, sample, now):
+        cpu = sample.get('cpu', 0.0)
+        frame_time = sample.get('frame_time_ms', 0.0)
+        drop_rate = sample.get('drop_rate', 0.0)
+        deadline = self.get_deadline_ms()
+
+        overloaded = cpu > self.cpu_budget or frame_time > deadline or drop_rate > self.max_drop_rate
+        relaxed = (cpu < self.cpu_budget * self.headroom and
+                   frame_time < deadline * self.headroom and
+                   drop_rate < self.max_drop_rate * self.headroom)
+
+        if overloaded:
+            if now - self.last_decrease_time < self.decrease_cooldown:
+                return self.fps, self.scale
+            if self.fps > self.min_fps:
+                self.fps = max(self.min_fps, int(self.fps * self.decrease_factor))
+            elif self.scale > self.min_scale:
+                self.scale = round(max(self.min_scale, self.scale - self.scale_step * 2), 3)
+            else:
+                return self.fps, self.scale
+            self.last_decrease_time = now
+            logger.debug(
+                f"AIMD decrease (cpu={cpu:.1f}%, frame={frame_time:.1f}ms, drops={drop_rate:.1f}%): "
+                f"fps={self.fps}, scale={self.scale}"
+            )
+
+        elif relaxed:
+            if (now - self.last_increase_time < self.increase_interval or
+                    now - self.last_decrease_time < self.decrease_cooldown):
+                return self.fps, self.scale
+            if self.scale < self.original_scale:
+                self.scale = round(min(self.original_scale, self.scale + self.scale_step), 3)
+            elif self.fps < self.original_fps:
+                self.fps = min(self.original_fps, self.fps + self.fps_increase_step)
+            else:
+                return self.fps, self.scale
+            self.last_increase_time = now
+            logger.debug(f"AIMD increase (cpu={cpu:.1f}%, frame={frame_time:.1f}ms): fps={self.fps}, scale={self.scale}")
+
+        return self.fps, self.scale
+
+
+# 이름 → 컨트롤러 클래스 (설정 파일의 fps_controller 값)
+CONTROLLERS = {
+    StepController.name: StepController,
+    AIMDController.name: AIMDController,
+}
+
+
+def register_controller(cls):
+    """커스텀 컨트롤러 등록 (cls.name을 키로 사용)"""
+    CONTROLLERS[cls.name] = cls
+    return cls
+
+
+def create_controller(name, **kwargs):
+    """
+    이름으로 컨트롤러 생성
+
+    Args:
+        name: 컨트롤러 이름 ('aimd', 'step' 등)
+        **kwargs: 컨트롤러 생성자 인자 (해당 컨트롤러가 받지 않는 인자는 무시)
+
+    Returns:
+        FpsController: 알 수 없는 이름이면 AIMDController
+    """
+    cls = CONTROLLERS.get(name)
+    if cls is None:
+        logger.warning(f"Unknown FPS controller '{name}', using '{AIMDController.name}'")
+        cls = AIMDController
+
+    accepted = inspect.signature(cls.__init__).parameters
+    options = {key: value for key, value in kwargs.items() if key in accepted and value is not None}
+    return cls(**options)
@@ -0,0 +1,305 @@
+"""
+입력 샘플링 모듈
+- 플랫폼 입력 소스 추상화: Win32InputSource (실제 마우스), SyntheticInputSource (벤치마크/Linux)
+- InputSampler
+  - 창 위치 캐시 (디스플레이 구성이 바뀔 때만 다시 조회)
+  - 커서 아래 윈도우의 바탕화면 여부를 hwnd별로 캐시 (클래스명/부모 조회 반복 방지)
+  - 커서가 멈춰 있으면 폴링 간격을 점점 늘리고 움직이면 즉시 최소 간격으로 복귀
+"""
+import time
+
+from logger import get_logger
+
+logger = get_logger("InputSource")
+
+# 바탕화면 관련 윈도우 클래스
+# - Progman: 기본 바탕화면
+# - WorkerW: 동적 바탕화면 (Live Wallpaper가 이 안에 들어감)
+# - SHELLDLL_DefView: 아이콘 표시 영역
+# - SysListView32: 바탕화면 아이콘 리스트뷰 (SHELLDLL_DefView의 자식)
+DESKTOP_CLASSES = frozenset(("Progman", "WorkerW", "SHELLDLL_DefView", "SysListView32"))
+DESKTOP_PARENT_CLASSES = frozenset(("Progman", "WorkerW", "SHELLDLL_DefView"))
+
+
+class Win32InputSource:
+    """Windows 마우스/윈도우 조회 (pywin32)"""
+
+    VK_LBUTTON = 0x01
+    SM_XVIRTUALSCREEN = 76
+    SM_YVIRTUALSCREEN = 77
+    SM_CXVIRTUALSCREEN = 78
+    SM_CYVIRTUALSCREEN = 79
+
+    def __init__(self):
+        import win32api
+        import win32gui
+        self.win32api = win32api
+        self.win32gui = win32gui
+
+    def cursor_pos(self):
+        return self.win32api.GetCursorPos()
+
+    def left_button_down(self):
+        return bool(self.win32api.GetAsyncKeyState(self.VK_LBUTTON) & 0x8000)
+
+    def window_rect(self, hwnd):
+        """창 영역 (left, top, right, bottom) - 창이 없으면 None"""
+        if not self.win32gui.IsWindow(hwnd):
+            return None
+        return self.win32gui.GetWindowRect(hwnd)
+
+    def display_token(self):
+        """디스플레이 구성 식별값 (가상 화면 위치/크기 - 바뀌면 창 위치 다시 조회)"""
+        metrics = self.win32api.GetSystemMetrics
+        return (metrics(self.SM_XVIRTUALSCREEN), metrics(self.SM_YVIRTUALSCREEN),
+                metrics(self.SM_CXVIRTUALSCREEN), metrics(self.SM_CYVIRTUALSCREEN))
+
+    def window_at(self, x, y):
+        return self.win32gui.WindowFromPoint((x, y))
+
+    def window_class(self, hwnd):
+        return self.win32gui.GetClassName(hwnd)
+
+    def parent(self, hwnd):
+        return self.win32gui.GetParent(hwnd)
+
+
+class SyntheticInputSource:
+    """
+    스크립트로 움직이는 가상 마우스 (Win32 없이 벤치마크)
+
+    script: [(지속 시간, (x0, y0), (x1, y1), 버튼 누름), ...]
+        구간 동안 커서가 (x0, y0)에서 (x1, y1)로 선형 이동 (같으면 정지)
+        스크립트가 끝나면 마지막 위치에 정지
+
+    calls: API별 호출 횟수 (폴링 비용 비교용)
+    """
+
+    def __init__(self, script, desktop_hwnd=1, clock=time.perf_counter):
+        self.script = list(script)
+        self.desktop_hwnd = desktop_hwnd
+        self.clock = clock
+        self.start_time = clock()
+        self.calls = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _state(self):
+        elapsed = self.clock() - self.start_time
+        for duration, start, end, button in self.script:
+            if elapsed < duration:
+                ratio = elapsed / duration if duration > 0 else 1.0
+                x = start[0] + (end[0] - start[0]) * ratio
+                y = start[1] + (end[1] - start[1]) * ratio
+                return (int(x), int(y)), button
+            elapsed -= duration
+        if not self.script:
+            return (0, 0), False
+        return tuple(self.script[-1][2]), False
+
+    def movement_times(self):
+        """스크립트상 커서가 움직이기 시작하는 시각 목록 (clock 기준)"""
+        times = []
+        offset = self.start_time
+        for duration, start, end, _ in self.script:
+            if tuple(start) != tuple(end):
+                times.append(offset)
+            offset += duration
+        return times
+
+    def cursor_pos(self):
+        self._count('cursor_pos')
+        return self._state()[0]
+
+    def left_button_down(self):
+        self._count('left_button_down')
+        return self._state()[1]
+
+    def window_rect(self, hwnd):
+        self._count('window_rect')
+        return (0, 0, 0, 0)
+
+    def display_token(self):
+        self._count('display_token')
+        return (0, 0, 0, 0)
+
+    def window_at(self, x, y):
+        self._count('window_at')
+        return self.desktop_hwnd
+
+    def window_class(self, hwnd):
+        self._count('window_class')
+        return "WorkerW" if hwnd == self.desktop_hwnd else "Chrome_WidgetWin_1"
+
+    def parent(self, hwnd):
+        self._count('parent')
+        return 0
+
+
+class InputSample:
+    """한 번의 입력 샘플 (절대 좌표, 창 기준 상대 좌표, 이동 여부, 버튼 상태)"""
+
+    __slots__ = ('x', 'y', 'rel_x', 'rel_y', 'moved', 'button')
+
+    def __init__(self, x, y, rel_x, rel_y, moved, button):
+        self.x = x
+        self.y = y
+        self.rel_x = rel_x
+        self.rel_y = rel_y
+        self.moved = moved
+        self.button = button
+
+
+class InputSampler:
+    """
+    적응형 입력 샘플링
+
+    사용 예:
+        sampler = InputSampler(Win32InputSource(), hwnd, work_area)
+        while running:
+            sample = sampler.sample()
+            ...
+            time.sleep(sampler.next_interval(is_idle, hot=over_ui))
+    """
+
+    def __init__(self, source, hwnd, work_area, min_interval=0.02, max_interval=0.1, idle_interval=0.2,
+                 backoff=1.5, geometry_check_interval=2.0, memo_size=256):
+        """
+        Args:
+            source: 입력 소스 (Win32InputSource, SyntheticInputSource)
+            hwnd: 배경화면 창 핸들
+            work_area: (left, top, width, height) - 창 위치를 알 수 없을 때 기준
+            min_interval: 움직이는 중 폴링 간격 (초, 50Hz)
+            max_interval: 멈춰 있을 때 최대 폴링 간격 (초)
+            idle_interval: idle 모드 폴링 간격 (초)
+            backoff: 멈춰 있는 샘플마다 간격에 곱할 값
+            geometry_check_interval: 디스플레이 구성 변경 확인 간격 (초)
+            memo_size: 바탕화면 판정 캐시 최대 항목 수
+        """
+        self.source = source
+        self.hwnd = hwnd
+        self.work_area = work_area
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.backoff = backoff
+        self.geometry_check_interval = geometry_check_interval
+        self.memo_size = memo_size
+
+        self.window_origin = None  # 캐시된 창 좌상단 (None이면 다시 조회)
+        self.display_token = None
+        self.last_geometry_check = 0.0
+        self.desktop_memo = {}  # hwnd → 바탕화면 여부
+
+        self.prev_pos = None
+        self.interval = min_interval
+        self.samples = 0
+
+    def invalidate_geometry(self):
+        """창 위치/바탕화면 판정 캐시 무효화 (창 이동, 디스플레이 변경 시)"""
+        self.window_origin = None
+        self.desktop_memo.clear()
+
+    def _origin(self, now):
+        """캐시된 창 좌상단 (디스플레이 구성이 바뀌었으면 다시 조회)"""
+        if now - self.last_geometry_check >= self.geometry_check_interval:
+            self.last_geometry_check = now
+            token = self.source.display_token()
+            if token != self.display_token:
+                if self.display_token is not None:
+                    logger.info("Display configuration changed, refreshing window geometry")
+                self.display_token = token
+                self.invalidate_geometry()
+
+        if self.window_origin is None:
+            rect = None
+            try:
+                rect = self.source.window_rect(self.hwnd)
+            except Exception as e:
+                logger.debug(f"Window rect unavailable: {e}")
+            if rect is None:
+                self.window_origin = (self.work_area[0], self.work_area[1])
+            else:
+                self.window_origin = (rect[0], rect[1])
+        return self.window_origin
+
+    def sample(self):
+        """
+        현재 입력 상태 샘플
+
+        Returns:
+            InputSample (커서 위치를 읽을 수 없으면 None)
+        """
+        try:
+            x, y = self.source.cursor_pos()
+        except Exception:
+            return None
+        left, top = self._origin(time.monotonic())
+        moved = (x, y) != self.prev_pos
+        self.prev_pos = (x, y)
+        self.samples += 1
+        return InputSample(x, y, x - left, y - top, moved, self.source.left_button_down())
+
+    def in_work_area(self, x, y):
+        left, top, width, height = self.work_area
+        return left <= x <= left + width and top <= y <= top + height
+
+    def is_desktop_at(self, x, y):
+        """커서 아래 윈도우가 바탕화면(또는 배경화면 창)인지 확인"""
+        return self.is_desktop_window(self.source.window_at(x, y))
+
+    def is_desktop_window(self, hwnd):
+        """
+        주어진 윈도우가 바탕화면 윈도우인지 확인 (hwnd별 캐시)
+
+        Returns:
+            bool: 바탕화면 윈도우이면 True
+        """
+        if not hwnd:
+            return False
+        if hwnd == self.hwnd:
+            # 배경화면 창 자신도 바탕화면으로 취급
+            return True
+        cached = self.desktop_memo.get(hwnd)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self._classify(hwnd)
+        except Exception:
+            return False
+        if len(self.desktop_memo) >= self.memo_size:
+            self.desktop_memo.clear()
+        self.desktop_memo[hwnd] = result
+        return result
+
+    def _classify(self, hwnd):
+        if self.source.window_class(hwnd) in DESKTOP_CLASSES:
+            return True
+        # 부모 윈도우 체크 (최대 3단계까지 - WorkerW나 Progman의 자식/손자인지)
+        current = hwnd
+        for _ in range(3):
+            parent = self.source.parent(current)
+            if not parent:
+                break
+            if self.source.window_class(parent) in DESKTOP_PARENT_CLASSES:
+                return True
+            current = parent
+        return False
+
+    def next_interval(self, is_idle=False, hot=False, moved=False):
+        """
+        다음 샘플까지 대기 시간
+
+        Args:
+            is_idle: idle 모드 (상한 idle_interval)
+            hot: UI 위에 있거나 드래그 중 (빠른 클릭을 놓치지 않도록 최소 간격 유지)
+            moved: 이번 샘플에서 커서가 움직였는지
+        """
+        if moved or hot:
+            self.interval = self.min_interval
+        else:
+            cap = self.idle_interval if is_idle else self.max_interval
+            self.interval = min(cap, self.interval * self.backoff)
+        return self.interval
@@ -0,0 +1,307 @@
+"""
+비디오 라이브러리 카탈로그 모듈
+- 앱 데이터 디렉토리의 SQLite DB(library.db)에 알고 있는 비디오 목록 유지
+  - 파일 식별 정보 (경로, 크기, 수정 시각), 프로브 메타데이터, 캐시 파일 위치
+  - 마지막 재생 시각, 재생 횟수
+- 폴더 재검색은 크기/수정 시각이 바뀐 파일만 갱신 (비디오를 다시 열지 않음)
+  메타데이터는 프로브 캐시에 있으면 채우고, 없으면 일괄 준비/재생 시 채워짐
+- 설정 창 목록, 플레이리스트 폴더는 인덱스 쿼리로 조회 (폴더를 다시 프로브하지 않음)
+- 호출마다 새 연결을 열어 스레드/프로세스에서 안전하게 사용 (WAL 모드)
+"""
+import os
+import sqlite3
+import time
+
+from logger import get_logger
+from playlist import scan_folder
+
+logger = get_logger("LibraryCatalog")
+
+CATALOG_FILE_NAME = "library.db"
+SCHEMA_VERSION = 1
+METADATA_FIELDS = ('fps', 'frame_count', 'duration', 'width', 'height', 'codec', 'has_audio', 'seekable')
+ARTIFACT_FIELDS = ('poster_path', 'thumbnail_path', 'audio_path')
+ORDERS = {
+    'name': "name COLLATE NOCASE",
+    'recent': "last_played DESC",
+    'plays': "play_count DESC, name COLLATE NOCASE",
+    'added': "added_at DESC",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    path_key TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    fps REAL,
+    frame_count INTEGER,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    codec TEXT,
+    has_audio INTEGER,
+    seekable INTEGER,
+    poster_path TEXT,
+    thumbnail_path TEXT,
+    audio_path TEXT,
+    added_at REAL NOT NULL,
+    last_played REAL,
+    play_count INTEGER NOT NULL DEFAULT 0,
+    missing INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS videos_folder ON videos (folder, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS videos_name ON videos (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS videos_last_played ON videos (last_played DESC) WHERE last_played IS NOT NULL;
+CREATE INDEX IF NOT EXISTS videos_play_count ON videos (play_count DESC);
+"""
+
+
+def _path_key(video_path):
+    """대소문자/구분자 차이를 없앤 경로 키 (Windows)"""
+    return os.path.normcase(os.path.abspath(video_path))
+
+
+def _identity(video_path):
+    """(크기, 수정 시각 ns) - 파일이 없으면 None"""
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class LibraryCatalog:
+    """
+    SQLite 비디오 카탈로그
+
+    사용 예:
+        catalog = LibraryCatalog(os.path.join(config.get_data_dir(), CATALOG_FILE_NAME))
+        catalog.scan(folder, probe_cache=probe_cache)
+        for video in catalog.query(folder=folder):
+            ...
+        catalog.record_play(path)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        if not self.initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                with conn:
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self.initialized = True
+        return conn
+
+    def _execute(self, sql, params=(), many=False):
+        """쓰기 쿼리 하나 실행 (커밋 후 연결 닫기)"""
+        conn = self._connect()
+        try:
+            with conn:
+                if many:
+                    conn.executemany(sql, params)
+                else:
+                    conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def _fetch(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _metadata_values(info):
+        values = []
+        for field in METADATA_FIELDS:
+            value = (info or {}).get(field)
+            values.append(int(value) if isinstance(value, bool) else value)
+        return values
+
+    def add(self, video_path, info=None):
+        """
+        비디오 추가 또는 파일 식별 정보/메타데이터 갱신
+
+        Args:
+            video_path: 비디오 파일 경로
+            info: 프로브 메타데이터 (None이면 기존 값 유지)
+
+        Returns:
+            bool: 추가/갱신 여부 (파일이 없으면 False)
+        """
+        identity = _identity(video_path)
+        if identity is None:
+            return False
+        path = os.path.abspath(video_path)
+        metadata = self._metadata_values(info)
+        assignments = ", ".join(f"{field} = COALESCE(excluded.{field}, {field})" for field in METADATA_FIELDS)
+        self._execute(
+            f"INSERT INTO videos (path_key, path, folder, name, size, mtime_ns, {', '.join(METADATA_FIELDS)}, added_at) "
+            f"VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(METADATA_FIELDS))}, ?) "
+            f"ON CONFLICT (path_key) DO UPDATE SET path = excluded.path, size = excluded.size, "
+            f"mtime_ns = excluded.mtime_ns, missing = 0, {assignments}",
+            (_path_key(path), path, os.path.dirname(path), os.path.basename(path), identity[0], identity[1],
+             *metadata, time.time())
+        )
+        return True
+
+    def scan(self, folder, recursive=False, probe_cache=None):
+        """
+        폴더 재검색 (크기/수정 시각이 바뀐 파일만 갱신)
+
+        Args:
+            folder: 비디오 폴더
+            recursive: 하위 폴더 포함
+            probe_cache: VideoProbeCache (있으면 새/바뀐 파일의 메타데이터를 채움)
+
+        Returns:
+            dict: added, updated, unchanged, missing
+        """
+        folder = os.path.abspath(folder)
+        known = {row['path_key']: row for row in self._fetch(
+            f"SELECT path_key, size, mtime_ns, missing FROM videos WHERE {self._folder_clause(recursive)}",
+            self._folder_params(folder, recursive)
+        )}
+
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'missing': 0}
+        rows = []
+        returned = []
+        seen = set()
+        for video_path in scan_folder(folder, recursive):
+            identity = _identity(video_path)
+            if identity is None:
+                continue
+            key = _path_key(video_path)
+            seen.add(key)
+            row = known.get(key)
+            if row is not None and (row['size'], row['mtime_ns']) == identity:
+                stats['unchanged'] += 1
+                if row['missing']:
+                    returned.append((key,))
+                continue
+            stats['added' if row is None else 'updated'] += 1
+            info = probe_cache.get(video_path) if probe_cache is not None else None
+            path = os.path.abspath(video_path)
+            rows.append((key, path, os.path.dirname(path), os.path.basename(path), identity[0], identity[1],
+                         *self._metadata_values(info), time.time()))
+
+        if rows:
+            # 파일이 바뀌었으면 이전 메타데이터/캐시 위치는 더 이상 맞지 않음 (재생 기록은 유지)
+            assignments = ", ".join([f"{field} = excluded.{field}" for field in METADATA_FIELDS] +
+                                    [f"{field} = NULL" for field in ARTIFACT_FIELDS])
+            self._execute(
+                f"INSERT INTO videos (path_key, path, folder, name, size, mtime_ns, {', '.join(METADATA_FIELDS)}, "
+                f"added_at) VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(METADATA_FIELDS))}, ?) "
+                f"ON CONFLICT (path_key) DO UPDATE SET path = excluded.path, size = excluded.size, "
+                f"mtime_ns = excluded.mtime_ns, missing = 0, {assignments}",
+                rows, many=True
+            )
+        if returned:
+            self._execute("UPDATE videos SET missing = 0 WHERE path_key = ?", returned, many=True)
+
+        gone = [(key,) for key, row in known.items() if key not in seen and not row['missing']]
+        if gone:
+            # 재생 기록은 남겨 둠 (파일이 돌아오면 다시 사용)
+            self._execute("UPDATE videos SET missing = 1 WHERE path_key = ?", gone, many=True)
+        stats['missing'] = len(gone)
+        logger.info(f"Library scan {folder}: {stats}")
+        return stats
+
+    def update_metadata(self, video_path, info):
+        """프로브 메타데이터 갱신 (없으면 추가)"""
+        return self.add(video_path, info)
+
+    def set_artifacts(self, video_path, poster_path=None, thumbnail_path=None, audio_path=None):
+        """캐시 파일 위치 기록 (None인 항목은 그대로 유지)"""
+        values = {'poster_path': poster_path, 'thumbnail_path': thumbnail_path, 'audio_path': audio_path}
+        values = {field: value for field, value in values.items() if value is not None}
+        if not values:
+            return
+        assignments = ", ".join(f"{field} = ?" for field in values)
+        self._execute(f"UPDATE videos SET {assignments} WHERE path_key = ?",
+                      (*values.values(), _path_key(video_path)))
+
+    def record_play(self, video_path, info=None, when=None):
+        """재생 기록 (마지막 재생 시각, 재생 횟수) - 카탈로그에 없으면 추가"""
+        if not self.add(video_path, info):
+            return
+        self._execute("UPDATE videos SET last_played = ?, play_count = play_count + 1 WHERE path_key = ?",
+                      (when if when is not None else time.time(), _path_key(video_path)))
+
+    def get(self, video_path):
+        """
+        비디오 하나 조회
+
+        Returns:
+            dict: 카탈로그 항목 (없으면 None)
+        """
+        rows = self._fetch("SELECT * FROM videos WHERE path_key = ?", (_path_key(video_path),))
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _folder_clause(recursive):
+        if not recursive:
+            return "folder = ?"
+        # 하위 폴더는 접두사 범위 조건으로 (folder 인덱스 사용)
+        return "(folder = ? OR (folder >= ? AND folder < ?))"
+
+    @staticmethod
+    def _folder_params(folder, recursive):
+        if not recursive:
+            return (folder,)
+        prefix = folder.rstrip(os.sep) + os.sep
+        return (folder, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+
+    def query(self, folder=None, recursive=False, text=None, order='name', limit=200, offset=0):
+        """
+        비디오 목록 조회 (없는 파일 제외)
+
+        Args:
+            folder: 폴더로 제한 (None이면 전체)
+            recursive: folder의 하위 폴더 포함
+            text: 파일 이름에 포함된 문자열 (대소문자 무시)
+            order: ORDERS 키 (name, recent, plays, added)
+            limit, offset: 페이지
+
+        Returns:
+            list: 카탈로그 항목 dict
+        """
+        clauses = ["missing = 0"]
+        params = []
+        if folder is not None:
+            folder = os.path.abspath(folder)
+            clauses.append(self._folder_clause(recursive))
+            params.extend(self._folder_params(folder, recursive))
+        if text:
+            clauses.append("name LIKE ? ESCAPE '\\' COLLATE NOCASE")
+            escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        if order == 'recent':
+            clauses.append("last_played IS NOT NULL")
+        sql = (f"SELECT * FROM videos WHERE {' AND '.join(clauses)} ORDER BY {ORDERS.get(order, ORDERS['name'])} "
+               f"LIMIT ? OFFSET ?")
+        return self._fetch(sql, (*params, limit, offset))
+
+    def recent(self, limit=20):
+        """최근 재생한 비디오 (최근 순)"""
+        return self.query(order='recent', limit=limit)
+
+    def paths(self, folder, recursive=False):
+        """폴더의 비디오 경로 (이름순) - 플레이리스트용"""
+        return [row['path'] for row in self.query(folder=folder, recursive=recursive, limit=-1)]
+
+    def count(self):
+        """없는 파일을 제외한 비디오 수"""
+        return self._fetch("SELECT COUNT(*) AS n FROM videos WHERE missing = 0")[0]['n']
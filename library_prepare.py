@@ -0,0 +1,295 @@
+"""
+라이브러리 일괄 준비 모듈
+- 폴더의 비디오마다 첫 재생 때 하던 작업을 미리 수행 (프로세스 풀, 비디오 단위 병렬)
+  - 메타데이터 프로브 + 시간 기준 seek 가능 여부/비용 확인 (video_probe 캐시)
+  - 오디오 추출 (audio_cache)
+  - 포스터/썸네일 (poster_cache)
+- 결과 파일은 캐시 루트(cache_manager)에 저장 - 작업 프로세스는 파일만 기록하고
+  매니페스트 등록/용량 관리는 부모 프로세스가 함
+- 비디오별로 캐시를 확인해 이미 준비된 작업은 건너뜀
+  (캐시 키에 파일 크기/수정 시각이 들어가므로 바뀐 파일만 다시 준비하고,
+  중단 후 다시 실행하면 남은 항목부터 이어서 진행)
+- 프로브 캐시(JSON 파일 하나)와 라이브러리 카탈로그는 부모 프로세스만 기록 (작업 프로세스는 결과만 반환)
+
+실행:
+    python main.py prepare <folder> [--recursive] [--workers N] [--force]
+"""
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+import config
+from audio_cache import audio_cache_name, audio_cache_path, extract_audio_file
+from cache_manager import AUDIO, INDEX, POSTER, PROBE_INDEX_NAME, CacheManager, open_cache
+from library_catalog import CATALOG_FILE_NAME, LibraryCatalog
+from logger import get_logger
+from playlist import scan_folder
+
+logger = get_logger("LibraryPrepare")
+
+TASKS = ('probe', 'audio', 'poster', 'thumbnail')
+
+
+def plan_tasks(video_path, probe_cache, poster_cache, cache, force=False):
+    """
+    비디오 하나에 남은 준비 작업
+
+    Args:
+        cache: CacheManager (추출한 오디오 조회)
+
+    Returns:
+        set: TASKS 중 필요한 작업 (비었으면 이미 준비됨)
+    """
+    if force:
+        return set(TASKS)
+    tasks = set()
+    info = probe_cache.get(video_path)
+    if info is None or info.get('seekable') is None:
+        tasks.add('probe')
+    if (info is None or info.get('has_audio') is not False) and \
+            cache.lookup(AUDIO, audio_cache_name(video_path)) is None:
+        tasks.add('audio')
+    if not poster_cache.has_poster(video_path):
+        tasks.add('poster')
+    if not poster_cache.has_thumbnail(video_path):
+        tasks.add('thumbnail')
+    return tasks
+
+
+def _check_seek(cap, duration):
+    """
+    중간 위치로 seek 후 프레임을 읽어 seek 가능 여부 확인
+
+    Returns:
+        tuple: (seekable, seek 비용 ms, 중간 프레임 또는 None)
+    """
+    import cv2
+    if duration <= 0:
+        return False, None, None
+    target_ms = duration * 500.0
+    start = time.perf_counter()
+    ok = cap.set(cv2.CAP_PROP_POS_MSEC, target_ms) and cap.grab()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    if not ok:
+        return False, elapsed_ms, None
+    # 값만 받아들이고 실제로 이동하지 않는 백엔드도 있음 (1초 이상 어긋나면 seek 불가로 판단)
+    seekable = abs(cap.get(cv2.CAP_PROP_POS_MSEC) - target_ms) < 1000.0
+    ok, frame = cap.retrieve()
+    return seekable, elapsed_ms, frame if ok else None
+
+
+def prepare_video_file(video_path, tasks, cache_root):
+    """
+    비디오 하나 준비 (작업 프로세스에서 실행, 결과는 pickle 가능한 dict)
+
+    Args:
+        video_path: 비디오 파일 경로
+        tasks: plan_tasks 결과
+        cache_root: 캐시 루트 (파일만 기록, 매니페스트는 부모가 갱신)
+
+    Returns:
+        dict: video_path, info(프로브한 경우), has_audio, done(완료한 작업), error, seconds
+    """
+    import cv2
+    from poster_cache import PosterCache
+    from video_capture import CAPTURE_BACKEND
+    from video_probe import probe_capture
+
+    start = time.perf_counter()
+    cache = CacheManager(cache_root)
+    result = {'video_path': video_path, 'info': None, 'has_audio': None, 'done': [], 'error': None}
+    try:
+        if tasks & {'probe', 'poster', 'thumbnail'}:
+            cap = cv2.VideoCapture(video_path, CAPTURE_BACKEND)
+            try:
+                if not cap.isOpened():
+                    raise RuntimeError("cannot open video")
+                info = probe_capture(cap)
+                ok, first = cap.read()
+                info['seekable'], info['seek_ms'], middle = _check_seek(cap, info['duration'])
+            finally:
+                cap.release()
+            result['info'] = info
+            result['done'].append('probe')
+
+            posters = PosterCache(cache.directory(POSTER))
+            if 'poster' in tasks and ok and posters.save_poster(video_path, first):
+                result['done'].append('poster')
+            thumbnail = middle if middle is not None else (first if ok else None)
+            if 'thumbnail' in tasks and posters.save_thumbnail(video_path, thumbnail):
+                result['done'].append('thumbnail')
+
+        if 'audio' in tasks:
+            audio_path, track_missing = extract_audio_file(video_path,
+                                                           audio_cache_path(video_path, cache.directory(AUDIO)))
+            if audio_path or track_missing:
+                result['has_audio'] = bool(audio_path)
+                result['done'].append('audio')
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _init_worker():
+    """작업 프로세스 초기화 - 진행 상황은 부모가 출력하므로 경고 이상만 기록"""
+    logging.getLogger("WallpaperPlayer").setLevel(logging.WARNING)
+
+
+def _record(cache, probe_cache, poster_cache, result):
+    """작업 결과를 캐시 매니페스트와 프로브 캐시에 반영 (부모 프로세스)"""
+    video_path = result['video_path']
+    poster_cache.record_files(video_path)
+    if result['has_audio']:
+        cache.record(AUDIO, audio_cache_name(video_path))
+
+    info = result['info']
+    if info is None:
+        if result['has_audio'] is not None:
+            probe_cache.update(video_path, has_audio=result['has_audio'])
+        return
+
+    previous = probe_cache.get(video_path) or {}
+    if result['has_audio'] is not None:
+        info['has_audio'] = result['has_audio']
+    elif previous.get('has_audio') is not None:
+        info['has_audio'] = previous['has_audio']
+    elif cache.lookup(AUDIO, audio_cache_name(video_path)):
+        info['has_audio'] = True
+    probe_cache.put(video_path, info)
+
+
+def _record_catalog(catalog, video_path, cache, probe_cache, poster_cache):
+    """프로브 메타데이터와 캐시 파일 위치를 카탈로그에 반영 (부모 프로세스)"""
+    try:
+        catalog.update_metadata(video_path, probe_cache.get(video_path))
+        catalog.set_artifacts(
+            video_path,
+            poster_path=poster_cache.poster_path(video_path),
+            thumbnail_path=poster_cache.thumbnail_path(video_path),
+            audio_path=cache.lookup(AUDIO, audio_cache_name(video_path))
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to update library catalog: {e}")
+
+
+def prepare_library(folder, recursive=False, workers=None, force=False, data_dir=None, cache_root=None,
+                    progress=None):
+    """
+    폴더의 비디오 일괄 준비
+
+    Args:
+        folder: 비디오 폴더
+        recursive: 하위 폴더 포함
+        workers: 작업 프로세스 수 (None/0이면 설정값, 설정도 0이면 CPU 수 - 1)
+        force: 캐시가 있어도 다시 준비
+        data_dir: 카탈로그 위치 (None이면 설정 파일 디렉토리)
+        cache_root: 오디오/포스터/프로브 캐시 루트 (None이면 설정의 캐시 위치)
+        progress: 진행 상황 한 줄을 받는 함수 (None이면 출력하지 않음)
+
+    Returns:
+        dict: total, up_to_date, prepared, failed, interrupted, seconds
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    import multiprocessing
+    from poster_cache import PosterCache
+    from video_probe import VideoProbeCache
+
+    started = time.perf_counter()
+    data_dir = data_dir or config.get_data_dir()
+    cache = open_cache(cache_root)
+    probe_cache = VideoProbeCache(cache.path(INDEX, PROBE_INDEX_NAME))
+    poster_cache = PosterCache(cache=cache)
+    catalog = LibraryCatalog(os.path.join(data_dir, CATALOG_FILE_NAME))
+
+    videos = scan_folder(folder, recursive)
+    try:
+        catalog.scan(folder, recursive, probe_cache)
+        uncataloged = {row['path'] for row in catalog.query(folder=folder, recursive=recursive, limit=-1)
+                       if row['poster_path'] is None}
+    except sqlite3.Error as e:
+        logger.warning(f"Library catalog unavailable: {e}")
+        uncataloged = set()
+    todo = []
+    for video_path in videos:
+        tasks = plan_tasks(video_path, probe_cache, poster_cache, cache, force)
+        if tasks:
+            todo.append((video_path, tasks))
+        elif os.path.abspath(video_path) in uncataloged:
+            # 이미 준비된 비디오 (카탈로그보다 먼저 준비됨) - 캐시 위치만 기록
+            _record_catalog(catalog, video_path, cache, probe_cache, poster_cache)
+    summary = {'total': len(videos), 'up_to_date': len(videos) - len(todo), 'prepared': 0, 'failed': 0,
+               'interrupted': False}
+    logger.info(f"Prepare {folder}: {len(videos)} videos, {len(todo)} need work")
+
+    if todo:
+        workers = workers or config.get_prepare_workers() or max(1, (os.cpu_count() or 2) - 1)
+        workers = max(1, min(workers, len(todo)))
+        # spawn: Windows와 같은 방식 (부모의 로그 리스너 스레드를 fork하지 않음)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker)
+        index = 0
+        try:
+            futures = [pool.submit(prepare_video_file, path, tasks, cache.root) for path, tasks in todo]
+            for index, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                name = os.path.basename(result['video_path'])
+                _record(cache, probe_cache, poster_cache, result)
+                _record_catalog(catalog, result['video_path'], cache, probe_cache, poster_cache)
+                if result['error']:
+                    summary['failed'] += 1
+                    logger.warning(f"Prepare failed: {name}: {result['error']}")
+                    line = f"FAILED {name}: {result['error']}"
+                else:
+                    summary['prepared'] += 1
+                    line = f"{name}: {', '.join(result['done']) or 'nothing to do'} ({result['seconds']:.1f}s)"
+                if progress:
+                    progress(f"[{index}/{len(todo)}] {line}")
+        except BrokenProcessPool as e:
+            # 작업 프로세스가 비정상 종료 (디코더 크래시 등) - 남은 항목은 다음 실행에서 다시 시도
+            logger.error(f"Prepare worker crashed: {e}")
+            summary['failed'] += len(todo) - summary['prepared'] - summary['failed']
+            if progress:
+                progress(f"Worker process crashed after {index - 1} of {len(todo)} videos")
+        except KeyboardInterrupt:
+            # 끝난 항목은 이미 캐시에 있으므로 다시 실행하면 이어서 진행
+            summary['interrupted'] = True
+            pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            pool.shutdown(wait=True)
+
+    cache.flush()
+    summary['seconds'] = time.perf_counter() - started
+    logger.info(f"Prepare finished: {summary}")
+    return summary
+
+
+def run_cli(argv):
+    """
+    `python main.py prepare ...` 명령줄 진입점
+
+    Returns:
+        int: 종료 코드 (0 성공, 1 실패 항목 있음/중단, 2 폴더 없음)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py prepare",
+                                     description="Pre-process a video folder so first playback is instant")
+    parser.add_argument("folder")
+    parser.add_argument("--recursive", action="store_true", help="include subfolders")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count - 1)")
+    parser.add_argument("--force", action="store_true", help="prepare again even if the caches are up to date")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        print(f"Not a folder: {args.folder}", file=sys.stderr)
+        return 2
+
+    summary = prepare_library(args.folder, args.recursive, args.workers, args.force,
+                              progress=lambda line: print(line, flush=True))
+    print(f"{summary['total']} videos: {summary['prepared']} prepared, {summary['up_to_date']} up to date, "
+          f"{summary['failed']} failed in {summary['seconds']:.1f}s"
+          f"{' (interrupted - run again to resume)' if summary['interrupted'] else ''}")
+    return 1 if summary['failed'] or summary['interrupted'] else 0
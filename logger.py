@@ -3,65 +3,251 @@
 - 표준화된 로깅 인프라 제공
 - 파일 + 콘솔 동시 출력
 - 디버그/정보/경고/오류 레벨 분리
+- 비동기 출력: 호출 스레드는 큐에 넣기만 하고 백그라운드 리스너가 디스크/콘솔에 기록
+  (렌더/리더 스레드가 로그 파일 I/O로 멈추지 않음)
+- 로그 파일 회전 (LOG_MAX_BYTES × LOG_BACKUP_COUNT)
+- 같은 위치에서 반복되는 경고/오류는 구간당 RATE_LIMIT_BURST개만 기록하고 나머지는 개수로 요약
+  (리스너의 타이머가 구간이 끝날 때마다 요약을 기록하므로 반복이 멈춰도 개수가 남음)
+- import만 하면 콘솔에 동기로 출력하고 스레드를 시작하지 않음
+  (ctl/prepare/cache 명령, 인자만 전달하는 두 번째 실행, 설정 창/prepare 자식 프로세스)
+- 로그 파일은 잠금을 얻은 플레이어 프로세스만 setup_logger(log_file=True)로 엽니다
+  (Windows에서 다른 프로세스가 파일을 열고 있으면 회전이 실패하고 기록이 섞임)
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 
-def setup_logger(name="WallpaperPlayer", level=logging.INFO):
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 로그 파일 최대 크기 (초과 시 회전)
+LOG_BACKUP_COUNT = 3  # 보관할 이전 로그 파일 수
+RATE_LIMIT_INTERVAL = 5.0  # 반복 로그 집계 구간 (초)
+RATE_LIMIT_BURST = 3  # 구간당 호출 위치별 최대 기록 수
+
+_listener = None  # 백그라운드 로그 기록 스레드 (QueueListener)
+
+def get_log_dir():
+    """
+    로그 파일 디렉토리 반환 (wallpaper_player.log 위치)
+
+    프로파일, 트레이스 등 진단 파일도 이 디렉토리에 저장됩니다.
     """
-    로거 설정 및 반환
+    if getattr(sys, 'frozen', False):
+        # 실행 파일인 경우
+        return os.path.dirname(sys.executable)
+    # 개발 환경인 경우
+    return os.path.dirname(os.path.abspath(__file__))
+
+class RateLimitFilter(logging.Filter):
+    """
+    호출 위치(파일, 줄)별 반복 로그 제한
+
+    구간(interval초)마다 위치별로 burst개까지 통과시키고 나머지는 버립니다.
+    버린 개수는 구간이 끝난 뒤 collect()가 요약 레코드로 돌려주며 (LogListener가 주기적으로 호출),
+    그 전에 같은 위치가 다시 기록하면 그 로그에 붙습니다.
+        "Frame queue empty (57 similar messages suppressed in last 5.0s)"
+
+    min_level 미만(INFO 등)은 통계 표처럼 한 위치에서 여러 줄을 쓰는 경우가 있어 제한하지 않으며,
+    extra={'rate_limit': True/False}로 개별 호출에서 바꿀 수 있습니다.
+    """
+
+    def __init__(self, interval=RATE_LIMIT_INTERVAL, burst=RATE_LIMIT_BURST, min_level=logging.WARNING):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.min_level = min_level
+        self.sites = {}  # (pathname, lineno) → [구간 시작, 통과 수, 버린 수, 마지막으로 버린 레코드]
+        self.lock = threading.Lock()
+
+    def _window(self, site, now):
+        """구간 실제 길이 (구간이 끝난 뒤 보고해도 interval을 넘지 않음)"""
+        return min(now - site[0], self.interval)
+
+    def filter(self, record):
+        if not getattr(record, 'rate_limit', record.levelno >= self.min_level):
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None or now - site[0] >= self.interval:
+                suppressed = site[2] if site else 0
+                elapsed = self._window(site, now) if site else 0.0
+                self.sites[key] = [now, 1, 0, None]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                site[3] = record
+                return False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed in last {elapsed:.1f}s)"
+            record.args = None
+        return True
+
+    def collect(self, force=False):
+        """
+        구간이 끝난 위치의 버린 개수를 요약 레코드로 반환하고 위치 정보 정리
+
+        Args:
+            force: True면 진행 중인 구간도 모두 보고 (종료 시)
+
+        Returns:
+            list: 요약 LogRecord (rate_limit=False라 다시 제한되지 않음)
+        """
+        now = time.monotonic()
+        summaries = []
+        with self.lock:
+            for key, site in list(self.sites.items()):
+                if not force and now - site[0] < self.interval:
+                    continue
+                del self.sites[key]
+                if not site[2]:
+                    continue
+                summary = logging.makeLogRecord(site[3].__dict__)
+                summary.msg = (f"{site[3].getMessage()} ({site[2]} similar messages suppressed "
+                               f"in last {self._window(site, now):.1f}s)")
+                summary.args = None
+                summary.exc_info = None
+                summary.exc_text = None
+                summary.rate_limit = False
+                summaries.append(summary)
+        return summaries
+
+
+class LogListener(logging.handlers.QueueListener):
+    """
+    QueueListener + 반복 제한 요약 타이머
+
+    interval초마다 RateLimitFilter.collect()의 요약을 같은 핸들러로 기록하고,
+    stop()에서는 진행 중인 구간까지 모두 기록한 뒤 종료합니다.
+    """
+
+    def __init__(self, log_queue, rate_filter, *handlers, respect_handler_level=False):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.rate_filter = rate_filter
+        self.stop_event = threading.Event()
+        self.flush_thread = None
+
+    def start(self):
+        super().start()
+        self.stop_event.clear()
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True, name="LogRateFlush")
+        self.flush_thread.start()
+
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.rate_filter.interval):
+            self.flush_suppressed()
+
+    def flush_suppressed(self, force=False):
+        """버린 개수 요약을 큐에 넣음 (리스너 스레드가 핸들러로 기록)"""
+        for summary in self.rate_filter.collect(force):
+            self.queue.put_nowait(summary)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.flush_thread is not None:
+            self.flush_thread.join()
+            self.flush_thread = None
+        self.flush_suppressed(force=True)
+        super().stop()
+
+
+def _formatter():
+    return logging.Formatter(
+        '[%(asctime)s] %(levelname)s [%(name)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _setup_console_logger(name="WallpaperPlayer", level=logging.INFO):
+    """import 시 기본 설정: 콘솔 동기 출력만 (스레드, 파일 없음)"""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.setLevel(level)
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(_formatter())
+        console_handler.addFilter(RateLimitFilter())
+        logger.addHandler(console_handler)
+    return logger
+
+
+def stop_logging():
+    """남은 로그를 모두 기록하고 리스너 스레드 종료 (종료 시 atexit에서 호출)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logger(name="WallpaperPlayer", level=logging.INFO, log_file=False):
+    """
+    비동기 로깅 시작 (import 시의 콘솔 동기 출력을 큐 + 리스너 스레드로 교체)
+
+    플레이어 프로세스(main.py에서 단일 인스턴스 잠금을 얻은 뒤)와 헤드리스 벤치마크가 호출합니다.
 
     Args:
         name: 로거 이름
         level: 로그 레벨 (DEBUG, INFO, WARNING, ERROR)
+        log_file: wallpaper_player.log 회전 파일에도 기록 (플레이어 프로세스만)
 
     Returns:
         logging.Logger: 설정된 로거 객체
     """
     logger = logging.getLogger(name)
 
-    # 이미 핸들러가 있으면 중복 방지
-    if logger.handlers:
+    global _listener
+
+    # 이미 시작했으면 중복 방지
+    if _listener is not None:
         return logger
 
     logger.setLevel(level)
+    formatter = _formatter()
 
-    # 포맷터 설정
-    formatter = logging.Formatter(
-        '[%(asctime)s] %(levelname)s [%(name)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
-    # 콘솔 핸들러
+    # 콘솔 핸들러 (리스너 스레드에서 실행)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # 파일 핸들러 (선택적)
-    try:
-        if getattr(sys, 'frozen', False):
-            # 실행 파일인 경우
-            log_dir = os.path.dirname(sys.executable)
-        else:
-            # 개발 환경인 경우
-            log_dir = os.path.dirname(os.path.abspath(__file__))
-
-        log_file = os.path.join(log_dir, "wallpaper_player.log")
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)  # 파일은 모든 레벨 기록
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    except Exception as e:
-        # 파일 핸들러 실패해도 콘솔 로깅은 계속
-        print(f"Warning: Could not create file logger: {e}")
+    handlers = [console_handler]
+
+    # 회전 파일 핸들러 (플레이어 프로세스만)
+    if log_file:
+        try:
+            log_file = os.path.join(get_log_dir(), "wallpaper_player.log")
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+            )
+            file_handler.setLevel(logging.DEBUG)  # 파일은 모든 레벨 기록
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        except Exception as e:
+            # 파일 핸들러 실패해도 콘솔 로깅은 계속
+            print(f"Warning: Could not create file logger: {e}")
+
+    # 호출 스레드는 반복 제한 후 큐에 넣기만 함 (메시지 포맷까지만, I/O 없음)
+    log_queue = queue.SimpleQueue()
+    rate_filter = RateLimitFilter()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(rate_filter)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+
+    _listener = LogListener(log_queue, rate_filter, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
 
     return logger
 
-# 기본 로거 생성
-default_logger = setup_logger()
+# 기본 로거 생성 (콘솔 동기 출력, setup_logger() 전까지)
+default_logger = _setup_console_logger()
 
 def get_logger(name=None):
     """
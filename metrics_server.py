@@ -0,0 +1,181 @@
+"""
+메트릭 서버 모듈
+- localhost 전용 HTTP 서버 (선택 기능, 설정 metrics_enabled)
+- GET /metrics      : Prometheus text format
+- GET /metrics.json : JSON
+- 렌더 루프를 막지 않도록 별도 스레드에서 요청 시점에 값을 수집
+  (렌더 루프는 평소처럼 PerformanceMonitor에 기록만 하고, 서버는 읽기만 함)
+
+확인:
+    curl http://127.0.0.1:9464/metrics
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logger import get_logger
+
+logger = get_logger("MetricsServer")
+
+# (스냅샷 키, Prometheus 이름, 타입, 설명)
+METRIC_DEFINITIONS = (
+    ('fps', 'wallpaper_fps', 'gauge', 'Frames presented per second'),
+    ('target_fps', 'wallpaper_target_fps', 'gauge', 'Current target FPS'),
+    ('scale', 'wallpaper_resolution_scale', 'gauge', 'Current decode/presentation resolution scale'),
+    ('total_frames', 'wallpaper_frames_total', 'counter', 'Frames presented'),
+    ('dropped_frames', 'wallpaper_dropped_frames_total', 'counter', 'Frames dropped'),
+    ('drop_rate', 'wallpaper_drop_rate_percent', 'gauge', 'Dropped frames ratio (%)'),
+    ('queue_depth', 'wallpaper_queue_depth', 'gauge', 'Decoded frames waiting in the queue'),
+    ('queue_size', 'wallpaper_queue_capacity', 'gauge', 'Frame queue capacity'),
+    ('rss_bytes', 'wallpaper_memory_rss_bytes', 'gauge', 'Resident set size'),
+    ('cpu_avg', 'wallpaper_cpu_percent', 'gauge', 'Process CPU usage moving average (%)'),
+    ('idle', 'wallpaper_idle', 'gauge', '1 when playback is paused by idle mode'),
+    ('extended_idle', 'wallpaper_extended_idle', 'gauge', '1 when extended idle (auto-mute) is active'),
+    ('loop_count', 'wallpaper_video_loops_total', 'counter', 'Video loop restarts'),
+    ('audio_drift_seconds', 'wallpaper_audio_drift_seconds', 'gauge', 'Presented video position minus audio position'),
+    ('uptime_seconds', 'wallpaper_uptime_seconds', 'gauge', 'Seconds since the player started'),
+)
+
+LATENCY_QUANTILES = (('p50', '0.5'), ('p95', '0.95'), ('p99', '0.99'))
+
+
+def format_prometheus(snapshot):
+    """
+    스냅샷 dict → Prometheus text format
+
+    Args:
+        snapshot: 메트릭 dict (값이 None인 항목은 생략)
+
+    Returns:
+        str: exposition text
+    """
+    lines = []
+    for key, name, metric_type, help_text in METRIC_DEFINITIONS:
+        value = snapshot.get(key)
+        if value is None:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name} {float(value)}")
+
+    latency = snapshot.get('latency') or {}
+    if latency:
+        name = 'wallpaper_stage_latency_ms'
+        lines.append(f"# HELP {name} Per-stage latency percentiles over the recent ring buffer (ms)")
+        lines.append(f"# TYPE {name} summary")
+        for stage, summary in sorted(latency.items()):
+            for field, quantile in LATENCY_QUANTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {summary[field]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {summary["count"]}')
+
+        name = 'wallpaper_stage_latency_max_ms'
+        lines.append(f"# HELP {name} Per-stage maximum latency since start (ms)")
+        lines.append(f"# TYPE {name} gauge")
+        for stage, summary in sorted(latency.items()):
+            lines.append(f'{name}{{stage="{stage}"}} {summary["max"]}')
+
+    prefetch = snapshot.get('prefetch') or {}
+    if prefetch:
+        name = 'wallpaper_prefetch_total'
+        lines.append(f"# HELP {name} Next-video prefetch outcomes (started, ready, used, failed, wasted)")
+        lines.append(f"# TYPE {name} counter")
+        for event, count in sorted(prefetch.items()):
+            lines.append(f'{name}{{event="{event}"}} {count}')
+
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """GET /metrics, /metrics.json 처리"""
+
+    server_version = "WallpaperMetrics/1.0"
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path not in ('/metrics', '/metrics.json'):
+            self.send_error(404)
+            return
+
+        try:
+            snapshot = self.server.collect()
+        except Exception as e:
+            logger.error(f"Failed to collect metrics: {e}")
+            self.send_error(500)
+            return
+
+        if path == '/metrics':
+            body = format_prometheus(snapshot).encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(snapshot, default=float).encode('utf-8')
+            content_type = 'application/json'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """요청마다 stderr 출력하지 않음"""
+        logger.debug("Metrics request: " + format % args)
+
+
+class MetricsServer:
+    """
+    localhost 메트릭 HTTP 서버
+
+    사용 예:
+        server = MetricsServer(app.collect_metrics, port=9464)
+        server.start()
+        ...
+        server.stop()
+    """
+
+    def __init__(self, collect, host="127.0.0.1", port=9464):
+        """
+        Args:
+            collect: 스냅샷 dict를 반환하는 함수 (서버 스레드에서 호출됨)
+            host: 바인드 주소 (기본 localhost만)
+            port: 포트 (0이면 임의 포트)
+        """
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+        self.start_time = time.time()
+
+    def _collect(self):
+        snapshot = self.collect()
+        snapshot['uptime_seconds'] = time.time() - self.start_time
+        return snapshot
+
+    def start(self):
+        """서버 스레드 시작 (실패해도 플레이어는 계속 동작)"""
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+            self.httpd.daemon_threads = True
+            self.httpd.collect = self._collect
+            self.port = self.httpd.server_address[1]
+        except OSError as e:
+            logger.error(f"Failed to start metrics server on {self.host}:{self.port}: {e}")
+            self.httpd = None
+            return False
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="MetricsServer")
+        self.thread.start()
+        logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """서버 종료"""
+        if self.httpd is None:
+            return
+        try:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        except Exception as e:
+            logger.error(f"Error stopping metrics server: {e}")
+        self.httpd = None
+        logger.info("Metrics server stopped")
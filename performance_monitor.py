@@ -3,57 +3,285 @@
 - CPU 사용률 기반 동적 FPS 조절
 - 프레임 드롭 감지
 - 성능 메트릭 수집
+- 단계별 지연시간 히스토그램 (decode, convert, render 등)
+- 원인별 프레임 드롭 집계 (시간 구간 단위)
 """
 import psutil
 import os
+import threading
 import time
+from array import array
+from collections import deque
+from contextlib import contextmanager
 from logger import get_logger
+from fps_controller import StepController
 
 logger = get_logger("PerformanceMonitor")
 
+# 계측 대상 단계 (hot path)
+# - decode/grab: VideoReader 스레드의 cap.read()/cap.grab()
+# - queue_wait: 메인 루프에서 프레임 큐 대기 시간
+# - convert/scale: BGR→RGB 변환, surface 생성 및 리사이즈
+# - resize: VideoReader 스레드에서 출력 해상도로 축소 (해상도 스케일 적용 시)
+# - ui_render/flip/config_check: 메인 루프 나머지 단계
+# - frame: 메인 루프 한 프레임 처리 시간 (clock.tick 대기 제외)
+LATENCY_STAGES = (
+    'decode', 'grab', 'resize', 'queue_wait', 'convert',
+    'scale', 'ui_render', 'flip', 'config_check', 'frame'
+)
+
+# 프레임 드롭 원인
+# - starvation: 표시할 시점에 큐가 비어 있음 (디코더가 따라오지 못함)
+# - late: 큐에는 프레임이 있었지만 메인 루프가 늦어 표시 슬롯을 놓침
+# - overflow: 큐가 가득 차 VideoReader가 디코딩한 프레임을 버림 (Queue put timeout)
+# - loop_stall: 루프 재시작(seek) 직후 큐가 비어 표시 슬롯을 놓침
+DROP_CAUSES = ('starvation', 'late', 'overflow', 'loop_stall')
+
+# 사용자에게 보이는 끊김으로 간주하는 원인 (컨트롤러 입력)
+STUTTER_CAUSES = ('starvation', 'late', 'overflow')
+
+
+class DropAccounting:
+    """
+    원인별 프레임 드롭을 1초 버킷 링으로 집계
+
+    - 표시한 프레임 수도 같은 버킷에 기록하여 구간별 드롭 비율 계산
+    - 드롭은 여러 스레드에서 기록되므로 (overflow: VideoReader) 락 사용
+      (드롭은 드문 이벤트라 락 비용은 무시 가능)
+    """
+
+    def __init__(self, buckets=120, bucket_seconds=1.0):
+        """
+        Args:
+            buckets: 보관할 버킷 수 (기본 120 = 2분)
+            bucket_seconds: 버킷 길이 (초)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = buckets
+        self.stamps = array('q', [-1] * buckets)  # 버킷이 나타내는 구간 번호
+        self.frames = array('l', [0] * buckets)
+        self.drops = {cause: array('l', [0] * buckets) for cause in DROP_CAUSES}
+        self.totals = dict.fromkeys(DROP_CAUSES, 0)
+        self.lock = threading.Lock()
+
+    def _bucket(self, now):
+        """현재 시각의 버킷 인덱스 (오래된 버킷은 재사용 전에 초기화)"""
+        period = int(now / self.bucket_seconds)
+        index = period % self.num_buckets
+        if self.stamps[index] != period:
+            with self.lock:
+                if self.stamps[index] != period:
+                    self.frames[index] = 0
+                    for counts in self.drops.values():
+                        counts[index] = 0
+                    self.stamps[index] = period
+        return index
+
+    def record_frame(self, now):
+        """표시한 프레임 1개 기록 (메인 스레드)"""
+        self.frames[self._bucket(now)] += 1
+
+    def record_drop(self, cause, count, now):
+        """원인별 드롭 기록"""
+        index = self._bucket(now)
+        with self.lock:
+            self.drops[cause][index] += count
+            self.totals[cause] += count
+
+    def window(self, seconds, now):
+        """
+        최근 구간 집계
+
+        Args:
+            seconds: 구간 길이 (초)
+            now: 현재 시각
+
+        Returns:
+            dict: frames, 원인별 드롭 수, stutter_rate (%)
+        """
+        current = int(now / self.bucket_seconds)
+        oldest = current - max(1, int(seconds / self.bucket_seconds)) + 1
+        result = dict.fromkeys(DROP_CAUSES, 0)
+        frames = 0
+        for index in range(self.num_buckets):
+            if oldest <= self.stamps[index] <= current:
+                frames += self.frames[index]
+                for cause in DROP_CAUSES:
+                    result[cause] += self.drops[cause][index]
+
+        stutter = sum(result[cause] for cause in STUTTER_CAUSES)
+        slots = frames + stutter
+        result['frames'] = frames
+        result['stutter_rate'] = stutter / slots * 100 if slots else 0.0
+        return result
+
+
+class LatencyHistogram:
+    """
+    고정 크기 링 버퍼 기반 지연시간 기록기
+
+    특징:
+    - array('d') 기반으로 샘플 추가 시 메모리 할당 없음
+    - 백분위수(p50/p95/p99)는 요청 시에만 계산
+    - 단일 writer 가정 (단계별로 기록하는 스레드가 하나)
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity: 보관할 최근 샘플 수
+        """
+        self.capacity = capacity
+        self.samples = array('d', bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+        self.max_value = 0.0
+
+    def add(self, seconds):
+        """
+        샘플 추가 (hot path - 최소 연산만 수행)
+
+        Args:
+            seconds: 측정된 지연시간 (초)
+        """
+        index = self.index
+        self.samples[index] = seconds
+        index += 1
+        self.index = 0 if index == self.capacity else index
+        self.count += 1
+        if seconds > self.max_value:
+            self.max_value = seconds
+
+    @staticmethod
+    def percentile(sorted_samples, pct):
+        """정렬된 샘플에서 nearest-rank 백분위수 계산"""
+        if not sorted_samples:
+            return 0.0
+        rank = int(round(pct / 100.0 * (len(sorted_samples) - 1)))
+        return sorted_samples[rank]
+
+    def summary(self):
+        """
+        지연시간 요약 계산 (밀리초 단위)
+
+        Returns:
+            dict: count, p50, p95, p99, max
+        """
+        filled = min(self.count, self.capacity)
+        sorted_samples = sorted(self.samples[:filled])
+        return {
+            'count': self.count,
+            'p50': self.percentile(sorted_samples, 50) * 1000.0,
+            'p95': self.percentile(sorted_samples, 95) * 1000.0,
+            'p99': self.percentile(sorted_samples, 99) * 1000.0,
+            'max': self.max_value * 1000.0
+        }
+
+    def reset(self):
+        """기록 초기화"""
+        self.index = 0
+        self.count = 0
+        self.max_value = 0.0
+
 
 class PerformanceMonitor:
     """
     성능 모니터링 및 동적 FPS 조절 클래스
 
     개선사항:
-    - 스무스한 FPS 조절 (급격한 변화 방지)
-    - CPU 사용률 이동 평균 적용
+    - 교체 가능한 컨트롤러(fps_controller)로 FPS와 해상도 스케일 동시 조절
+    - CPU 사용률 이동 평균 + 프레임 처리 시간 p95를 함께 입력으로 사용
     - 프레임 드롭 카운터
+    - 단계별 지연시간 히스토그램 (운영 환경에서도 켜둘 수 있는 저비용 계측)
+    - 컨트롤러 입력/출력 트레이스 기록 (오프라인 재생용)
     """
 
-    def __init__(self, target_fps=30, min_fps=15, max_fps=60):
+    def __init__(self, target_fps=30, min_fps=15, max_fps=60, latency_capacity=1024,
+                 controller=None, scale=1.0, trace_path=None):
         """
         Args:
             target_fps: 초기 목표 FPS
             min_fps: 최소 FPS (이하로 내려가지 않음)
             max_fps: 최대 FPS (이상으로 올라가지 않음)
+            latency_capacity: 단계별 지연시간 링 버퍼 크기
+            controller: FpsController (None이면 기존 ±5 규칙의 StepController)
+            scale: 초기 해상도 스케일 (컨트롤러 복구 상한)
+            trace_path: 컨트롤러 트레이스 CSV 경로 (None이면 기록 안 함)
         """
         self.target_fps = target_fps
         self.original_target_fps = target_fps
         self.min_fps = min_fps
         self.max_fps = max_fps
+        self.scale = scale
+        self.original_scale = scale
+
+        # FPS/해상도 컨트롤러
+        if controller is None:
+            controller = StepController(min_fps=min_fps, max_fps=max_fps, max_scale=scale)
+        self.controller = controller
+        self.controller.reset(target_fps, scale)
 
         # CPU 모니터링
         self.cpu_check_interval = 2.0  # 2초마다 체크
         self.last_cpu_check_time = time.time()
-        self.cpu_history = []  # CPU 사용률 이력 (이동 평균용)
         self.cpu_history_size = 5
+        self.cpu_history = deque(maxlen=self.cpu_history_size)  # CPU 사용률 이력 (이동 평균용)
 
         # 성능 메트릭
         self.frame_drop_count = 0
         self.total_frames = 0
         self.last_fps_change_time = time.time()
-        self.fps_change_cooldown = 3.0  # FPS 변경 후 3초 대기
+
+        # 원인별 드롭 집계 및 표시 슬롯 추적
+        self.drops = DropAccounting()
+        self.drop_window_seconds = 10.0  # 컨트롤러 입력 구간
+        self.last_present_time = None
+        self.pending_drop_cause = None  # 마지막 표시 이후 빈 큐 읽기 원인
+
+        # 다음 비디오 prefetch 결과 - 플레이리스트/스케줄 (started/ready/used/failed/wasted 횟수)
+        self.prefetch_stats = {'started': 0, 'ready': 0, 'used': 0, 'failed': 0, 'wasted': 0}
+
+        # 실제 표시 FPS (1초 구간 평균)
+        self.actual_fps = 0.0
+        self.rate_window_start = time.time()
+        self.rate_window_frames = 0
+
+        # 컨트롤러 입력용 프레임 처리 시간 (CPU 체크 구간마다 초기화)
+        self.frame_window = LatencyHistogram(256)
 
         # 동적 FPS 활성화 여부
         self.dynamic_fps_enabled = True
 
+        # 단계별 지연시간 계측
+        self.latency_capacity = latency_capacity
+        self.latency = {stage: LatencyHistogram(latency_capacity) for stage in LATENCY_STAGES}
+        self.instrumentation_enabled = True
+
         # 프로세스 CPU 모니터링 (전체 시스템 CPU가 아닌 우리 프로세스만)
         self.process = psutil.Process(os.getpid())
         self.process.cpu_percent(interval=None)  # 첫 호출 초기화
 
-        logger.info(f"PerformanceMonitor initialized: target={target_fps}, range=[{min_fps}, {max_fps}]")
+        # 컨트롤러 트레이스
+        self.trace_file = None
+        if trace_path:
+            self._open_trace(trace_path)
+
+        logger.info(
+            f"PerformanceMonitor initialized: target={target_fps}, range=[{min_fps}, {max_fps}], "
+            f"scale={scale}, controller={self.controller.name}"
+        )
+
+    def _open_trace(self, trace_path):
+        """컨트롤러 트레이스 CSV 열기 (헤더는 새 파일일 때만 기록)"""
+        try:
+            is_new = not os.path.exists(trace_path)
+            self.trace_file = open(trace_path, 'a', encoding='utf-8', buffering=1)
+            if is_new:
+                self.trace_file.write("time,cpu,frame_time_ms,drop_rate,fps,scale\n")
+            logger.info(f"Controller trace: {trace_path}")
+        except Exception as e:
+            logger.error(f"Failed to open controller trace: {e}")
+            self.trace_file = None
 
     def get_cpu_usage(self):
         """
@@ -64,11 +292,7 @@ class PerformanceMonitor:
         """
         # 우리 프로세스의 CPU만 측정 (Non-blocking)
         cpu = self.process.cpu_percent(interval=None)
-        self.cpu_history.append(cpu)
-
-        # 이동 평균 유지
-        if len(self.cpu_history) > self.cpu_history_size:
-            self.cpu_history.pop(0)
+        self.cpu_history.append(cpu)  # deque(maxlen)이 오래된 값을 자동으로 제거
 
         return sum(self.cpu_history) / len(self.cpu_history)
 
@@ -84,50 +308,86 @@ class PerformanceMonitor:
 
         current_time = time.time()
 
-        # CPU 체크 간격 확인
+        # CPU 체크 간격 확인 (변경 후 쿨다운은 컨트롤러가 관리)
         if current_time - self.last_cpu_check_time < self.cpu_check_interval:
             return False
 
-        # FPS 변경 쿨다운 확인
-        if current_time - self.last_fps_change_time < self.fps_change_cooldown:
-            return False
-
         self.last_cpu_check_time = current_time
         return True
 
     def adjust_fps(self):
         """
-        CPU 사용률 기반 동적 FPS 조절
+        컨트롤러 기반 동적 FPS/해상도 조절
+
+        CPU 사용률 이동 평균과 최근 구간의 프레임 처리 시간 p95를
+        컨트롤러에 전달하고, 결과를 target_fps와 scale에 반영합니다.
 
         Returns:
-            tuple: (new_fps, changed) - 새로운 FPS와 변경 여부
+            tuple: (new_fps, changed) - 새로운 FPS와 변경 여부 (FPS 또는 scale)
         """
+        now = time.time()
+        if now - self.rate_window_start >= 1.0:
+            self._update_frame_rate(now)
+
         if not self.should_adjust_fps():
             return self.target_fps, False
 
         cpu_avg = self.get_cpu_usage()
-        old_fps = self.target_fps
-        new_fps = old_fps
-
-        # CPU 부하가 높으면 FPS 낮춤
-        if cpu_avg > 80:
-            new_fps = max(self.min_fps, old_fps - 5)
-            if new_fps != old_fps:
-                logger.warning(f"High CPU usage ({cpu_avg:.1f}%) - Lowering FPS: {old_fps} -> {new_fps}")
-
-        # CPU 여유 있으면 원래 FPS로 복구
-        elif cpu_avg < 30 and old_fps < self.original_target_fps:
-            new_fps = min(self.original_target_fps, old_fps + 5)
-            if new_fps != old_fps:
-                logger.info(f"CPU usage normalized ({cpu_avg:.1f}%) - Restoring FPS: {old_fps} -> {new_fps}")
-
-        # FPS 변경 시
-        if new_fps != old_fps:
-            self.target_fps = new_fps
-            self.last_fps_change_time = time.time()
-            return new_fps, True
+        frame_time = self.frame_window.summary()['p95'] if self.frame_window.count else 0.0
+        self.frame_window.reset()
+
+        drop_window = self.drops.window(self.drop_window_seconds, time.perf_counter())
+        sample = {'cpu': cpu_avg, 'frame_time_ms': frame_time, 'drop_rate': drop_window['stutter_rate']}
+        old_fps, old_scale = self.target_fps, self.scale
+        new_fps, new_scale = self.controller.update(sample, now)
+
+        if self.trace_file:
+            try:
+                self.trace_file.write(
+                    f"{now:.3f},{cpu_avg:.2f},{frame_time:.3f},{sample['drop_rate']:.2f},{new_fps},{new_scale}\n"
+                )
+            except Exception as e:
+                logger.error(f"Failed to write controller trace: {e}")
+                self.trace_file = None
+
+        if new_fps == old_fps and new_scale == old_scale:
+            return old_fps, False
+
+        if new_fps < old_fps or new_scale < old_scale:
+            logger.warning(
+                f"High load (CPU {cpu_avg:.1f}%, frame {frame_time:.1f}ms, "
+                f"stutter {drop_window['stutter_rate']:.1f}%) - "
+                f"FPS: {old_fps} -> {new_fps}, scale: {old_scale} -> {new_scale}"
+            )
+        else:
+            logger.info(
+                f"Load normalized (CPU {cpu_avg:.1f}%, frame {frame_time:.1f}ms) - "
+                f"FPS: {old_fps} -> {new_fps}, scale: {old_scale} -> {new_scale}"
+            )
+
+        self.target_fps = new_fps
+        self.scale = new_scale
+        self.last_fps_change_time = now
+        return new_fps, True
+
+    def _update_frame_rate(self, now):
+        """실제 표시 FPS 갱신 (adjust_fps에서 1초마다 호출)"""
+        elapsed = now - self.rate_window_start
+        self.actual_fps = (self.total_frames - self.rate_window_frames) / elapsed if elapsed > 0 else 0.0
+        self.rate_window_start = now
+        self.rate_window_frames = self.total_frames
+
+    def get_memory_rss(self):
+        """
+        프로세스 메모리 사용량 (RSS)
 
-        return old_fps, False
+        Returns:
+            int: RSS (bytes), 실패 시 0
+        """
+        try:
+            return self.process.memory_info().rss
+        except Exception:
+            return 0
 
     def record_frame(self, dropped=False):
         """
@@ -138,22 +398,176 @@ class PerformanceMonitor:
         """
         self.total_frames += 1
         if dropped:
-            self.frame_drop_count += 1
+            with self.drops.lock:
+                self.frame_drop_count += 1
+
+    def record_present(self, now=None):
+        """
+        프레임 표시 기록 및 놓친 표시 슬롯 분류
+
+        직전 표시 이후 경과 시간으로 놓친 슬롯 수를 계산하고,
+        그 사이에 빈 큐 읽기가 있었으면 그 원인(starvation/loop_stall)으로,
+        없었으면 late(메인 루프 지연)로 분류합니다.
+
+        Args:
+            now: time.perf_counter() 값 (None이면 현재)
+        """
+        if now is None:
+            now = time.perf_counter()
+        last = self.last_present_time
+        self.last_present_time = now
+        self.total_frames += 1
+        self.drops.record_frame(now)
+
+        if last is not None:
+            expected = 1.0 / self.target_fps
+            missed = int((now - last) / expected + 0.5) - 1
+            if missed > 0:
+                self.record_drop(self.pending_drop_cause or 'late', missed, now)
+        self.pending_drop_cause = None
+
+    def record_empty_read(self, cause='starvation'):
+        """
+        빈 큐 읽기 기록 (드롭 수는 다음 표시 시점에 확정)
+
+        Args:
+            cause: 'starvation' 또는 'loop_stall'
+        """
+        if self.pending_drop_cause != 'loop_stall':
+            self.pending_drop_cause = cause
+
+    def record_drop(self, cause, count=1, now=None):
+        """
+        원인별 프레임 드롭 기록 (VideoReader 스레드에서도 호출)
+
+        Args:
+            cause: DROP_CAUSES 중 하나
+            count: 드롭 수
+            now: time.perf_counter() 값 (None이면 현재)
+        """
+        with self.drops.lock:  # 리더 스레드(overflow)와 렌더 스레드(간격 드롭)가 함께 증가
+            self.frame_drop_count += count
+        self.drops.record_drop(cause, count, time.perf_counter() if now is None else now)
+
+    def reset_presentation(self):
+        """표시 간격 추적 초기화 (idle 진입, 비디오 교체 등 의도적인 공백 전)"""
+        self.last_present_time = None
+        self.pending_drop_cause = None
+
+    def record_prefetch(self, event, seconds=None):
+        """
+        다음 비디오 prefetch 이벤트 기록 (플레이리스트/스케줄)
+
+        Args:
+            event: 'started', 'ready', 'used', 'failed', 'wasted' (준비했지만 쓰지 않음)
+            seconds: 준비에 걸린 시간 ('prefetch' 지연시간 단계로 기록)
+        """
+        self.prefetch_stats[event] = self.prefetch_stats.get(event, 0) + 1
+        if seconds is not None:
+            self.record_latency('prefetch', seconds)
+
+    def get_drop_stats(self, seconds=None):
+        """
+        원인별 드롭 통계
+
+        Args:
+            seconds: 구간 길이 (None이면 컨트롤러 입력 구간)
+
+        Returns:
+            dict: window(구간 집계), total(누적 원인별 드롭 수)
+        """
+        window = self.drops.window(seconds or self.drop_window_seconds, time.perf_counter())
+        return {'window': window, 'total': dict(self.drops.totals)}
+
+    def record_frame_time(self, seconds):
+        """
+        메인 루프 한 프레임 처리 시간 기록 (clock.tick 대기 제외)
+
+        Args:
+            seconds: 처리 시간 (초)
+        """
+        self.frame_window.add(seconds)
+        self.record_latency('frame', seconds)
+
+    def record_latency(self, stage, seconds):
+        """
+        단계별 지연시간 기록 (hot path)
+
+        사용 예:
+            start = time.perf_counter()
+            ...
+            monitor.record_latency('convert', time.perf_counter() - start)
+
+        Args:
+            stage: 단계 이름 (LATENCY_STAGES 외의 이름은 처음 기록 시 생성)
+            seconds: 지연시간 (초)
+        """
+        if not self.instrumentation_enabled:
+            return
+        histogram = self.latency.get(stage)
+        if histogram is None:
+            histogram = self.latency[stage] = LatencyHistogram(self.latency_capacity)
+        histogram.add(seconds)
+
+    @contextmanager
+    def time_stage(self, stage):
+        """
+        지연시간 측정 Context Manager (hot path가 아닌 곳에서 사용)
+
+        Args:
+            stage: 단계 이름
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(stage, time.perf_counter() - start)
+
+    def get_latency_stats(self):
+        """
+        단계별 지연시간 요약 (밀리초)
+
+        Returns:
+            dict: {stage: {count, p50, p95, p99, max}} - 샘플이 있는 단계만
+        """
+        return {
+            stage: histogram.summary()
+            for stage, histogram in list(self.latency.items())
+            if histogram.count > 0
+        }
+
+    def enable_instrumentation(self, enabled=True):
+        """
+        지연시간 계측 활성화/비활성화
+
+        Args:
+            enabled: 활성화 여부
+        """
+        self.instrumentation_enabled = enabled
+        logger.info(f"Latency instrumentation: {'enabled' if enabled else 'disabled'}")
 
     def get_stats(self):
         """
         성능 통계 반환
 
         Returns:
-            dict: 성능 메트릭
+            dict: 성능 메트릭 (latency: 단계별 지연시간 백분위수, ms)
         """
-        drop_rate = (self.frame_drop_count / self.total_frames * 100) if self.total_frames > 0 else 0
+        slots = self.total_frames + self.frame_drop_count
+        drop_rate = (self.frame_drop_count / slots * 100) if slots > 0 else 0
         return {
+            'fps': self.actual_fps,
             'target_fps': self.target_fps,
+            'scale': self.scale,
+            'controller': self.controller.name,
             'total_frames': self.total_frames,
             'dropped_frames': self.frame_drop_count,
             'drop_rate': drop_rate,
-            'cpu_avg': sum(self.cpu_history) / len(self.cpu_history) if self.cpu_history else 0
+            'drops': self.get_drop_stats(),
+            'cpu_avg': sum(self.cpu_history) / len(self.cpu_history) if self.cpu_history else 0,
+            'rss_bytes': self.get_memory_rss(),
+            'latency': self.get_latency_stats(),
+            'prefetch': dict(self.prefetch_stats)
         }
 
     def set_target_fps(self, fps):
@@ -166,8 +580,25 @@ class PerformanceMonitor:
         fps = max(self.min_fps, min(self.max_fps, fps))
         self.target_fps = fps
         self.original_target_fps = fps
+        self.scale = self.original_scale
+        self.controller.reset(fps, self.original_scale)
         logger.info(f"Target FPS set to: {fps}")
 
+    def set_scale(self, scale):
+        """
+        해상도 스케일 설정 (컨트롤러 복구 상한)
+
+        Args:
+            scale: 해상도 스케일 (0.5 ~ 1.0)
+        """
+        scale = max(self.controller.min_scale, min(1.0, scale))
+        self.controller.max_scale = scale  # 설정 값보다 높게 올리는 경우도 허용
+        self.scale = scale
+        self.original_scale = scale
+        self.target_fps = self.original_target_fps
+        self.controller.reset(self.original_target_fps, scale)
+        logger.info(f"Resolution scale set to: {scale}")
+
     def enable_dynamic_fps(self, enabled=True):
         """
         동적 FPS 조절 활성화/비활성화
@@ -177,3 +608,12 @@ class PerformanceMonitor:
         """
         self.dynamic_fps_enabled = enabled
         logger.info(f"Dynamic FPS adjustment: {'enabled' if enabled else 'disabled'}")
+
+    def close(self):
+        """트레이스 파일 등 리소스 정리"""
+        if self.trace_file:
+            try:
+                self.trace_file.close()
+            except Exception as e:
+                logger.error(f"Error closing controller trace: {e}")
+            self.trace_file = None
@@ -0,0 +1,197 @@
+"""
+재생 위치 상태 모듈
+- 현재 미디어 위치를 몇 초마다 작은 상태 파일에 체크포인트 (wallpaper_config.json과 분리)
+- 재시작/캡처 재초기화 시 저장된 위치부터 재생
+- 비디오 파일이 바뀌면(크기/수정 시각) 저장된 위치 무시
+- 렌더 스레드는 위치를 메모리에 넘기기만 하고 stat/JSON 쓰기는 백그라운드 스레드가 수행
+  (종료 시 close()는 동기로 기록)
+"""
+import json
+import os
+import threading
+import time
+
+from logger import get_logger
+from video_probe import file_signature
+
+logger = get_logger("PlaybackState")
+
+PLAYBACK_STATE_VERSION = 1
+
+
+class PlaybackState:
+    """
+    비디오별 재생 위치 저장소
+
+    사용 예:
+        state = PlaybackState(path)
+        start = state.get_position(video_path, duration)
+        ...
+        state.checkpoint(video_path, position)   # 메인 루프에서 매 프레임 호출해도 됨
+        ...
+        state.close()                             # 종료 시 남은 위치를 동기로 기록
+    """
+
+    def __init__(self, state_path, interval=5.0, max_entries=16):
+        """
+        Args:
+            state_path: 상태 파일 경로
+            interval: 체크포인트 최소 간격 (초)
+            max_entries: 저장할 최대 비디오 수
+        """
+        self.state_path = state_path
+        self.interval = interval
+        self.max_entries = max_entries
+        self.entries = None  # 처음 사용할 때 로드
+        self.last_checkpoint_time = 0.0
+        self.pending = {}  # 절대 경로 → (서명, 위치) - 아직 기록하지 않은 체크포인트
+        self.pending_lock = threading.Lock()
+        self.lock = threading.Lock()  # entries와 파일 쓰기 (writer 스레드와 close()가 공유)
+        self.wake = threading.Event()
+        self.writer = None
+        self.closed = False
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == PLAYBACK_STATE_VERSION:
+                self.entries = data.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Playback state unreadable, starting fresh: {e}")
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체 (체크포인트 도중 종료되어도 파일이 깨지지 않음)"""
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PLAYBACK_STATE_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning(f"Failed to save playback state: {e}")
+
+    def get_position(self, video_path, duration=None):
+        """
+        저장된 재생 위치 조회
+
+        Args:
+            video_path: 비디오 파일 경로
+            duration: 비디오 길이 (초, 주어지면 끝 1초 이내 위치는 처음부터)
+
+        Returns:
+            float: 재생 시작 위치 (초, 없으면 0.0)
+        """
+        signature = file_signature(video_path)
+        if signature is None:
+            return 0.0
+        key = os.path.abspath(video_path)
+        with self.pending_lock:
+            queued = self.pending.get(key)  # 아직 기록하지 않은 체크포인트가 더 최신
+        if queued is not None:
+            queued_signature, position = queued
+        else:
+            with self.lock:
+                self._load()
+                entry = self.entries.get(key)
+            if not entry:
+                return 0.0
+            queued_signature = (entry.get('size'), entry.get('mtime_ns'))
+            position = entry.get('position', 0.0)
+        if queued_signature != signature:  # 기록 이후 파일이 바뀜
+            return 0.0
+        position = float(position)
+
+        if position < 0 or (duration and position >= duration - 1.0):
+            return 0.0
+        return position
+
+    def checkpoint(self, video_path, position, force=False):
+        """
+        재생 위치 체크포인트 예약 (interval 이내 재호출은 무시, 메모리만 갱신)
+
+        실제 기록은 writer 스레드가 합니다. 종료 시에는 close()로 동기 기록하세요.
+
+        Args:
+            video_path: 비디오 파일 경로
+            position: 현재 미디어 위치 (초)
+            force: 간격과 무관하게 예약 (전환/종료 시)
+
+        Returns:
+            bool: 예약했는지 여부
+        """
+        now = time.monotonic()
+        if not force and now - self.last_checkpoint_time < self.interval:
+            return False
+        self.last_checkpoint_time = now
+
+        if not video_path or position is None:
+            return False
+        signature = file_signature(video_path)  # 위치가 가리키는 파일 (간격마다 한 번만 stat)
+        if signature is None:
+            return False
+        with self.pending_lock:
+            self.pending[os.path.abspath(video_path)] = (signature, position)
+        if self.closed:
+            return True  # close() 이후는 다음 flush()에서 기록
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._writer_loop, daemon=True, name="PlaybackStateWriter")
+            self.writer.start()
+        self.wake.set()
+        return True
+
+    def _writer_loop(self):
+        while not self.closed:
+            self.wake.wait()
+            self.wake.clear()
+            if not self.closed:
+                self.flush()
+
+    def flush(self):
+        """
+        예약된 체크포인트를 기록 (writer 스레드, 또는 종료 시 호출 스레드에서 동기로)
+
+        Returns:
+            bool: 파일에 저장했는지 여부
+        """
+        with self.lock:  # get_position이 꺼낸 뒤 반영 전의 상태를 보지 않도록 먼저 잡음
+            with self.pending_lock:
+                pending, self.pending = self.pending, {}
+            if not pending:
+                return False
+            self._load()
+            changed = False
+            for key, (signature, position) in pending.items():
+                entry = self.entries.get(key)
+                # 위치가 그대로면 (idle 등) 디스크에 쓰지 않음
+                if entry and abs(entry.get('position', -1.0) - position) < 0.5 and \
+                        (entry.get('size'), entry.get('mtime_ns')) == signature:
+                    continue
+
+                self.entries.pop(key, None)
+                self.entries[key] = {
+                    'size': signature[0],
+                    'mtime_ns': signature[1],
+                    'position': round(position, 3),
+                    'saved_at': time.time()
+                }
+                changed = True
+            if not changed:
+                return False
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+            self._save()
+            return True
+
+    def close(self):
+        """writer 스레드를 멈추고 남은 체크포인트를 동기로 기록 (종료 시)"""
+        self.closed = True
+        self.wake.set()
+        if self.writer is not None:
+            self.writer.join(timeout=2.0)
+            self.writer = None
+        self.flush()
@@ -0,0 +1,189 @@
+"""
+플레이리스트 모듈
+- 폴더 또는 명시적 목록으로 재생 목록 구성, 셔플 지원
+- 진행 정책: interval (재생 시간 기준) / loops (비디오 반복 횟수 기준)
+- 교체 시점 전에 다음 항목을 미리 준비(prefetch)할 시점 판단
+  (실제 준비는 video_pipeline.VideoPreparer가 백그라운드에서 수행)
+"""
+import os
+import random
+
+from logger import get_logger
+
+logger = get_logger("Playlist")
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.webm', '.m4v')
+ADVANCE_POLICIES = ('interval', 'loops')
+
+
+def scan_folder(folder, recursive=False):
+    """
+    폴더의 비디오 파일 목록 (이름순)
+
+    Args:
+        folder: 폴더 경로
+        recursive: 하위 폴더까지 포함 (기본은 제외)
+
+    Returns:
+        list: 비디오 파일 경로 (폴더가 없으면 빈 목록)
+    """
+    if recursive:
+        if not os.path.isdir(folder):
+            logger.error(f"Failed to scan playlist folder {folder}: not a directory")
+            return []
+        paths = []
+        for root, dirs, names in os.walk(folder):
+            dirs.sort(key=str.lower)
+            paths.extend(
+                os.path.join(root, name) for name in sorted(names, key=str.lower)
+                if name.lower().endswith(VIDEO_EXTENSIONS)
+            )
+        return paths
+
+    try:
+        names = sorted(os.listdir(folder), key=str.lower)
+    except OSError as e:
+        logger.error(f"Failed to scan playlist folder {folder}: {e}")
+        return []
+    return [
+        os.path.join(folder, name) for name in names
+        if name.lower().endswith(VIDEO_EXTENSIONS) and os.path.isfile(os.path.join(folder, name))
+    ]
+
+
+class Playlist:
+    """
+    재생 순서 관리 (셔플 시 한 바퀴마다 다시 섞고 같은 항목 연속 재생 방지)
+    """
+
+    def __init__(self, items, shuffle=False, start_item=None, rng=None):
+        """
+        Args:
+            items: 비디오 경로 목록
+            shuffle: 셔플 여부
+            start_item: 처음 재생할 항목 (목록에 있으면)
+            rng: random.Random (테스트/재현용, None이면 새로 생성)
+        """
+        self.items = [item for item in items if item]
+        self.shuffle = shuffle
+        self.rng = rng or random.Random()
+        self.order = list(range(len(self.items)))
+        if shuffle:
+            self.rng.shuffle(self.order)
+        self.position = 0
+        self.next_order = None
+
+        if start_item in self.items:
+            index = self.items.index(start_item)
+            self.position = self.order.index(index)
+
+    def __len__(self):
+        return len(self.items)
+
+    def current(self):
+        """현재 항목 (목록이 비었으면 None)"""
+        if not self.items:
+            return None
+        return self.items[self.order[self.position]]
+
+    def _next_cycle_order(self):
+        """셔플 시 다음 바퀴 순서 (한 번만 만들어 peek_next/advance가 공유)"""
+        if self.next_order is None:
+            order = list(range(len(self.items)))
+            self.rng.shuffle(order)
+            # 방금 재생한 항목이 바로 다시 나오지 않도록
+            if len(order) > 1 and order[0] == self.order[self.position]:
+                order[0], order[-1] = order[-1], order[0]
+            self.next_order = order
+        return self.next_order
+
+    def peek_next(self):
+        """다음 항목 (위치를 바꾸지 않음)"""
+        if not self.items:
+            return None
+        if self.position + 1 < len(self.order):
+            return self.items[self.order[self.position + 1]]
+        if self.shuffle:
+            return self.items[self._next_cycle_order()[0]]
+        return self.items[self.order[0]]
+
+    def advance(self):
+        """다음 항목으로 이동 후 반환"""
+        if not self.items:
+            return None
+        if self.position + 1 < len(self.order):
+            self.position += 1
+        else:
+            if self.shuffle:
+                self.order = self._next_cycle_order()
+                self.next_order = None
+            self.position = 0
+        return self.current()
+
+
+class PlaylistEngine:
+    """
+    진행 정책에 따라 prefetch/교체 시점 판단
+
+    - interval: 활성 재생 시간이 interval초를 넘으면 교체 (idle 시간은 제외)
+    - loops: 현재 비디오가 loops번 반복되면 교체
+    - 교체 prefetch_lead초 전에 다음 항목 준비 시작
+    """
+
+    def __init__(self, playlist, advance='interval', interval=600.0, loops=3, prefetch_lead=10.0):
+        """
+        Args:
+            playlist: Playlist
+            advance: 진행 정책 ('interval' 또는 'loops')
+            interval: interval 정책의 항목당 재생 시간 (초)
+            loops: loops 정책의 항목당 반복 횟수
+            prefetch_lead: 교체 몇 초 전에 prefetch를 시작할지
+        """
+        if advance not in ADVANCE_POLICIES:
+            logger.warning(f"Unknown playlist advance policy '{advance}', using interval")
+            advance = 'interval'
+        self.playlist = playlist
+        self.advance_policy = advance
+        self.interval = max(1.0, float(interval))
+        self.loops = max(1, int(loops))
+        self.prefetch_lead = max(0.0, float(prefetch_lead))
+
+        self.played = 0.0  # 현재 항목의 활성 재생 시간 (초)
+        self.start_loop_count = 0  # 현재 항목 시작 시 캡처 loop_count
+
+    def start_item(self, loop_count=0):
+        """새 항목 재생 시작 시 호출 (교체 직후)"""
+        self.played = 0.0
+        self.start_loop_count = loop_count
+
+    def update(self, dt):
+        """활성 재생 시간 누적 (메인 루프에서 매 프레임)"""
+        self.played += dt
+
+    def time_to_advance(self, loop_count, position, duration):
+        """
+        교체까지 남은 예상 시간 (초)
+
+        Args:
+            loop_count: 캡처의 현재 loop_count
+            position: 현재 미디어 위치 (초)
+            duration: 비디오 길이 (초)
+        """
+        if self.advance_policy == 'interval':
+            return self.interval - self.played
+        loops_left = self.loops - (loop_count - self.start_loop_count)
+        if loops_left <= 0:
+            return 0.0
+        return (loops_left - 1) * duration + max(0.0, duration - position)
+
+    def should_prefetch(self, loop_count, position, duration):
+        """다음 항목 준비를 시작할 시점인지"""
+        return len(self.playlist) > 1 and self.time_to_advance(loop_count, position, duration) <= self.prefetch_lead
+
+    def should_advance(self, loop_count, position, duration):
+        """다음 항목으로 교체할 시점인지"""
+        if len(self.playlist) <= 1:
+            return False
+        if self.advance_policy == 'interval':
+            return self.played >= self.interval
+        return loop_count - self.start_loop_count >= self.loops
@@ -0,0 +1,171 @@
+"""
+포스터 프레임 캐시 모듈
+- 비디오별 축소 포스터 프레임(JPEG)을 디스크에 저장
+- 시작/비디오 전환 시 디코더가 첫 프레임을 만들기 전까지 즉시 표시 (검은 화면 방지)
+- 종료 시 마지막으로 표시한 프레임도 저장 가능 (다음 시작 때 포스터보다 우선)
+- 라이브러리 미리보기용 작은 썸네일 (일괄 준비/설정 창에서 생성)
+- 캐시 키: 절대 경로 + 파일 크기 + 수정 시각의 해시 (파일이 바뀌면 자동 무효화)
+- 용량은 cache_manager가 poster 할당량 안에서 LRU로 관리 (조회는 매니페스트로)
+"""
+import os
+
+import cv2
+
+from cache_manager import POSTER, file_key, temp_path
+from logger import get_logger
+
+logger = get_logger("PosterCache")
+
+
+class PosterCache:
+    """
+    비디오별 포스터 프레임 디스크 캐시
+
+    파일 구성:
+        <key>.jpg       비디오 첫 프레임 포스터
+        <key>.last.jpg  종료 시 마지막으로 표시한 프레임
+        <key>.thumb.jpg 라이브러리 썸네일
+    """
+
+    SUFFIXES = ("", ".last", ".thumb")
+
+    def __init__(self, cache_dir=None, max_width=960, thumbnail_width=256, quality=80, cache=None):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (cache를 주면 무시)
+            max_width: 저장 시 최대 너비 (이보다 크면 축소)
+            thumbnail_width: 썸네일 최대 너비
+            quality: JPEG 품질 (0 ~ 100)
+            cache: CacheManager (None이면 cache_dir에 직접 기록 - 일괄 준비 작업 프로세스,
+                   등록/용량 관리는 부모가 record_files로)
+        """
+        self.cache = cache
+        self.cache_dir = cache.directory(POSTER) if cache is not None else cache_dir
+        self.max_width = max_width
+        self.thumbnail_width = thumbnail_width
+        self.quality = quality
+
+    @staticmethod
+    def _name(video_path, suffix):
+        """캐시 파일 이름 (비디오 파일이 없으면 None)"""
+        key = file_key(video_path)
+        return f"{key}{suffix}.jpg" if key else None
+
+    def _lookup(self, video_path, suffix):
+        """저장된 파일 경로 (없으면 None)"""
+        name = self._name(video_path, suffix)
+        if name is None:
+            return None
+        if self.cache is not None:
+            return self.cache.lookup(POSTER, name)
+        path = os.path.join(self.cache_dir, name)
+        return path if os.path.exists(path) else None
+
+    def has_poster(self, video_path):
+        """포스터 프레임이 저장되어 있는지 확인"""
+        return self._lookup(video_path, "") is not None
+
+    def has_thumbnail(self, video_path):
+        """썸네일이 저장되어 있는지 확인"""
+        return self._lookup(video_path, ".thumb") is not None
+
+    def poster_path(self, video_path):
+        """포스터 파일 경로 (없으면 None)"""
+        return self._lookup(video_path, "")
+
+    def thumbnail_path(self, video_path):
+        """썸네일 파일 경로 (없으면 None)"""
+        return self._lookup(video_path, ".thumb")
+
+    def record_files(self, video_path):
+        """다른 프로세스가 cache_dir에 기록한 이 비디오의 파일을 캐시에 등록"""
+        if self.cache is None:
+            return
+        for suffix in self.SUFFIXES:
+            name = self._name(video_path, suffix)
+            if name and os.path.exists(os.path.join(self.cache_dir, name)):
+                self.cache.record(POSTER, name)
+
+    def load(self, video_path, prefer_last=True):
+        """
+        표시할 프레임 로드
+
+        Args:
+            video_path: 비디오 파일 경로
+            prefer_last: 마지막 표시 프레임이 있으면 포스터 대신 사용
+
+        Returns:
+            numpy.ndarray: BGR 프레임 (없으면 None)
+        """
+        suffixes = (".last", "") if prefer_last else ("",)
+        for suffix in suffixes:
+            path = self._lookup(video_path, suffix)
+            if path:
+                frame = cv2.imread(path, cv2.IMREAD_COLOR)
+                if frame is not None:
+                    return frame
+                logger.warning(f"Corrupt poster frame, removing: {path}")
+                self._remove(os.path.basename(path))
+        return None
+
+    def save_poster(self, video_path, frame):
+        """비디오 포스터 프레임 저장 (BGR)"""
+        return self._save(self._name(video_path, ""), frame)
+
+    def save_last_frame(self, video_path, frame):
+        """마지막으로 표시한 프레임 저장 (BGR)"""
+        return self._save(self._name(video_path, ".last"), frame)
+
+    def save_thumbnail(self, video_path, frame):
+        """라이브러리 썸네일 저장 (BGR, thumbnail_width로 축소)"""
+        return self._save(self._name(video_path, ".thumb"), frame, self.thumbnail_width)
+
+    def _save(self, name, frame, max_width=None):
+        """
+        축소 후 JPEG로 원자적 저장
+
+        Args:
+            name: 캐시 파일 이름
+            max_width: 최대 너비 (None이면 self.max_width)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if name is None or frame is None:
+            return False
+        max_width = max_width or self.max_width
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            height, width = frame.shape[:2]
+            if width > max_width:
+                size = (max_width, max(1, int(height * max_width / width)))
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+            ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                return False
+
+            path = os.path.join(self.cache_dir, name)
+            tmp_path = temp_path(path)
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded.tobytes())
+            if self.cache is not None:
+                self.cache.commit(POSTER, name, tmp_path)  # 등록 후 할당량을 넘으면 오래된 파일 제거
+            else:
+                os.replace(tmp_path, path)
+
+            logger.debug(f"Poster frame saved: {name} ({len(encoded) // 1024} KB)")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save poster frame: {e}")
+            return False
+
+    def _remove(self, name):
+        if self.cache is not None:
+            self.cache.remove(POSTER, name)
+            return
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
@@ -0,0 +1,193 @@
+"""
+샘플링 프로파일러 모듈
+- 운영 환경(빌드된 exe 포함)에서 켜고 끌 수 있는 저비용 프로파일러
+- sys._current_frames()로 모든 스레드(메인, VideoReader, MouseInput 등)의
+  파이썬 스택을 주기적으로 샘플링 (대상 코드에 훅을 걸지 않음)
+- 지정한 시간이 지나면 자동 종료하고 로그 폴더에 결과 기록
+  - profile_<시각>.collapsed : 스레드별 collapsed stack (flamegraph.pl/speedscope 호환)
+  - profile_<시각>.txt       : 스레드별 CPU 시간, 샘플 수, 상위 라인 요약
+
+활성화:
+    설정 파일 "profile_seconds": 60  또는  WallpaperPlayer.exe --profile 60
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from logger import get_logger, get_log_dir
+
+logger = get_logger("Profiler")
+
+
+def _frame_label(frame):
+    """스택 프레임 → 'file.py:function:line'"""
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """
+    주기적 스택 샘플링 프로파일러
+
+    사용 예:
+        profiler = SamplingProfiler(duration=60)
+        profiler.start()   # duration 후 자동으로 결과 기록
+    """
+
+    def __init__(self, duration=60.0, interval=0.01, output_dir=None, max_depth=64):
+        """
+        Args:
+            duration: 샘플링 시간 (초)
+            interval: 샘플링 간격 (초, 기본 100Hz)
+            output_dir: 결과 디렉토리 (None이면 로그 폴더)
+            max_depth: 스택 최대 깊이
+        """
+        self.duration = duration
+        self.interval = interval
+        self.output_dir = output_dir or get_log_dir()
+        self.max_depth = max_depth
+
+        self.stacks = Counter()  # (thread_name, stack tuple) → 샘플 수
+        self.thread_samples = Counter()  # thread_name → 샘플 수
+        self.sample_count = 0
+        self.stopped = False
+        self.thread = None
+        self.output_paths = None
+
+        # 스레드별 CPU 시간 (psutil, 시작/종료 시점)
+        self.cpu_start = {}
+        self.cpu_end = {}
+
+    def _thread_cpu_times(self):
+        """native thread id → 누적 CPU 시간 (초)"""
+        try:
+            import psutil
+            return {t.id: t.user_time + t.system_time for t in psutil.Process(os.getpid()).threads()}
+        except Exception as e:
+            logger.debug(f"Per-thread CPU times unavailable: {e}")
+            return {}
+
+    def _thread_names(self):
+        """(ident → name, native_id → name)"""
+        by_ident, by_native = {}, {}
+        for thread in threading.enumerate():
+            by_ident[thread.ident] = thread.name
+            native_id = getattr(thread, 'native_id', None)
+            if native_id is not None:
+                by_native[native_id] = thread.name
+        return by_ident, by_native
+
+    def start(self):
+        """샘플링 스레드 시작"""
+        self.cpu_start = self._thread_cpu_times()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="Profiler")
+        self.thread.start()
+        logger.info(f"Sampling profiler started: {self.duration:.0f}s at {1.0 / self.interval:.0f}Hz")
+        return self
+
+    def stop(self):
+        """샘플링 중지 (결과는 샘플링 스레드가 기록)"""
+        self.stopped = True
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5.0)
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        names, _ = self._thread_names()
+        deadline = time.perf_counter() + self.duration
+        next_names_refresh = time.perf_counter() + 1.0
+
+        while not self.stopped and time.perf_counter() < deadline:
+            now = time.perf_counter()
+            if now >= next_names_refresh:
+                names, _ = self._thread_names()
+                next_names_refresh = now + 1.0
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                depth = 0
+                while frame is not None and depth < self.max_depth:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                    depth += 1
+                stack.reverse()  # root → leaf
+                name = names.get(ident, f"thread-{ident}")
+                self.stacks[(name, tuple(stack))] += 1
+                self.thread_samples[name] += 1
+            self.sample_count += 1
+
+            time.sleep(self.interval)
+
+        self.cpu_end = self._thread_cpu_times()
+        try:
+            self.output_paths = self._write_results()
+            logger.info(f"Profile written: {self.output_paths[0]}, {self.output_paths[1]}")
+        except Exception as e:
+            logger.error(f"Failed to write profile: {e}", exc_info=True)
+
+    def _write_results(self):
+        """collapsed stack 파일과 요약 파일 기록"""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        collapsed_path = os.path.join(self.output_dir, f"profile_{timestamp}.collapsed")
+        summary_path = os.path.join(self.output_dir, f"profile_{timestamp}.txt")
+
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), count in self.stacks.most_common():
+                f.write(f"{thread_name};{';'.join(stack)} {count}\n")
+
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.format_summary())
+
+        return collapsed_path, summary_path
+
+    def format_summary(self, top=15):
+        """
+        스레드별 요약 텍스트
+
+        - CPU: 스레드가 실제로 사용한 CPU 시간 (psutil, 샘플링 구간)
+        - samples: 해당 스레드의 벽시계 샘플 수 (대기 포함)
+        - top lines: 샘플이 가장 많이 걸린 leaf 라인 (cv2 호출/sleep 위치 포함)
+        """
+        _, by_native = self._thread_names()
+        lines = [
+            f"Sampling profile: {self.sample_count} samples, interval {self.interval * 1000:.1f}ms, "
+            f"duration {self.duration:.0f}s",
+            "",
+            "Per-thread CPU time (s):"
+        ]
+        cpu_by_name = Counter()
+        for native_id, end in self.cpu_end.items():
+            name = by_native.get(native_id, f"native-{native_id}")
+            cpu_by_name[name] += end - self.cpu_start.get(native_id, 0.0)
+        for name, seconds in cpu_by_name.most_common():
+            lines.append(f"  {name:<24}{seconds:>10.2f}")
+
+        for thread_name, samples in self.thread_samples.most_common():
+            lines.append("")
+            lines.append(f"[{thread_name}] {samples} samples")
+            leaf_counts = Counter()
+            for (name, stack), count in self.stacks.items():
+                if name == thread_name and stack:
+                    leaf_counts[stack[-1]] += count
+            for label, count in leaf_counts.most_common(top):
+                lines.append(f"  {count / samples * 100:6.1f}%  {label}")
+
+        return "\n".join(lines) + "\n"
+
+
+def start_profiling_if_requested(seconds):
+    """
+    프로파일링 시간이 지정되었으면 프로파일러 시작
+
+    Args:
+        seconds: 샘플링 시간 (0 또는 None이면 비활성)
+
+    Returns:
+        SamplingProfiler 또는 None
+    """
+    if not seconds or seconds <= 0:
+        return None
+    return SamplingProfiler(duration=float(seconds)).start()
@@ -1,21 +1,42 @@
 """
 설정 GUI 모듈
+- 플레이어는 settings_ipc.SettingsProcess로 별도 프로세스에서 실행 (run_settings_process)
+- 미리보기 값은 채널로 플레이어에 보내고 설정 파일은 저장할 때만 기록
+- 최근 재생/라이브러리 목록은 라이브러리 카탈로그(library_catalog) 인덱스 쿼리로 조회하고
+  썸네일 그리드(thumbnail_grid)로 표시
 """
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import config
+import settings_ipc
 import setup_autostart
 import os
+import sqlite3
+from cache_manager import open_cache
+from library_catalog import CATALOG_FILE_NAME, LibraryCatalog
+from thumbnail_grid import ThumbnailGrid, ThumbnailLoader
 
 class SettingsWindow:
-    def __init__(self, parent=None):
+    WIDTH = 600  # 창 너비 (높이는 내용에 맞춤)
+
+    def __init__(self, parent=None, channel=None):
+        """
+        Args:
+            parent: 부모 Tk 창 (None이면 새 Tk 루트)
+            channel: settings_ipc.SettingsChannel (None이면 미리보기 값을 설정 파일에 바로 기록)
+        """
+        self.channel = channel
+        self.saved = False
         self.root = tk.Tk() if parent is None else tk.Toplevel(parent)
         self.root.title("Wallpaper Player - 설정")
-        self.root.geometry("600x820")
-        self.root.resizable(False, False)
+        self.root.resizable(False, True)
         self.root.configure(bg='#f0f0f0')
 
         self.selected_video = None
+        self.catalog = LibraryCatalog(os.path.join(config.get_data_dir(), CATALOG_FILE_NAME))
+        self.library_items = []  # 썸네일 그리드 항목 (카탈로그 행)
+        self.thumbnail_loader = None
+        self.thumbnail_grid = None
         self.result = None
         self.volume_changed = False
         self.mute_changed = False
@@ -32,19 +53,63 @@ class SettingsWindow:
         self.center_window()
 
     def center_window(self):
-        """창을 화면 중앙에 배치합니다."""
+        """창을 내용 크기에 맞추고 화면 중앙에 배치합니다 (높이는 화면의 3/4까지)."""
         self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        chrome = self.root.winfo_reqheight() - self.body_canvas.winfo_reqheight()  # 버튼 영역
+        max_height = self.root.winfo_screenheight() * 3 // 4
+        self.body_canvas.configure(
+            width=self.WIDTH - self.body_scrollbar.winfo_reqwidth(),
+            height=max(min(self.body.winfo_reqheight(), max_height - chrome), 200)
+        )
+        self.root.update_idletasks()
+        width = self.root.winfo_reqwidth()
+        height = self.root.winfo_reqheight()
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
+        self.root.minsize(width, chrome + 200)
+
+    def _create_body(self):
+        """설정 항목을 담는 스크롤 가능한 본문을 만듭니다 (컨테이너는 버튼 영역 다음에 배치)."""
+        container = tk.Frame(self.root, bg='#f0f0f0')
+        self.body_canvas = tk.Canvas(container, bg='#f0f0f0', highlightthickness=0)
+        self.body_scrollbar = tk.Scrollbar(container, command=self.body_canvas.yview)
+        self.body_canvas.configure(yscrollcommand=self.body_scrollbar.set)
+        self.body_scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.body_canvas.pack(side=tk.LEFT, fill='both', expand=True)
+
+        self.body = tk.Frame(self.body_canvas, bg='#f0f0f0')
+        window = self.body_canvas.create_window(0, 0, window=self.body, anchor='nw')
+        self.body.bind('<Configure>', lambda event: self.body_canvas.configure(
+            scrollregion=(0, 0, event.width, event.height)
+        ))
+        self.body_canvas.bind('<Configure>', lambda event: self.body_canvas.itemconfigure(
+            window, width=event.width
+        ))
+        # 썸네일 그리드 위에서는 그리드가 휠을 처리
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.root.bind(sequence, self._on_body_wheel)
+        return container
+
+    def _on_body_wheel(self, event):
+        widget = self.root.winfo_containing(event.x_root, event.y_root)
+        grid = self.thumbnail_grid
+        if widget is None or (grid is not None and str(widget).startswith(str(grid))):
+            return
+        if self.body_canvas.yview() == (0.0, 1.0):
+            return
+        if event.num == 4 or event.delta > 0:
+            self.body_canvas.yview_scroll(-1, 'units')
+        else:
+            self.body_canvas.yview_scroll(1, 'units')
 
     def create_widgets(self):
         """UI 위젯을 생성합니다."""
+        body_container = self._create_body()
+
         # 제목
         title_label = tk.Label(
-            self.root,
+            self.body,
             text="🎬 배경화면 동영상 설정",
             font=("맑은 고딕", 14, "bold"),
             bg='#f0f0f0',
@@ -57,7 +122,7 @@ class SettingsWindow:
         if current_video and os.path.exists(current_video):
             video_name = os.path.basename(current_video)
 
-            current_frame = tk.Frame(self.root, bg='#e8f4f8', relief='groove', borderwidth=2)
+            current_frame = tk.Frame(self.body, bg='#e8f4f8', relief='groove', borderwidth=2)
             current_frame.pack(pady=5, padx=30, fill='x')
 
             current_title = tk.Label(
@@ -79,7 +144,7 @@ class SettingsWindow:
             current_label.pack(anchor='w', padx=8, pady=(0, 3))
 
         # 파일 선택 영역
-        file_frame = tk.Frame(self.root, bg='#f0f0f0')
+        file_frame = tk.Frame(self.body, bg='#f0f0f0')
         file_frame.pack(pady=8, padx=30)
 
         select_label = tk.Label(
@@ -121,12 +186,30 @@ class SettingsWindow:
         )
         browse_btn.pack(side=tk.LEFT)
 
+        # 최근 재생/라이브러리 썸네일 그리드 (썸네일은 작업 스레드에서 보이는 행만 로드)
+        self.library_items = self._load_library_videos()
+        if self.library_items:
+            library_label = tk.Label(
+                file_frame,
+                text="🎞️ 최근 재생 / 라이브러리:",
+                font=("맑은 고딕", 9, "bold"),
+                bg='#f0f0f0',
+                fg='#333333'
+            )
+            library_label.pack(anchor='w', pady=(6, 3))
+
+            self.thumbnail_loader = ThumbnailLoader(open_cache(), self.catalog)
+            self.thumbnail_grid = ThumbnailGrid(
+                file_frame, self.library_items, self.thumbnail_loader, self.on_library_select
+            )
+            self.thumbnail_grid.pack(anchor='w')
+
         # 구분선
-        separator1 = tk.Frame(self.root, bg='#cccccc', height=1)
+        separator1 = tk.Frame(self.body, bg='#cccccc', height=1)
         separator1.pack(pady=8, padx=30, fill='x')
 
         # 음량 설정 영역
-        volume_frame = tk.Frame(self.root, bg='#f0f0f0')
+        volume_frame = tk.Frame(self.body, bg='#f0f0f0')
         volume_frame.pack(pady=5, padx=30, fill='x')
 
         volume_title = tk.Label(
@@ -185,16 +268,17 @@ class SettingsWindow:
             bg='#f0f0f0',
             fg='#333333',
             activebackground='#f0f0f0',
-            selectcolor='white'
+            selectcolor='white',
+            command=self.on_mute_change
         )
         self.mute_checkbox.pack(side=tk.LEFT)
 
         # 구분선
-        separator2 = tk.Frame(self.root, bg='#cccccc', height=1)
+        separator2 = tk.Frame(self.body, bg='#cccccc', height=1)
         separator2.pack(pady=8, padx=30, fill='x')
 
         # 아이콘 투명도 설정 영역
-        opacity_frame = tk.Frame(self.root, bg='#f0f0f0')
+        opacity_frame = tk.Frame(self.body, bg='#f0f0f0')
         opacity_frame.pack(pady=5, padx=30, fill='x')
 
         opacity_title = tk.Label(
@@ -249,11 +333,11 @@ class SettingsWindow:
         opacity_desc.pack(anchor='w', pady=(0, 3))
 
         # 구분선
-        separator3 = tk.Frame(self.root, bg='#cccccc', height=1)
+        separator3 = tk.Frame(self.body, bg='#cccccc', height=1)
         separator3.pack(pady=8, padx=30, fill='x')
 
         # 자동시작 설정 영역
-        autostart_frame = tk.Frame(self.root, bg='#f0f0f0')
+        autostart_frame = tk.Frame(self.body, bg='#f0f0f0')
         autostart_frame.pack(pady=5, padx=30, fill='x')
 
         autostart_title = tk.Label(
@@ -291,11 +375,11 @@ class SettingsWindow:
         autostart_desc.pack(anchor='w', pady=(0, 3))
 
         # 구분선
-        separator4 = tk.Frame(self.root, bg='#cccccc', height=1)
+        separator4 = tk.Frame(self.body, bg='#cccccc', height=1)
         separator4.pack(pady=8, padx=30, fill='x')
 
         # FPS 설정 영역
-        fps_frame = tk.Frame(self.root, bg='#f0f0f0')
+        fps_frame = tk.Frame(self.body, bg='#f0f0f0')
         fps_frame.pack(pady=5, padx=30, fill='x')
 
         fps_title = tk.Label(
@@ -363,7 +447,8 @@ class SettingsWindow:
 
         # 버튼 영역
         button_frame = tk.Frame(self.root, bg='#f0f0f0')
-        button_frame.pack(pady=12)
+        button_frame.pack(side=tk.BOTTOM, pady=12)
+        body_container.pack(fill='both', expand=True)
 
         # 저장 버튼 (비디오 변경 + 설정 저장 통합)
         save_settings_btn = tk.Button(
@@ -410,28 +495,38 @@ class SettingsWindow:
         )
         quit_btn.pack(side=tk.LEFT, padx=4)
 
+    def _preview(self, kind, value, setter):
+        """
+        실시간 미리보기 적용
+
+        채널이 있으면 플레이어에 메시지로 보내고(설정 파일은 저장 시에만 기록),
+        없으면 예전처럼 임시로 설정 파일에 저장합니다.
+        """
+        if self.channel is not None:
+            self.channel.send(kind, value)
+        else:
+            setter(value)
+
     def on_volume_change(self, value):
         """볼륨 슬라이더가 변경될 때 실시간으로 적용합니다."""
         volume_percent = int(float(value))
         self.volume_value_label.config(text=f"음량: {volume_percent}%")
+        self._preview(settings_ipc.MSG_VOLUME, volume_percent / 100.0, config.set_volume)
 
-        # 실시간 미리보기를 위해 임시로 설정에 저장
-        volume_ratio = volume_percent / 100.0
-        config.set_volume(volume_ratio)
+    def on_mute_change(self):
+        """음소거 체크박스가 변경될 때 실시간으로 적용합니다."""
+        self._preview(settings_ipc.MSG_MUTED, self.mute_var.get(), config.set_muted)
 
     def on_opacity_change(self, value):
         """투명도 슬라이더가 변경될 때 실시간으로 적용합니다."""
         opacity_percent = int(float(value))
         self.opacity_value_label.config(text=f"투명도: {opacity_percent}%")
-
-        # 실시간 미리보기를 위해 임시로 설정에 저장
-        config.set_icon_opacity(opacity_percent)
+        self._preview(settings_ipc.MSG_OPACITY, opacity_percent, config.set_icon_opacity)
 
     def on_fps_change(self):
         """FPS가 변경될 때 실시간으로 적용합니다."""
         fps_value = self.fps_var.get()
-        config.set_target_fps(fps_value)
-        print(f"FPS changed to: {fps_value}")
+        self._preview(settings_ipc.MSG_FPS, fps_value, config.set_target_fps)
 
     def browse_file(self):
         """비디오 파일을 선택합니다."""
@@ -450,6 +545,24 @@ class SettingsWindow:
             video_name = os.path.basename(filename)
             self.file_label.config(text=video_name)
 
+    def _load_library_videos(self, limit=1000):
+        """카탈로그에서 최근 재생한 비디오, 이어서 나머지 라이브러리 조회 (카탈로그를 열 수 없으면 빈 목록)"""
+        try:
+            recent = self.catalog.recent(limit=20)
+            library = self.catalog.query(order='name', limit=limit)
+        except sqlite3.Error:
+            return []
+        recent_paths = {item['path'] for item in recent}
+        return recent + [item for item in library if item['path'] not in recent_paths]
+
+    def on_library_select(self, item):
+        """썸네일 그리드에서 비디오를 선택합니다."""
+        if not os.path.exists(item['path']):
+            messagebox.showwarning("경고", f"파일을 찾을 수 없습니다:\n{item['path']}")
+            return
+        self.selected_video = item['path']
+        self.file_label.config(text=item['name'])
+
     def save_settings(self):
         """음량, mute, 투명도, 자동시작, FPS, 비디오 설정을 저장합니다."""
         # 슬라이더에서 현재 값 가져오기
@@ -478,11 +591,21 @@ class SettingsWindow:
         self.mute_changed = True
 
         # 비디오가 선택되었으면 비디오 경로도 저장
-        if self.selected_video:
-            if not os.path.exists(self.selected_video):
-                messagebox.showerror("오류", "선택한 파일이 존재하지 않습니다.")
-                return
+        if self.selected_video and not os.path.exists(self.selected_video):
+            messagebox.showerror("오류", "선택한 파일이 존재하지 않습니다.")
+            return
+
+        # 플레이어에 최종 값 전달 (저장 완료 안내 창보다 먼저)
+        self.saved = True
+        if self.channel is not None:
+            self.channel.send(settings_ipc.MSG_VOLUME, volume_ratio)
+            self.channel.send(settings_ipc.MSG_MUTED, self.mute_var.get())
+            self.channel.send(settings_ipc.MSG_OPACITY, opacity_value)
+            self.channel.send(settings_ipc.MSG_FPS, fps_value)
+            if self.selected_video:
+                self.channel.send(settings_ipc.MSG_VIDEO, self.selected_video)
 
+        if self.selected_video:
             config.set_video_path(self.selected_video)
             self.result = self.selected_video
             video_name = os.path.basename(self.selected_video)
@@ -494,6 +617,11 @@ class SettingsWindow:
 
     def cancel(self):
         """창을 닫고 원래 설정으로 복원합니다."""
+        if self.channel is not None:
+            # 설정 파일은 바뀌지 않았음 - 플레이어가 closed 메시지를 받고 파일 값으로 복원
+            self.root.destroy()
+            return
+
         # 원래 설정값으로 복원
         config.set_volume(self.original_volume)
         config.set_muted(self.original_muted)
@@ -510,18 +638,10 @@ class SettingsWindow:
         # 종료 확인
         if messagebox.askyesno("종료 확인", "정말로 Wallpaper Player를 종료하시겠습니까?"):
             self.quit_app = True
+            if self.channel is not None:
+                self.channel.send(settings_ipc.MSG_QUIT)
             self.root.destroy()
 
-    def update_window(self):
-        """창을 업데이트합니다. main.py의 루프에서 호출됩니다."""
-        if self.root.winfo_exists():
-            try:
-                self.root.update()
-                return True
-            except tk.TclError:
-                return False
-        return False
-
     def is_open(self):
         """창이 열려있는지 확인합니다."""
         try:
@@ -564,6 +684,19 @@ def show_first_time_setup():
         return None
 
 
+def run_settings_process(channel):
+    """
+    설정 창 프로세스 본체 (settings_ipc.SettingsProcess가 별도 프로세스에서 호출)
+
+    창이 닫힐 때까지 Tk 이벤트 루프를 실행하고 마지막에 closed 메시지를 보냅니다.
+    """
+    window = SettingsWindow(channel=channel)
+    try:
+        window.root.mainloop()
+    finally:
+        channel.send(settings_ipc.MSG_CLOSED, {'saved': window.saved})
+
+
 def show_settings_window():
     """설정 창을 생성하고 반환합니다 (non-blocking)."""
     window = SettingsWindow()
@@ -0,0 +1,135 @@
+"""
+설정 창 프로세스 모듈
+- tkinter 설정 창을 별도 프로세스로 실행 (플레이어 렌더 루프는 Tk 이벤트를 처리하지 않음)
+- multiprocessing Pipe로 타입이 정해진 메시지 전달 (설정 창 → 플레이어)
+- 플레이어는 메시지 값을 바로 적용 (미리보기 중 설정 파일을 쓰거나 다시 읽지 않음)
+
+메시지 형식: {'type': MSG_*, 'value': 값}
+    volume   0.0 ~ 1.0
+    muted    bool
+    opacity  0 ~ 100 (설정 파일과 같은 사용자 값)
+    fps      목표 FPS
+    video    새 비디오 경로 (저장 시)
+    quit     프로그램 종료 요청
+    closed   {'saved': bool} - 창 닫힘 (저장하지 않았으면 플레이어가 설정 파일 값으로 복원)
+"""
+from logger import get_logger
+
+logger = get_logger("SettingsIPC")
+
+MSG_VOLUME = 'volume'
+MSG_MUTED = 'muted'
+MSG_OPACITY = 'opacity'
+MSG_FPS = 'fps'
+MSG_VIDEO = 'video'
+MSG_QUIT = 'quit'
+MSG_CLOSED = 'closed'
+MESSAGE_TYPES = (MSG_VOLUME, MSG_MUTED, MSG_OPACITY, MSG_FPS, MSG_VIDEO, MSG_QUIT, MSG_CLOSED)
+
+
+def make_message(kind, value=None):
+    """
+    메시지 생성
+
+    Raises:
+        ValueError: 알 수 없는 메시지 타입
+    """
+    if kind not in MESSAGE_TYPES:
+        raise ValueError(f"Unknown settings message type: {kind}")
+    return {'type': kind, 'value': value}
+
+
+class SettingsChannel:
+    """설정 창 프로세스 쪽 송신 채널"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def send(self, kind, value=None):
+        """메시지 전송 (플레이어가 이미 종료되었으면 무시)"""
+        try:
+            self.conn.send(make_message(kind, value))
+        except (OSError, EOFError, BrokenPipeError):
+            pass
+
+
+def _settings_process_main(conn):
+    """설정 창 프로세스 진입점 (tkinter는 이 프로세스에서만 import)"""
+    import settings_gui
+    settings_gui.run_settings_process(SettingsChannel(conn))
+
+
+class SettingsProcess:
+    """
+    플레이어 쪽 설정 창 프로세스 관리
+
+    사용 예:
+        settings = SettingsProcess().start()
+        for message in settings.poll():     # 메인 루프에서 매 프레임 (대기 없음)
+            apply(message)
+    """
+
+    def __init__(self):
+        self.process = None
+        self.conn = None
+        self.closed = False  # closed 메시지를 받았는지 (또는 프로세스가 비정상 종료)
+
+    def start(self):
+        import multiprocessing  # 설정 창을 열 때만 필요
+        ctx = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(target=_settings_process_main, args=(child_conn,),
+                                   daemon=True, name="SettingsWindow")
+        self.process.start()
+        child_conn.close()  # 자식이 종료하면 recv가 EOFError를 내도록
+        self.conn = parent_conn
+        logger.info(f"Settings window process started (pid {self.process.pid})")
+        return self
+
+    def is_open(self):
+        """설정 창이 아직 열려 있는지 (closed 메시지 전까지)"""
+        return self.process is not None and not self.closed
+
+    def poll(self):
+        """
+        도착한 메시지 모두 가져오기 (대기 없음)
+
+        프로세스가 closed 메시지 없이 끝나면 저장하지 않은 것으로 보고 closed 메시지를 만들어 돌려줍니다.
+
+        Returns:
+            list: 메시지 목록
+        """
+        messages = []
+        if self.conn is None or self.closed:
+            return messages
+        try:
+            while self.conn.poll():
+                message = self.conn.recv()
+                if not isinstance(message, dict) or message.get('type') not in MESSAGE_TYPES:
+                    logger.warning(f"Ignoring malformed settings message: {message!r}")
+                    continue
+                messages.append(message)
+                if message['type'] == MSG_CLOSED:
+                    self.closed = True
+                    break
+        except (EOFError, OSError):
+            logger.warning("Settings window process exited without closing")
+            messages.append(make_message(MSG_CLOSED, {'saved': False}))
+            self.closed = True
+        return messages
+
+    def close(self, terminate=False):
+        """
+        파이프 닫기 (렌더 루프에서 호출되므로 프로세스 종료를 기다리지 않음)
+
+        Args:
+            terminate: 아직 실행 중이면 강제 종료 (플레이어 종료 시)
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            if terminate and self.process.is_alive():
+                self.process.terminate()
+            self.process.join(0)  # 이미 끝났으면 회수
+            self.process = None
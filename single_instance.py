@@ -0,0 +1,124 @@
+"""
+단일 인스턴스 모듈
+- 앱 데이터 디렉토리의 잠금 파일로 플레이어가 하나만 실행되도록 보장
+  (Windows: msvcrt.locking, 그 외: fcntl.flock - 프로세스가 비정상 종료해도 OS가 잠금 해제)
+- 이미 실행 중이면 인자(비디오 경로)를 제어 서버로 전달하고 종료
+- cv2/pygame/오디오를 import하지 않음 (두 번째 실행은 수 밀리초 안에 끝남)
+"""
+import os
+import sys
+import time
+
+from logger import get_logger
+
+logger = get_logger("SingleInstance")
+
+LOCK_FILE_NAME = "wallpaper_player.lock"
+
+
+class InstanceLock:
+    """
+    프로세스 간 단일 인스턴스 잠금
+
+    사용 예:
+        lock = InstanceLock(path)
+        if not lock.acquire():
+            ...  # 이미 실행 중
+        try:
+            run()
+        finally:
+            lock.release()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def acquire(self):
+        """
+        잠금 시도 (대기 없음)
+
+        잠금 파일을 열 수 없으면 (읽기 전용 데이터 디렉토리, 백신/공유 위반 등) 오류를 기록하고
+        잠금 없이 실행합니다 (fail open) - 중복 실행보다 배경화면이 뜨지 않는 쪽이 더 나쁨.
+
+        Returns:
+            bool: 잠금을 얻었거나 잠금 파일을 쓸 수 없으면 True, 다른 프로세스가 잡고 있으면 False
+        """
+        if self.file is not None:
+            return True
+        try:
+            lock_file = open(self.path, 'a+b')
+        except OSError as e:
+            logger.error(f"Cannot open instance lock {self.path}: {e} - running without single-instance check")
+            return True
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self.file = lock_file
+        return True
+
+    def release(self):
+        """잠금 해제 (파일은 남겨 둠 - 삭제하면 다른 프로세스와 경합)"""
+        if self.file is None:
+            return
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        except OSError as e:
+            logger.warning(f"Failed to release instance lock: {e}")
+        self.file.close()
+        self.file = None
+
+
+def forward_to_running_instance(video_path, port, timeout=5.0):
+    """
+    실행 중인 플레이어에 인자 전달
+
+    실행 중인 플레이어가 아직 시작 중이면(제어 서버 전) timeout초까지 다시 시도합니다.
+
+    Args:
+        video_path: 재생할 비디오 (None이면 전달할 것이 없음)
+        port: 제어 서버 포트
+
+    Returns:
+        bool: 전달 성공 (전달할 것이 없으면 True)
+    """
+    if video_path is None:
+        logger.info("Wallpaper Player is already running")
+        return True
+
+    from control_server import send_command
+    video_path = os.path.abspath(video_path)  # 실행 중인 플레이어의 작업 디렉토리는 다름
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = send_command('open', video_path, port=port, timeout=timeout)
+            break
+        except OSError as e:
+            if time.monotonic() >= deadline:
+                logger.error(f"Wallpaper Player is running but did not accept the video: {e}")
+                return False
+            time.sleep(0.1)
+
+    if not response.get('ok'):
+        logger.error(f"Running player rejected the video: {response.get('error')}")
+        return False
+    if (response.get('result') or {}).get('deferred'):
+        logger.info(f"Forwarded video to the running player (paused, switches on resume): "
+                    f"{os.path.basename(video_path)}")
+    else:
+        logger.info(f"Forwarded video to the running player: {os.path.basename(video_path)}")
+    return True
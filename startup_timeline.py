@@ -0,0 +1,61 @@
+"""
+시작 타임라인 모듈
+- 첫 프레임 표시까지의 단계별 시각 기록 (import, config, window, first decoded frame, first present)
+- 첫 표시 시점에 한 번만 로그로 출력
+- 무거운 모듈을 import하지 않음 (main.py 맨 앞에서 시작 시각 기록)
+"""
+import time
+
+
+class StartupTimeline:
+    """
+    시작 단계별 경과 시간 기록
+
+    사용 예:
+        timeline = StartupTimeline(origin)
+        timeline.mark('config')
+        ...
+        timeline.report(logger)   # 첫 호출에만 출력
+    """
+
+    def __init__(self, origin=None):
+        """
+        Args:
+            origin: 기준 시각 (perf_counter, None이면 현재)
+        """
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.marks = []  # [(단계 이름, perf_counter 시각)]
+        self.reported = False
+
+    def mark(self, name, when=None):
+        """
+        단계 완료 시각 기록 (보고 이후에는 무시)
+
+        Args:
+            name: 단계 이름
+            when: perf_counter 시각 (None이면 현재)
+        """
+        if self.reported:
+            return
+        self.marks.append((name, when if when is not None else time.perf_counter()))
+
+    def elapsed(self):
+        """단계별 기준 시각으로부터의 경과 시간 (ms, 기록 순서 유지)"""
+        return {name: (when - self.origin) * 1000.0 for name, when in self.marks}
+
+    def format(self):
+        """'import=120ms config=125ms ...' 형식 문자열"""
+        return " ".join(f"{name}={ms:.0f}ms" for name, ms in self.elapsed().items())
+
+    def report(self, logger):
+        """
+        타임라인 로그 출력 (최초 1회)
+
+        Returns:
+            bool: 이번 호출에서 출력했는지 여부
+        """
+        if self.reported:
+            return False
+        self.reported = True
+        logger.info(f"Startup timeline: {self.format()}")
+        return True
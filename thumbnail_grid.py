@@ -0,0 +1,335 @@
+"""
+설정 창 썸네일 그리드 모듈
+- 최근 재생/라이브러리 비디오를 스크롤 가능한 썸네일 그리드로 표시
+  (비디오마다 위젯을 만들지 않고 Canvas 항목으로 그림 - 수백 개여도 창이 바로 열림)
+- 썸네일은 작업 스레드 풀에서 준비하고 Tk 스레드는 PNG 데이터를 PhotoImage로 바꾸기만 함
+  - 포스터 캐시의 썸네일(.thumb.jpg, 파일 크기/수정 시각 키)을 사용, 없으면 비디오 중간 프레임으로 생성
+- 보이는 행(과 다음 한 행)만 요청하고, 스크롤로 벗어난 대기 요청은 취소
+- cv2는 작업 스레드에서 처음 필요할 때 import
+"""
+import base64
+import os
+import queue
+import sqlite3
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from logger import get_logger
+
+logger = get_logger("ThumbnailGrid")
+
+THUMB_WIDTH = 112
+THUMB_HEIGHT = 63
+THUMBNAIL_WORKERS = 2
+
+
+def grab_thumbnail_frame(video_path):
+    """
+    썸네일용 프레임 (비디오 중간, seek 실패 시 첫 프레임)
+
+    Returns:
+        numpy.ndarray: BGR 프레임 (열 수 없으면 None)
+    """
+    import cv2
+    from video_capture import CAPTURE_BACKEND
+
+    cap = cv2.VideoCapture(video_path, CAPTURE_BACKEND)
+    try:
+        if not cap.isOpened():
+            return None
+        ok, frame = cap.read()
+        if not ok:
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        if fps > 0 and frame_count > 0 and cap.set(cv2.CAP_PROP_POS_MSEC, frame_count / fps * 500.0):
+            ok, middle = cap.read()
+            if ok:
+                frame = middle
+        return frame
+    finally:
+        cap.release()
+
+
+class ThumbnailLoader:
+    """
+    썸네일 작업 스레드 풀
+
+    request/retain/poll은 Tk 스레드에서만 호출하고, 결과는 큐로 전달합니다.
+
+    사용 예:
+        loader = ThumbnailLoader(open_cache(), catalog)
+        loader.request(path)
+        for path, data in loader.poll():  # root.after로 주기적으로
+            image = tk.PhotoImage(data=data) if data else None
+    """
+
+    def __init__(self, cache, catalog=None, workers=THUMBNAIL_WORKERS, size=(THUMB_WIDTH, THUMB_HEIGHT)):
+        """
+        Args:
+            cache: CacheManager (썸네일은 포스터 캐시에 저장됨)
+            catalog: LibraryCatalog (새로 만든 썸네일 위치 기록, None이면 기록하지 않음)
+            workers: 작업 스레드 수
+            size: 그리드에 표시할 최대 크기 (너비, 높이)
+        """
+        self.cache = cache
+        self.catalog = catalog
+        self.size = size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Thumbnail")
+        self.pending = {}  # 비디오 경로 -> Future
+        self.results = queue.SimpleQueue()
+        self.poster_cache = None  # cv2 import를 작업 스레드로 미루기 위해 처음 작업에서 생성
+        self.lock = threading.Lock()
+
+    def request(self, video_path):
+        """썸네일 요청 (이미 대기 중이면 무시)"""
+        if video_path not in self.pending:
+            self.pending[video_path] = self.executor.submit(self._load, video_path)
+
+    def retain(self, video_paths):
+        """video_paths에 없는 대기 요청 취소 (이미 시작한 작업은 끝까지 실행)"""
+        for video_path, future in list(self.pending.items()):
+            if video_path not in video_paths and future.cancel():
+                del self.pending[video_path]
+
+    def poll(self):
+        """
+        끝난 썸네일 (대기 없음)
+
+        Returns:
+            list: (비디오 경로, base64 PNG 데이터 또는 None) 목록
+        """
+        done = []
+        while True:
+            try:
+                video_path, data = self.results.get_nowait()
+            except queue.Empty:
+                return done
+            self.pending.pop(video_path, None)
+            done.append((video_path, data))
+
+    def busy(self):
+        """대기/진행 중인 요청이 있는지"""
+        return bool(self.pending)
+
+    def close(self):
+        """대기 요청 취소 (진행 중인 작업은 기다리지 않음)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.flush()
+
+    def _get_poster_cache(self):
+        with self.lock:
+            if self.poster_cache is None:
+                from poster_cache import PosterCache
+                self.poster_cache = PosterCache(cache=self.cache)
+            return self.poster_cache
+
+    def _load(self, video_path):
+        """썸네일 로드/생성 후 그리드 크기 PNG로 변환 (작업 스레드)"""
+        data = None
+        try:
+            data = self._render(video_path)
+        except Exception as e:
+            logger.warning(f"Failed to load thumbnail for {os.path.basename(video_path)}: {e}")
+        finally:
+            self.results.put((video_path, data))
+
+    def _render(self, video_path):
+        import cv2
+
+        poster_cache = self._get_poster_cache()
+        thumbnail_path = poster_cache.thumbnail_path(video_path)
+        if thumbnail_path is None:
+            if not poster_cache.save_thumbnail(video_path, grab_thumbnail_frame(video_path)):
+                return None
+            thumbnail_path = poster_cache.thumbnail_path(video_path)
+            if self.catalog is not None and thumbnail_path:
+                try:
+                    self.catalog.set_artifacts(video_path, thumbnail_path=thumbnail_path)
+                except sqlite3.Error as e:
+                    logger.debug(f"Thumbnail location not recorded: {e}")
+
+        image = cv2.imread(thumbnail_path) if thumbnail_path else None
+        if image is None:
+            return None
+        height, width = image.shape[:2]
+        scale = min(self.size[0] / width, self.size[1] / height)
+        if scale < 1.0:
+            image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode('.png', image)
+        return base64.b64encode(encoded.tobytes()).decode('ascii') if ok else None
+
+
+class ThumbnailGrid(tk.Frame):
+    """
+    스크롤 가능한 썸네일 그리드 (Canvas)
+
+    items의 각 항목은 'path', 'name' 키를 가진 dict (LibraryCatalog 행)입니다.
+    항목을 클릭하면 on_select(item)을 호출합니다.
+    """
+
+    PAD = 6
+    LABEL_HEIGHT = 18
+    POLL_MS = 50
+    REFRESH_MS = 80  # 스크롤이 멈춘 뒤 보이는 행 요청
+
+    def __init__(self, parent, items, loader, on_select, columns=4, visible_rows=2, bg='#f0f0f0'):
+        super().__init__(parent, bg=bg)
+        self.items = items
+        self.loader = loader
+        self.on_select = on_select
+        self.columns = columns
+        self.cell_width = loader.size[0] + self.PAD * 2
+        self.cell_height = loader.size[1] + self.LABEL_HEIGHT + self.PAD
+        self.rows = (len(items) + columns - 1) // columns
+
+        self.images = {}  # 비디오 경로 -> PhotoImage (참조를 유지해야 표시됨)
+        self.failed = set()
+        self.indexes = {}  # 비디오 경로 -> 항목 인덱스 목록
+        for index, item in enumerate(items):
+            self.indexes.setdefault(item['path'], []).append(index)
+        self.selected = None
+        self.refresh_job = None
+        self.polling = False
+
+        self.canvas = tk.Canvas(
+            self,
+            width=self.cell_width * columns,
+            height=self.cell_height * visible_rows,
+            bg='white',
+            highlightthickness=1,
+            highlightbackground='#cccccc'
+        )
+        scrollbar = tk.Scrollbar(self, command=self._on_scroll)
+        self.canvas.config(
+            yscrollcommand=scrollbar.set,
+            scrollregion=(0, 0, self.cell_width * columns, self.cell_height * self.rows)
+        )
+        self.canvas.pack(side=tk.LEFT)
+        scrollbar.pack(side=tk.LEFT, fill='y')
+
+        for index, item in enumerate(items):
+            self._draw_cell(index, item)
+
+        self.canvas.tag_bind('cell', '<Button-1>', self._on_click)
+        self.canvas.bind('<Configure>', lambda event: self._schedule_refresh())
+        self.canvas.bind('<Enter>', self._bind_wheel)
+        self.canvas.bind('<Leave>', self._unbind_wheel)
+        self.bind('<Destroy>', self._on_destroy)
+
+    def _cell_origin(self, index):
+        row, column = divmod(index, self.columns)
+        return column * self.cell_width, row * self.cell_height
+
+    def _draw_cell(self, index, item):
+        x, y = self._cell_origin(index)
+        tags = ('cell', f'item{index}')
+        self.canvas.create_rectangle(
+            x + self.PAD - 2, y + self.PAD - 2,
+            x + self.cell_width - self.PAD + 2, y + self.PAD + self.loader.size[1] + 2,
+            fill='#e8e8e8', outline='#e8e8e8', width=2, tags=tags + (f'frame{index}',)
+        )
+        name = item['name'] if len(item['name']) <= 18 else item['name'][:17] + "…"
+        self.canvas.create_text(
+            x + self.cell_width // 2, y + self.PAD + self.loader.size[1] + self.LABEL_HEIGHT // 2 + 1,
+            text=name, font=("맑은 고딕", 7), fill='#333333', tags=tags
+        )
+
+    def _draw_thumbnail(self, video_path, data):
+        if data:
+            try:
+                self.images[video_path] = tk.PhotoImage(data=data)
+            except tk.TclError:
+                data = None
+        if not data:
+            self.failed.add(video_path)
+        for index in self.indexes.get(video_path, ()):
+            x, y = self._cell_origin(index)
+            center = (x + self.cell_width // 2, y + self.PAD + self.loader.size[1] // 2)
+            tags = ('cell', f'item{index}')
+            if data:
+                self.canvas.create_image(*center, image=self.images[video_path], tags=tags)
+            else:
+                self.canvas.create_text(*center, text="미리보기 없음", font=("맑은 고딕", 7),
+                                        fill='#999999', tags=tags)
+
+    def _visible_paths(self):
+        """보이는 행과 다음 한 행의 비디오 경로 (위에서부터)"""
+        top, bottom = self.canvas.yview()
+        total = self.cell_height * self.rows
+        first_row = int(top * total // self.cell_height)
+        last_row = int(bottom * total // self.cell_height) + 1
+        paths = []
+        for item in self.items[first_row * self.columns:(last_row + 1) * self.columns]:
+            path = item['path']
+            if path not in self.images and path not in self.failed and path not in paths:
+                paths.append(path)
+        return paths
+
+    def _schedule_refresh(self):
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+        self.refresh_job = self.after(self.REFRESH_MS, self._refresh)
+
+    def _refresh(self):
+        """보이는 썸네일 요청 (보이지 않게 된 대기 요청은 취소)"""
+        self.refresh_job = None
+        paths = self._visible_paths()
+        self.loader.retain(set(paths))
+        for path in paths:
+            self.loader.request(path)
+        if self.loader.busy() and not self.polling:
+            self.polling = True
+            self.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """끝난 썸네일 표시 (Tk 스레드)"""
+        for video_path, data in self.loader.poll():
+            self._draw_thumbnail(video_path, data)
+        if self.loader.busy():
+            self.after(self.POLL_MS, self._poll)
+        else:
+            self.polling = False
+
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_refresh()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._on_scroll('scroll', -1, 'units')
+        else:
+            self._on_scroll('scroll', 1, 'units')
+
+    def _bind_wheel(self, event=None):
+        # Windows는 포커스가 있는 위젯으로 휠 이벤트를 보내므로 포인터가 있는 동안만 전역 바인딩
+        self.canvas.bind_all('<MouseWheel>', self._on_wheel)
+        self.canvas.bind_all('<Button-4>', self._on_wheel)
+        self.canvas.bind_all('<Button-5>', self._on_wheel)
+
+    def _unbind_wheel(self, event=None):
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.canvas.unbind_all(sequence)
+
+    def _on_click(self, event):
+        current = self.canvas.find_withtag('current')
+        if not current:
+            return
+        for tag in self.canvas.gettags(current[0]):
+            if tag.startswith('item'):
+                self.select(int(tag[4:]))
+                return
+
+    def select(self, index):
+        """항목 선택 표시 후 on_select 호출"""
+        if self.selected is not None:
+            self.canvas.itemconfig(f'frame{self.selected}', outline='#e8e8e8')
+        self.selected = index
+        self.canvas.itemconfig(f'frame{index}', outline='#0078d4')
+        self.on_select(self.items[index])
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.loader.close()
@@ -0,0 +1,82 @@
+"""
+비디오 전환 효과 모듈
+- 비디오 교체 시 이전 비디오의 마지막 프레임과 새 비디오 프레임을 크로스페이드
+- 디코딩 출력 해상도(스케일 적용)의 BGR 프레임에서 혼합 → 이후 변환/스케일 경로는 그대로
+- 버퍼는 미리 할당해 재사용 (전환 중 프레임당 cv2.addWeighted 1회, 추가 디코딩 없음)
+"""
+import time
+
+import cv2
+import numpy as np
+
+
+class Crossfade:
+    """
+    이전 프레임 → 새 프레임 크로스페이드
+
+    사용 예:
+        crossfade = Crossfade()
+        crossfade.start(last_frame, 0.5)   # 비디오 교체 시
+        ...
+        frame = crossfade.blend(frame)      # 매 프레임 (전환 중이 아니면 그대로 반환)
+    """
+
+    def __init__(self):
+        self.outgoing = None  # 이전 비디오 마지막 프레임 (재사용 버퍼)
+        self.output = None  # 혼합 결과 (재사용 버퍼)
+        self.duration = 0.0
+        self.start_time = None  # 새 비디오 첫 프레임 표시 시각
+        self.active = False
+
+    def start(self, frame, duration):
+        """
+        전환 시작 (이전 비디오의 마지막 프레임 복사)
+
+        Args:
+            frame: 이전 비디오의 마지막 BGR 프레임
+            duration: 전환 시간 (초, 0 이하면 무시)
+        """
+        if frame is None or duration <= 0:
+            self.active = False
+            return
+        if self.outgoing is None or self.outgoing.shape != frame.shape:
+            self.outgoing = np.empty_like(frame)
+        np.copyto(self.outgoing, frame)
+        self.duration = duration
+        self.start_time = None
+        self.active = True
+
+    def cancel(self):
+        """전환 중단 (버퍼는 다음 전환을 위해 유지)"""
+        self.active = False
+
+    def blend(self, frame, now=None):
+        """
+        새 비디오 프레임에 전환 적용
+
+        Args:
+            frame: 새 비디오의 BGR 프레임
+            now: 현재 시각 (perf_counter, None이면 지금)
+
+        Returns:
+            numpy.ndarray: 혼합된 프레임 (내부 버퍼, 다음 호출 때 덮어씀) 또는 전환이 끝났으면 frame
+        """
+        if not self.active:
+            return frame
+        now = time.perf_counter() if now is None else now
+        if self.start_time is None:
+            self.start_time = now
+
+        alpha = (now - self.start_time) / self.duration
+        if alpha >= 1.0:
+            self.active = False
+            return frame
+
+        # 전환 중 해상도 스케일이 바뀐 경우 이전 프레임을 한 번만 맞춤
+        if self.outgoing.shape != frame.shape:
+            self.outgoing = cv2.resize(self.outgoing, (frame.shape[1], frame.shape[0]), interpolation=cv2.INTER_AREA)
+        if self.output is None or self.output.shape != frame.shape:
+            self.output = np.empty_like(frame)
+
+        cv2.addWeighted(self.outgoing, 1.0 - alpha, frame, alpha, 0.0, dst=self.output)
+        return self.output
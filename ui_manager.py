@@ -3,6 +3,8 @@ UI 관리 모듈
 - 아이콘, 버튼, 음량 슬라이더 관리
 - 호버 효과, 투명도 처리
 - Idle 시 자동 숨김/표시
+- 히트 테스트 맵: 컨트롤 영역 → 동작 ('mute', 'settings', 'volume'), 생성 시 한 번 구성
+  (작업 영역 크기는 실행 중 고정 - 창 크기도 시작 시 한 번 정해짐)
 """
 import pygame
 import os
@@ -36,6 +38,7 @@ class UIManager:
         # UI 상태
         self.show_icons = True
         self.hovered_button = None  # 'mute', 'settings', None
+        self.hover_action = None  # 커서 아래 컨트롤 동작 ('mute', 'settings', 'volume', None)
         self.icon_opacity = 1.0  # 0.2 ~ 1.0
 
         # 버튼 위치 및 크기 (아이콘 로드보다 먼저 설정)
@@ -96,6 +99,50 @@ class UIManager:
         self.settings_button_x = self.mute_button_x - self.button_size - 10
         self.settings_button_y = self.screen_height - self.button_size - 20
 
+        self._build_hit_map()
+
+    def _build_hit_map(self):
+        """
+        히트 테스트 맵 구성 (버튼 위치 계산 시 한 번)
+
+        hit_map: [(left, top, right, bottom, 동작)] - 경계 포함, 앞쪽 항목 우선
+        hit_bounds: 모든 컨트롤을 감싸는 영역 (대부분의 커서 위치는 여기서 바로 제외)
+        """
+        size = self.button_size
+        self.hit_map = [
+            (self.mute_button_x, self.mute_button_y,
+             self.mute_button_x + size, self.mute_button_y + size, 'mute'),
+            (self.settings_button_x, self.settings_button_y,
+             self.settings_button_x + size, self.settings_button_y + size, 'settings'),
+            # 슬라이더는 잡기 쉽도록 위아래 10px 여유
+            (self.volume_slider_x, self.volume_slider_y - 10,
+             self.volume_slider_x + self.volume_slider_width,
+             self.volume_slider_y + self.volume_slider_height + 10, 'volume'),
+        ]
+        self.hit_bounds = (
+            min(entry[0] for entry in self.hit_map), min(entry[1] for entry in self.hit_map),
+            max(entry[2] for entry in self.hit_map), max(entry[3] for entry in self.hit_map)
+        )
+
+    def hit_test(self, x, y):
+        """
+        좌표 아래의 컨트롤 동작
+
+        Returns:
+            str: 'mute', 'settings', 'volume' 또는 None
+        """
+        left, top, right, bottom = self.hit_bounds
+        if not (left <= x <= right and top <= y <= bottom):
+            return None
+        for left, top, right, bottom, action in self.hit_map:
+            if left <= x <= right and top <= y <= bottom:
+                return action
+        return None
+
+    def volume_at(self, x):
+        """슬라이더 위 x 좌표 → 볼륨 (0.0 ~ 1.0)"""
+        return max(0.0, min(1.0, (x - self.volume_slider_x) / self.volume_slider_width))
+
     def set_icon_opacity(self, opacity):
         """
         아이콘 투명도 설정
@@ -114,29 +161,13 @@ class UIManager:
             mouse_y: 마우스 Y 좌표
 
         Returns:
-            bool: 아이콘 영역에 마우스가 있는지 여부
+            bool: 아이콘 영역에 마우스가 있는지 여부 (동작은 hover_action)
         """
-        # 음소거 버튼 호버
-        if (self.mute_button_x <= mouse_x <= self.mute_button_x + self.button_size and
-            self.mute_button_y <= mouse_y <= self.mute_button_y + self.button_size):
-            self.hovered_button = 'mute'
-            return True
-
-        # 설정 버튼 호버
-        elif (self.settings_button_x <= mouse_x <= self.settings_button_x + self.button_size and
-              self.settings_button_y <= mouse_y <= self.settings_button_y + self.button_size):
-            self.hovered_button = 'settings'
-            return True
-
-        # 음량 슬라이더 호버
-        elif (self.volume_slider_x <= mouse_x <= self.volume_slider_x + self.volume_slider_width and
-              self.volume_slider_y - 10 <= mouse_y <= self.volume_slider_y + self.volume_slider_height + 10):
-            self.hovered_button = None
-            return True
-
-        else:
-            self.hovered_button = None
-            return False
+        action = self.hit_test(mouse_x, mouse_y)
+        self.hover_action = action
+        # 확대 효과는 버튼만 (슬라이더는 호버 표시 없음)
+        self.hovered_button = action if action in ('mute', 'settings') else None
+        return action is not None
 
     def check_idle(self):
         """
@@ -2,10 +2,12 @@
 비디오 캡처 모듈
 - ThreadedVideoCapture: 멀티스레드 비디오 디코딩
 - 프레임 스킵을 읽기 단계에서 수행하여 CPU 절감
+- 출력 해상도 축소를 디코딩 스레드에서 수행 (메인 스레드 변환 비용 절감)
 - Idle 모드 지원
 - Context Manager 패턴으로 안전한 리소스 관리
 """
 import cv2
+import sys
 import threading
 import time
 from queue import Queue, Empty
@@ -13,6 +15,32 @@ from logger import get_logger
 
 logger = get_logger("VideoCapture")
 
+# 디코딩 백엔드 (Windows: Media Foundation, 그 외(벤치마크 등): OpenCV 기본 백엔드)
+CAPTURE_BACKEND = cv2.CAP_MSMF if sys.platform == 'win32' else cv2.CAP_ANY
+
+
+def set_thread_low_priority(enabled):
+    """
+    현재 스레드 우선순위 낮추기/되돌리기 (Windows만, 그 외에는 아무것도 하지 않음)
+
+    Linux의 스레드 nice 값은 권한 없이 되돌릴 수 없어 적용하지 않습니다
+    (대신 저우선순위 리더는 재생 속도로 디코딩 속도를 제한).
+
+    Returns:
+        bool: 우선순위를 바꿨는지 여부
+    """
+    if sys.platform != 'win32':
+        return False
+    try:
+        import win32api
+        import win32con
+        priority = win32con.THREAD_PRIORITY_BELOW_NORMAL if enabled else win32con.THREAD_PRIORITY_NORMAL
+        win32api.SetThreadPriority(win32api.GetCurrentThread(), priority)
+        return True
+    except Exception as e:
+        logger.debug(f"Could not change thread priority: {e}")
+        return False
+
 
 class ThreadedVideoCapture:
     """
@@ -26,22 +54,29 @@ class ThreadedVideoCapture:
     5. 프레임 재사용으로 메모리 효율 개선
     """
 
-    def __init__(self, video_path, queue_size=60, target_fps=None, video_fps=None):
+    def __init__(self, video_path, queue_size=60, target_fps=None, video_fps=None, perf_monitor=None,
+                 output_size=None, cap=None, start_position=0.0):
         """
         Args:
             video_path: 비디오 파일 경로
             queue_size: 프레임 버퍼 크기 (기본 60 = 24fps 기준 2.5초 분량)
             target_fps: 목표 FPS (None이면 원본 FPS)
             video_fps: 원본 비디오 FPS
+            perf_monitor: PerformanceMonitor (decode/grab 지연시간 기록용, 선택)
+            output_size: (width, height) - 이보다 큰 프레임은 디코딩 스레드에서 축소 (None이면 원본)
+            cap: 이미 열린 cv2.VideoCapture (메타데이터 프로브에 쓴 것을 재사용, None이면 새로 열기)
+            start_position: 재생 시작 위치 (초, 0이면 처음부터) - 디코딩 스레드에서 탐색
         """
         self.video_path = video_path
         self.queue_size = queue_size
         self.target_fps = target_fps
         self.video_fps = video_fps
+        self.perf_monitor = perf_monitor
+        self.output_size = output_size
 
-        # VideoCapture 초기화
+        # VideoCapture 초기화 (프로브에서 넘겨받은 경우 다시 열지 않음)
         try:
-            self.cap = cv2.VideoCapture(video_path, cv2.CAP_MSMF)  # Windows Media Foundation
+            self.cap = cap if cap is not None else cv2.VideoCapture(video_path, CAPTURE_BACKEND)
             if not self.cap.isOpened():
                 raise RuntimeError(f"Failed to open video: {video_path}")
         except Exception as e:
@@ -59,6 +94,17 @@ class ThreadedVideoCapture:
         # 프레임 카운터
         self.frame_count = 0
         self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.loop_count = 0  # 비디오 루프 재시작 횟수
+        self.last_loop_time = 0.0  # 마지막 루프 재시작 시각 (perf_counter)
+        self.position_ms = max(0.0, start_position) * 1000.0  # 마지막으로 디코딩한 프레임의 미디어 시각 (ms)
+        self.reinit_count = 0  # 재초기화 횟수 (메인 루프가 오디오 재동기화에 사용)
+
+        # 백그라운드(prefetch/교체 준비) 모드: 버퍼 상한, 지연시간은 'prefetch_*'/'swap_*' 단계로 기록
+        self.buffer_limit = None  # None이면 queue_size까지 채움
+        self.latency_prefix = ''
+        self.low_priority = False  # 예약된 prefetch - 낮은 스레드 우선순위 + 재생 속도로 디코딩
+        self.reader_low_priority = False  # 리더 스레드에 실제 적용된 상태
+        self.first_frame_time = None  # 첫 프레임을 큐에 넣은 시각 (perf_counter, 시작 타임라인용)
 
         # 프레임 스킵 비율 계산
         self._update_skip_ratio()
@@ -107,6 +153,12 @@ class ThreadedVideoCapture:
         """
         loop_count = 0
         last_log_time = time.time()
+        perf_monitor = self.perf_monitor
+        perf_counter = time.perf_counter
+
+        # 저장된 위치부터 재생 (메인 스레드를 막지 않도록 여기서 탐색)
+        if self.position_ms > 0:
+            self._seek(self.position_ms)
 
         while not self.stopped:
             try:
@@ -123,8 +175,14 @@ class ThreadedVideoCapture:
                     time.sleep(1.0)  # Idle 중 CPU 절약 (0.1 -> 1.0초)
                     continue
 
-                # 큐가 가득 차면 대기
-                if self.queue.full():
+                # 저우선순위 모드 전환 (리더 스레드 자신에게만 적용 가능)
+                low_priority = self.low_priority
+                if low_priority != self.reader_low_priority:
+                    set_thread_low_priority(low_priority)
+                    self.reader_low_priority = low_priority
+
+                # 큐가 가득 차면(또는 prefetch 버퍼 상한) 대기
+                if self.queue.qsize() >= (self.buffer_limit or self.queue_size):
                     time.sleep(0.01)  # 0.001 -> 0.01 (10ms)
                     continue
 
@@ -133,7 +191,10 @@ class ThreadedVideoCapture:
                 # 프레임 스킵 처리 (읽기 단계에서 스킵)
                 if self.skip_ratio > 1 and self.frame_count % self.skip_ratio != 0:
                     # grab()은 프레임을 디코딩하지 않고 위치만 이동
+                    grab_start = perf_counter()
                     ret = self.cap.grab()
+                    if perf_monitor:
+                        perf_monitor.record_latency(self.latency_prefix + 'grab', perf_counter() - grab_start)
                     if not ret:
                         self.consecutive_grab_fails += 1
 
@@ -141,7 +202,7 @@ class ThreadedVideoCapture:
                         if self.consecutive_grab_fails >= self.max_grab_fails:
                             logger.warning(f"cap.grab() failed {self.consecutive_grab_fails} times consecutively - reinitializing VideoCapture")
                             if self._reinitialize_capture():
-                                logger.info("VideoCapture reinit successful, resuming from start")
+                                logger.info(f"VideoCapture reinit successful, resuming at {self.position_ms / 1000.0:.2f}s")
                             else:
                                 logger.error("VideoCapture reinit failed, will retry")
                                 time.sleep(1.0)  # 실패 시 1초 대기
@@ -158,7 +219,10 @@ class ThreadedVideoCapture:
                     continue
 
                 # 필요한 프레임만 실제로 디코딩
+                decode_start = perf_counter()
                 ret, frame = self.cap.read()
+                if perf_monitor:
+                    perf_monitor.record_latency(self.latency_prefix + 'decode', perf_counter() - decode_start)
 
                 if not ret or frame is None:
                     # 비디오 끝 - 루프 재시작
@@ -171,12 +235,34 @@ class ThreadedVideoCapture:
                 # read() 성공 - 모든 카운터 리셋
                 self.consecutive_errors = 0
                 self.consecutive_grab_fails = 0
+                self.position_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+
+                # 출력 해상도보다 크면 축소
+                # - 2배 이상 축소: INTER_AREA (앨리어싱 방지)
+                # - 그 외: INTER_LINEAR (비정수 비율에서 INTER_AREA는 수 배 느림)
+                output_size = self.output_size
+                if output_size and (frame.shape[1] > output_size[0] or frame.shape[0] > output_size[1]):
+                    resize_start = perf_counter()
+                    if frame.shape[1] >= output_size[0] * 2:
+                        interpolation = cv2.INTER_AREA
+                    else:
+                        interpolation = cv2.INTER_LINEAR
+                    frame = cv2.resize(frame, output_size, interpolation=interpolation)
+                    if perf_monitor:
+                        perf_monitor.record_latency(self.latency_prefix + 'resize', perf_counter() - resize_start)
 
                 # 프레임을 큐에 추가
                 try:
                     self.queue.put((True, frame), timeout=0.1)
+                    if self.first_frame_time is None:
+                        self.first_frame_time = perf_counter()
+                    if low_priority and self.video_fps:
+                        # 재생 중인 비디오와 CPU를 다투지 않도록 재생 속도 이상으로 디코딩하지 않음
+                        time.sleep(self.skip_ratio / self.video_fps)
                 except:
-                    # Queue put timeout - 프레임 드롭
+                    # Queue put timeout - 프레임 드롭 (producer overflow)
+                    if perf_monitor and not self.latency_prefix:
+                        perf_monitor.record_drop('overflow')
                     logger.warning(f"Queue put timeout (size: {self.queue.qsize()}/{self.queue_size})")
 
             except Exception as e:
@@ -197,10 +283,35 @@ class ThreadedVideoCapture:
         try:
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
             self.frame_count = 0
+            self.loop_count += 1
+            self.last_loop_time = time.perf_counter()
             logger.debug("Video looped")
         except Exception as e:
             logger.error(f"Failed to restart video: {e}")
 
+    def _seek(self, position_ms):
+        """
+        미디어 위치로 탐색
+
+        백엔드가 직전 키프레임으로 이동한 뒤 해당 위치까지 디코딩합니다.
+        실패하면 처음부터 재생합니다.
+
+        Args:
+            position_ms: 목표 위치 (ms)
+        """
+        seek_start = time.perf_counter()
+        try:
+            if not self.cap.set(cv2.CAP_PROP_POS_MSEC, position_ms):
+                raise RuntimeError("backend rejected seek")
+            self.position_ms = position_ms
+            logger.info(f"Seeked to {position_ms / 1000.0:.2f}s ({(time.perf_counter() - seek_start) * 1000:.0f}ms)")
+        except Exception as e:
+            logger.warning(f"Seek to {position_ms / 1000.0:.2f}s failed, starting from beginning: {e}")
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.position_ms = 0.0
+        if self.perf_monitor:
+            self.perf_monitor.record_latency(self.latency_prefix + 'seek', time.perf_counter() - seek_start)
+
     def _reinitialize_capture(self):
         """VideoCapture 완전 재초기화 (손상 복구)"""
         try:
@@ -211,13 +322,18 @@ class ThreadedVideoCapture:
                 self.cap.release()
 
             # 새로 초기화
-            self.cap = cv2.VideoCapture(self.video_path, cv2.CAP_MSMF)
+            self.cap = cv2.VideoCapture(self.video_path, CAPTURE_BACKEND)
             if not self.cap.isOpened():
                 logger.error("Failed to reinitialize VideoCapture")
                 return False
 
             self.frame_count = 0
             self.consecutive_grab_fails = 0
+
+            # 처음이 아니라 마지막 디코딩 위치부터 재개 (절전 복귀 시 화면 점프 방지)
+            if self.position_ms > 0:
+                self._seek(self.position_ms)
+            self.reinit_count += 1
             logger.info("VideoCapture reinitialized successfully")
             return True
         except Exception as e:
@@ -267,6 +383,59 @@ class ThreadedVideoCapture:
         self._update_skip_ratio()
         logger.info(f"Target FPS updated to {target_fps}, new skip_ratio={self.skip_ratio}")
 
+    def is_loop_stall(self, window=1.0):
+        """
+        최근 루프 재시작(seek) 직후인지 확인 (빈 큐 원인 분류용)
+
+        Args:
+            window: 재시작 후 간주 시간 (초)
+        """
+        return time.perf_counter() - self.last_loop_time < window
+
+    def set_background(self, enabled, buffer_limit=None, stage_prefix='prefetch_', low_priority=False):
+        """
+        백그라운드(prefetch/교체 준비) 모드 설정
+
+        활성화 전에는 디코딩을 buffer_limit 프레임에서 멈춰 메모리/CPU를 제한하고,
+        지연시간을 'prefetch_decode' 등 별도 단계로 기록해 재생 통계와 섞이지 않게 합니다
+        (LatencyHistogram은 단계별 writer가 하나라고 가정 - 재생 중인 리더와 단계를 나눔).
+
+        Args:
+            enabled: True면 백그라운드 모드, False면 일반 재생 (교체 시)
+            buffer_limit: 백그라운드 중 최대 버퍼 프레임 수
+            stage_prefix: 지연시간 단계 접두사 ('prefetch_', 'swap_')
+            low_priority: 리더 스레드 우선순위를 낮추고 재생 속도로 디코딩 (예약된 prefetch)
+        """
+        self.latency_prefix = stage_prefix if enabled else ''
+        self.buffer_limit = buffer_limit if enabled else None
+        self.low_priority = enabled and low_priority
+
+    def get_presented_position(self):
+        """
+        화면에 표시 중인 프레임의 대략적인 미디어 시각 (초)
+
+        디코딩 위치에서 큐에 쌓인 프레임 분량을 빼서 추정합니다.
+
+        Returns:
+            float: 미디어 시각 (초)
+        """
+        position = self.position_ms / 1000.0
+        if self.video_fps:
+            position -= self.queue.qsize() * self.skip_ratio / self.video_fps
+        return max(0.0, position)
+
+    def set_output_size(self, output_size):
+        """
+        출력 해상도 변경 (해상도 스케일 조절 시)
+
+        큐에 이미 들어있는 프레임은 이전 크기로 유지됩니다.
+
+        Args:
+            output_size: (width, height) 또는 None (원본 크기)
+        """
+        self.output_size = output_size
+        logger.info(f"Output size updated to {output_size}")
+
     def pause(self):
         """Idle 모드 - 프레임 디코딩 일시정지 및 메모리 절약"""
         if not self.paused:
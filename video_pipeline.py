@@ -0,0 +1,163 @@
+"""
+비디오 파이프라인 교체 모듈 (hot swap)
+- 다음 비디오의 메타데이터 프로브, ThreadedVideoCapture 생성, 오디오 추출을
+  백그라운드 스레드에서 준비 (현재 비디오는 계속 재생)
+- 새 캡처의 큐에 충분한 프레임이 쌓이면 메인 루프가 프레임 경계에서 교체
+- 이전 캡처 해제(리더 스레드 join)는 별도 스레드에서 수행
+"""
+import threading
+import time
+
+from logger import get_logger
+from video_capture import set_thread_low_priority
+
+logger = get_logger("VideoPipeline")
+
+
+class PreparedVideo:
+    """
+    교체 준비가 끝난 비디오 (메인 스레드에서 활성화)
+
+    Attributes:
+        video_path: 비디오 파일 경로
+        info: 메타데이터 (video_probe.probe_capture 형식)
+        capture: 시작된 ThreadedVideoCapture
+        start_position: 재생 시작 위치 (초)
+        target_fps: 준비 시점의 목표 FPS
+    """
+
+    def __init__(self, video_path, info, capture, start_position=0.0, target_fps=None):
+        self.video_path = video_path
+        self.info = info
+        self.capture = capture
+        self.start_position = start_position
+        self.target_fps = target_fps
+
+    def buffered_frames(self):
+        """큐에 쌓인 디코딩 프레임 수"""
+        return self.capture.queue.qsize() if self.capture else 0
+
+    def peek_frame(self):
+        """큐의 첫 프레임 (꺼내지 않음, 없으면 None) - 포스터 저장용"""
+        if not self.capture:
+            return None
+        queue = self.capture.queue
+        with queue.mutex:
+            return queue.queue[0][1] if queue.queue else None
+
+
+class VideoPreparer:
+    """
+    백그라운드 비디오 준비 작업
+
+    prepare_fn(video_path)이 PreparedVideo를 만들면 버퍼가 min_frames 이상
+    찰 때까지(또는 buffer_timeout까지) 기다린 뒤 준비 완료로 표시합니다.
+
+    사용 예:
+        preparer = VideoPreparer(app.prepare_video, path).start()
+        ...
+        if preparer.is_ready():          # 메인 루프에서 매 프레임 확인
+            prepared = preparer.take()
+    """
+
+    def __init__(self, prepare_fn, video_path, min_frames=8, buffer_timeout=3.0, on_buffered=None,
+                 low_priority=False):
+        """
+        Args:
+            prepare_fn: video_path → PreparedVideo (실패 시 None) - 백그라운드 스레드에서 호출
+            video_path: 준비할 비디오 경로
+            min_frames: 교체 전에 쌓여 있어야 할 프레임 수
+            buffer_timeout: 버퍼를 기다리는 최대 시간 (초, 초과 시 있는 만큼으로 교체)
+            on_buffered: 버퍼 대기 후 PreparedVideo로 호출 (백그라운드 스레드, 예: 포스터 저장)
+            low_priority: 준비 스레드 우선순위를 낮춤 (예약된 prefetch, Windows)
+        """
+        self.prepare_fn = prepare_fn
+        self.video_path = video_path
+        self.min_frames = min_frames
+        self.buffer_timeout = buffer_timeout
+        self.on_buffered = on_buffered
+        self.low_priority = low_priority
+
+        self.prepared = None
+        self.failed = False
+        self.cancelled = False
+        self.done = threading.Event()
+        self.lock = threading.Lock()  # 완료 처리와 cancel() 사이 경합 방지
+        self.thread = None
+        self.started_at = None
+        self.elapsed = None  # 준비에 걸린 시간 (초)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="VideoPreparer")
+        self.thread.start()
+        return self
+
+    def _run(self):
+        if self.low_priority:
+            set_thread_low_priority(True)
+        try:
+            prepared = self.prepare_fn(self.video_path)
+        except Exception as e:
+            logger.error(f"Failed to prepare video: {e}", exc_info=True)
+            prepared = None
+
+        if prepared is None:
+            self.failed = True
+            self.done.set()
+            return
+
+        # 새 캡처 버퍼가 찰 때까지 대기 (교체 직후 빈 큐로 인한 끊김 방지)
+        deadline = time.perf_counter() + self.buffer_timeout
+        while not self.cancelled and prepared.buffered_frames() < self.min_frames and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        if self.on_buffered is not None and not self.cancelled:
+            try:
+                self.on_buffered(prepared)
+            except Exception as e:
+                logger.warning(f"Prepared video callback failed: {e}")
+
+        with self.lock:
+            if self.cancelled:
+                release_async(prepared.capture)
+            else:
+                self.prepared = prepared
+            self.elapsed = time.perf_counter() - self.started_at
+            self.done.set()
+
+    def is_ready(self):
+        """준비 완료(또는 실패) 여부 - 메인 스레드에서 대기 없이 확인"""
+        return self.done.is_set()
+
+    def take(self):
+        """
+        준비된 비디오 가져오기 (is_ready() 이후 호출)
+
+        Returns:
+            PreparedVideo 또는 None (실패/취소)
+        """
+        prepared, self.prepared = self.prepared, None
+        return prepared
+
+    def cancel(self):
+        """준비 취소 (이미 만든 캡처는 백그라운드에서 해제)"""
+        with self.lock:
+            self.cancelled = True
+            prepared = self.take()
+        if prepared is not None:
+            release_async(prepared.capture)
+
+
+def release_async(capture, name="PipelineTeardown"):
+    """
+    ThreadedVideoCapture를 백그라운드에서 해제 (리더 스레드 join 최대 2초)
+
+    Args:
+        capture: 해제할 캡처 (None이면 무시)
+    """
+    if capture is None:
+        return None
+    thread = threading.Thread(target=capture.release, daemon=True, name=name)
+    thread.start()
+    return thread
@@ -0,0 +1,195 @@
+"""
+비디오 메타데이터 프로브 모듈
+- fps, 프레임 수, 길이, 해상도, 코덱, 오디오 트랙 유무를 디스크에 캐싱
+- 캐시 키: 절대 경로 + 파일 크기 + 수정 시각 (파일이 바뀌면 자동 무효화)
+- 캐시 미스 시 프로브에 사용한 VideoCapture를 그대로 돌려주어
+  ThreadedVideoCapture가 같은 파일을 다시 열지 않도록 함 (MSMF open은 수백 ms)
+"""
+import json
+import os
+import threading
+
+import cv2
+
+from logger import get_logger
+from video_capture import CAPTURE_BACKEND
+
+logger = get_logger("VideoProbe")
+
+PROBE_CACHE_VERSION = 1
+DEFAULT_FPS = 30.0
+
+
+def file_signature(video_path):
+    """(크기, 수정 시각 ns) - 파일이 없으면 None"""
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def probe_capture(cap):
+    """
+    열린 VideoCapture에서 메타데이터 읽기
+
+    Args:
+        cap: 열린 cv2.VideoCapture
+
+    Returns:
+        dict: fps, frame_count, duration, width, height, codec, has_audio(None = 모름)
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0 or fps > 120:
+        logger.warning(f"Invalid FPS detected ({fps}), using default {DEFAULT_FPS:.0f}")
+        fps = DEFAULT_FPS
+
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ") if fourcc > 0 else ""
+
+    return {
+        'fps': fps,
+        'frame_count': frame_count,
+        'duration': frame_count / fps if fps > 0 else 0.0,
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'codec': codec,
+        'has_audio': None,  # OpenCV는 오디오 트랙을 알 수 없음 (오디오 추출 시 갱신)
+        'seekable': None  # 시간 기준 seek 가능 여부 (일괄 준비 시 확인, None = 모름)
+    }
+
+
+class VideoProbeCache:
+    """
+    디스크 기반 비디오 메타데이터 캐시 (JSON)
+
+    스레드 안전: AudioLoader 스레드가 has_audio를 갱신할 수 있음
+    다른 프로세스(일괄 준비)가 파일을 바꾸면 다음 조회 때 다시 읽음
+    """
+
+    def __init__(self, cache_path, max_entries=1024):
+        """
+        Args:
+            cache_path: 캐시 파일 경로
+            max_entries: 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 제거)
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.entries = None  # 처음 사용할 때 로드
+        self.loaded_mtime = None  # 읽거나 쓴 시점의 캐시 파일 수정 시각
+        self.lock = threading.Lock()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.cache_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        mtime = self._file_mtime()
+        if self.entries is not None and mtime == self.loaded_mtime:
+            return
+        self.entries = {}
+        self.loaded_mtime = mtime
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == PROBE_CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Probe cache unreadable, starting empty: {e}")
+
+    def _save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 종료되어도 캐시가 깨지지 않음)"""
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PROBE_CACHE_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self.loaded_mtime = self._file_mtime()
+        except Exception as e:
+            logger.warning(f"Failed to save probe cache: {e}")
+
+    def get(self, video_path):
+        """
+        캐시된 메타데이터 조회
+
+        Returns:
+            dict: 메타데이터 (없거나 파일이 바뀌었으면 None)
+        """
+        signature = file_signature(video_path)
+        if signature is None:
+            return None
+        key = os.path.abspath(video_path)
+        with self.lock:
+            self._load()
+            entry = self.entries.get(key)
+            if not entry or (entry.get('size'), entry.get('mtime_ns')) != signature:
+                return None
+            # 최근 사용 순서 유지 (dict 삽입 순서)
+            self.entries[key] = self.entries.pop(key)
+            return dict(entry['info'])
+
+    def put(self, video_path, info):
+        """메타데이터 저장"""
+        signature = file_signature(video_path)
+        if signature is None:
+            return
+        key = os.path.abspath(video_path)
+        with self.lock:
+            self._load()
+            self.entries.pop(key, None)
+            self.entries[key] = {'size': signature[0], 'mtime_ns': signature[1], 'info': dict(info)}
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+            self._save()
+
+    def update(self, video_path, **fields):
+        """
+        기존 항목의 일부 필드 갱신 (예: has_audio)
+
+        Returns:
+            bool: 갱신 여부 (항목이 없거나 파일이 바뀌었으면 False)
+        """
+        info = self.get(video_path)
+        if info is None:
+            return False
+        if all(info.get(name) == value for name, value in fields.items()):
+            return True
+        info.update(fields)
+        self.put(video_path, info)
+        return True
+
+
+def open_video(video_path, cache=None):
+    """
+    비디오 메타데이터 조회 (캐시 우선)
+
+    Args:
+        video_path: 비디오 파일 경로
+        cache: VideoProbeCache (None이면 항상 프로브)
+
+    Returns:
+        tuple: (info, cap)
+            - 캐시 적중: (info, None) - 파일을 열지 않음
+            - 캐시 미스: (info, 열린 VideoCapture) - 리더에 넘겨 재사용
+            - 열기 실패: (None, None)
+    """
+    if cache is not None:
+        info = cache.get(video_path)
+        if info is not None:
+            logger.debug(f"Probe cache hit: {os.path.basename(video_path)}")
+            return info, None
+
+    cap = cv2.VideoCapture(video_path, CAPTURE_BACKEND)
+    if not cap.isOpened():
+        cap.release()
+        return None, None
+
+    info = probe_capture(cap)
+    if cache is not None:
+        cache.put(video_path, info)
+    return info, cap
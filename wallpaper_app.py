@@ -0,0 +1,1611 @@
+"""
+==============================================================================
+Wallpaper Player - 리팩토링 버전
+==============================================================================
+
+주요 개선사항:
+1. 모듈화 - logger, video_capture, audio_manager, ui_manager, performance_monitor 분리
+2. 클래스 기반 구조 - WallpaperApp 클래스로 앱 로직 캡슐화
+3. Context Manager - 안전한 리소스 관리
+4. 표준 로깅 - logging 모듈 사용
+5. 예외 처리 강화 - 절전 모드 복귀 등 대응
+6. 성능 최적화 - 프레임 스킵, 동적 FPS, Idle 모드
+
+모듈 구조:
+- logger.py: 로깅 설정
+- performance_monitor.py: 성능 모니터링 및 동적 FPS 조절
+- video_capture.py: ThreadedVideoCapture (멀티스레드 비디오 디코딩)
+- audio_manager.py: 오디오 추출 및 재생 관리
+- ui_manager.py: UI 요소 (아이콘, 슬라이더) 관리
+- main.py: 진입점 (ctl 명령, 단일 인스턴스 확인 - cv2/pygame을 import하기 전)
+- wallpaper_app.py: WallpaperApp (이 모듈)
+- config.py: 설정 파일 관리 (기존 유지)
+- settings_gui.py: 설정 GUI (기존 유지)
+- video_probe.py: 비디오 메타데이터 캐시 (파일을 두 번 열지 않음)
+- poster_cache.py: 포스터 프레임 캐시 (시작/전환 시 즉시 표시)
+- playback_state.py: 재생 위치 체크포인트 (재시작 시 이어서 재생)
+- library_catalog.py: 비디오 라이브러리 카탈로그 (SQLite - 재생 기록, 플레이리스트 폴더)
+- cache_manager.py: 파생 데이터 디스크 캐시 (오디오, 포스터, 프로브 인덱스 - 용량 예산/LRU)
+
+시작 시간:
+- tkinter(settings_gui), moviepy(audio_manager), 메트릭 서버, 프로파일러는
+  처음 사용할 때 import (자동 시작 경로에서는 대부분 필요 없음)
+- 시작 타임라인(import, config, window, first_decode, first_present)을 로그에 기록
+==============================================================================
+"""
+
+import time
+
+_IMPORT_START = time.perf_counter()  # 이 모듈 import 시작 (startup_origin이 없을 때 타임라인 기준)
+
+import cv2
+import pygame
+import win32gui
+import win32con
+import ctypes
+import os
+import sqlite3
+import sys
+import threading
+
+# 커스텀 모듈 import
+# (settings_gui, metrics_server, control_server, profiler는 사용하는 시점에 import)
+import config
+from logger import get_log_dir, get_logger
+from performance_monitor import PerformanceMonitor
+from fps_controller import create_controller
+from startup_timeline import StartupTimeline
+from video_capture import ThreadedVideoCapture
+from video_probe import VideoProbeCache, open_video
+from poster_cache import PosterCache
+from cache_manager import INDEX, PROBE_INDEX_NAME, open_cache
+from playback_state import PlaybackState
+from video_pipeline import PreparedVideo, VideoPreparer, release_async
+from playlist import Playlist, PlaylistEngine, scan_folder
+from library_catalog import CATALOG_FILE_NAME, LibraryCatalog
+from wallpaper_schedule import WallpaperSchedule
+from input_source import InputSampler, Win32InputSource
+from settings_ipc import (
+    SettingsProcess, MSG_VOLUME, MSG_MUTED, MSG_OPACITY, MSG_FPS, MSG_VIDEO, MSG_QUIT, MSG_CLOSED
+)
+from transition import Crossfade
+from audio_manager import AudioManager
+from ui_manager import UIManager
+
+_IMPORT_DONE = time.perf_counter()
+
+# 로거 초기화
+logger = get_logger("Main")
+
+
+class WallpaperApp:
+    """
+    Wallpaper Player 메인 애플리케이션 클래스
+
+    주요 책임:
+    1. 전체 앱 생명주기 관리
+    2. 비디오/오디오/UI 모듈 조율
+    3. Windows 데스크톱 통합
+    4. 사용자 입력 처리
+    5. 설정 관리
+    """
+
+    def __init__(self, video_path=None, profile_seconds=None, startup_origin=None):
+        """
+        앱 초기화
+
+        Args:
+            video_path: 재생할 비디오 경로 (None이면 설정 파일의 경로)
+            profile_seconds: 샘플링 프로파일러 실행 시간 (None이면 설정 파일 값)
+            startup_origin: 시작 타임라인 기준 시각 (perf_counter, main.py 맨 앞에서 기록,
+                None이면 이 모듈 import 시작)
+        """
+        logger.info("=" * 70)
+        logger.info("Wallpaper Player - Initializing (Refactored Version)")
+        logger.info("=" * 70)
+
+        # 시작 타임라인 (main.py 시작 기준 - 'import'는 인자 처리, 단일 인스턴스 확인, 이 모듈 import 포함)
+        self.startup_timeline = StartupTimeline(_IMPORT_START if startup_origin is None else startup_origin)
+        self.startup_timeline.mark('import', _IMPORT_DONE)
+
+        # pygame 초기화
+        pygame.init()
+
+        # 비디오 경로 로드 (스케줄/플레이리스트가 켜져 있으면 그 현재 항목)
+        self.video_path = video_path or config.get_video_path()
+        self.catalog = LibraryCatalog(os.path.join(config.get_data_dir(), CATALOG_FILE_NAME))
+        self.schedule = self._create_schedule()
+        self.playlist_engine = None if self.schedule else self._create_playlist_engine(self.video_path)
+        if self.schedule:
+            self.video_path = self.schedule.current_item()
+        elif self.playlist_engine:
+            self.video_path = self.playlist_engine.playlist.current()
+        if not self.video_path or not os.path.exists(self.video_path):
+            logger.info("First time setup required")
+            import settings_gui
+            self.video_path = settings_gui.show_first_time_setup()
+            if not self.video_path:
+                logger.warning("No video selected, exiting")
+                sys.exit(0)
+        self.startup_timeline.mark('config')
+
+        # 화면 설정
+        self._setup_screen()
+
+        # Windows 데스크톱 통합
+        self._setup_desktop_integration()
+        self.startup_timeline.mark('window')
+
+        # 마지막 프레임 (idle 모드용, 포스터 프레임으로 먼저 채워질 수 있음)
+        self.last_frame_surface = None
+        self.last_frame_bgr = None  # 종료 시 마지막 프레임 저장용 (디코딩 출력 그대로)
+        self.frame_presented = False  # 현재 비디오의 디코딩 프레임을 표시했는지
+        self.crossfade = Crossfade()  # 비디오 교체 시 이전 마지막 프레임과 혼합
+
+        # 파생 데이터 캐시 (오디오, 포스터, 프로브 인덱스)
+        self.cache = open_cache()
+
+        # 포스터 프레임 즉시 표시 (디코더 준비 전 검은 화면 방지)
+        self.poster_cache = PosterCache(cache=self.cache)
+        self.poster_pending = False  # 현재 비디오의 포스터를 아직 저장하지 않음
+        if self.show_poster(self.video_path):
+            self.startup_timeline.mark('poster')
+
+        # 모듈 초기화
+        self.audio_manager = AudioManager(self.cache)
+        self.ui_manager = UIManager(self.work_area_width, self.work_area_height)
+        self.probe_cache = VideoProbeCache(self.cache.path(INDEX, PROBE_INDEX_NAME))
+        self.playback_state = PlaybackState(os.path.join(config.get_data_dir(), "playback_state.json"))
+        self.synced_reinit_count = 0  # 오디오를 맞춘 마지막 캡처 재초기화 횟수
+        self.pending_swap = None  # 백그라운드에서 준비 중인 다음 비디오 (VideoPreparer)
+        self.prefetch = None  # 미리 준비 중인 다음 비디오 - 플레이리스트/스케줄 (VideoPreparer)
+        self.prefetch_accounted = False  # prefetch 완료/실패를 기록했는지
+        self.last_playlist_update = None  # 플레이리스트 재생 시간 누적 기준 (monotonic)
+        self.schedule_next = None  # 다음 스케줄 전환 (datetime, 비디오 경로)
+        self.schedule_prefetch_lead = config.get_schedule_prefetch_seconds()
+        self.performance_monitor = None  # 나중에 초기화 (video_fps 필요)
+        self.video_capture = None  # 나중에 초기화
+        self.metrics_server = None  # 설정에서 활성화한 경우에만
+        self.control_server = None  # localhost 제어 서버 (control_server.ControlServer)
+        self.profiler = None
+        self.profile_seconds = profile_seconds if profile_seconds is not None else config.get_profile_seconds()
+        self.video_duration = 0.0
+
+        # 상태 변수
+        self.running = True
+        self.is_idle = False
+        self.extended_idle = False  # 5분 이상 idle
+        self.manual_pause = False  # 제어 명령으로 멈춤 (resume 명령까지 유지)
+        self.last_activity_time = time.time()
+        self.idle_threshold = 60.0  # 60초 - 비디오 멈춤
+        self.extended_idle_threshold = 300.0  # 5분 - 자동 음소거
+        self.deep_idle = False  # 디코더/오디오 해제 상태
+        self.deep_idle_threshold = config.get_deep_idle_seconds() or float('inf')  # 기본 15분
+        self.idle_still = None  # deep idle 중 다시 그리기용 축소 정지 화면
+        self.deep_idle_position = 0.0  # deep idle 진입 시 재생 위치 (초)
+
+        # 설정 로드
+        self.current_volume = config.get_volume()
+        self.muted = config.get_muted()
+        self.icon_opacity = config.get_actual_icon_opacity()
+
+        # 설정 창 관리 (별도 프로세스, settings_ipc.SettingsProcess)
+        self.settings_window = None
+        self.reload_video_flag = False
+        self.reload_video_path = None  # 재로드할 비디오 (None이면 설정 파일의 경로)
+
+        # 설정 체크 최적화
+        self.last_config_check_time = time.time()
+        self.config_check_interval = 0.5  # 0.5초마다
+
+        # 현재 프레임에서 큐 대기에 쓴 시간 (프레임 처리 시간 측정에서 제외)
+        self.frame_wait_time = 0.0
+
+        # pygame clock
+        self.clock = pygame.time.Clock()
+
+        # 마우스 입력 스레드
+        self.mouse_thread = None
+        self.input_sampler = None  # start_mouse_thread에서 생성 (벤치마크는 가상 입력 소스 주입)
+        self.mouse_clicked = False
+        self.settings_clicked = False
+        self.dragging_volume = False
+
+        logger.info("WallpaperApp initialized successfully")
+
+    def _setup_screen(self):
+        """화면 설정"""
+        # 화면 정보 가져오기
+        screen_info = pygame.display.Info()
+        screen_width = screen_info.current_w
+        screen_height = screen_info.current_h
+
+        # 작업 영역 크기 가져오기 (작업표시줄 제외)
+        class RECT(ctypes.Structure):
+            _fields_ = [
+                ('left', ctypes.c_long),
+                ('top', ctypes.c_long),
+                ('right', ctypes.c_long),
+                ('bottom', ctypes.c_long)
+            ]
+
+        rect = RECT()
+        ctypes.windll.user32.SystemParametersInfoW(48, 0, ctypes.byref(rect), 0)  # SPI_GETWORKAREA
+
+        self.work_area_width = rect.right - rect.left
+        self.work_area_height = rect.bottom - rect.top
+        self.work_area_left = rect.left
+        self.work_area_top = rect.top
+
+        logger.info(f"Screen: {screen_width}x{screen_height}, Work area: {self.work_area_width}x{self.work_area_height}")
+
+        # pygame 창 생성
+        self.screen = pygame.display.set_mode((self.work_area_width, self.work_area_height), pygame.NOFRAME)
+        pygame.display.set_caption("Wallpaper Player")
+
+        # pygame 창 핸들
+        self.hwnd = pygame.display.get_wm_info()['window']
+
+        # 창 위치 이동
+        win32gui.SetWindowPos(
+            self.hwnd, 0,
+            self.work_area_left, self.work_area_top,
+            self.work_area_width, self.work_area_height,
+            0
+        )
+
+    def _setup_desktop_integration(self):
+        """Windows 데스크톱 통합 (벽지처럼 배경에 표시)"""
+        try:
+            # WorkerW 윈도우 찾기
+            self.workerw = None
+
+            def enum_windows_callback(hwnd_check, _):
+                p = win32gui.FindWindowEx(hwnd_check, 0, "SHELLDLL_DefView", None)
+                if p != 0:
+                    self.workerw = win32gui.FindWindowEx(0, hwnd_check, "WorkerW", None)
+                return True
+
+            # Progman에 메시지 전송
+            progman = win32gui.FindWindow("Progman", None)
+            win32gui.SendMessageTimeout(progman, 0x052C, 0, 0, win32con.SMTO_NORMAL, 1000)
+
+            # WorkerW 찾기
+            win32gui.EnumWindows(enum_windows_callback, 0)
+
+            if self.workerw is not None:
+                # pygame 창을 WorkerW의 자식으로 설정
+                win32gui.SetParent(self.hwnd, self.workerw)
+                logger.info("Desktop integration successful")
+            else:
+                logger.warning("WorkerW not found, running in normal window mode")
+
+        except Exception as e:
+            logger.error(f"Desktop integration failed: {e}", exc_info=True)
+
+    def _create_schedule(self, clock=None):
+        """
+        설정에서 시간대별 스케줄 구성 (플레이리스트보다 우선)
+
+        Args:
+            clock: 현재 시각 함수 (None이면 datetime.now)
+
+        Returns:
+            WallpaperSchedule: 비활성 또는 유효한 항목이 없으면 None
+        """
+        if not config.get_schedule_enabled():
+            return None
+        entries = [
+            entry for entry in config.get_schedule_entries()
+            if isinstance(entry, dict) and entry.get('video') and os.path.exists(entry['video'])
+        ]
+        schedule = WallpaperSchedule(entries, clock=clock)
+        if not len(schedule):
+            logger.warning("Schedule enabled but no valid entries found, playing single video")
+            return None
+        logger.info(f"Schedule: {len(schedule)} entries")
+        return schedule
+
+    def _create_playlist_engine(self, start_item):
+        """
+        설정에서 플레이리스트 구성
+
+        Args:
+            start_item: 처음 재생할 항목 (목록에 있으면)
+
+        Returns:
+            PlaylistEngine: 비활성 또는 항목이 없으면 None
+        """
+        if not config.get_playlist_enabled():
+            return None
+        folder = config.get_playlist_folder()
+        items = self._scan_playlist_folder(folder) if folder else config.get_playlist_items()
+        items = [item for item in items if item and os.path.exists(item)]
+        if not items:
+            logger.warning("Playlist enabled but no videos found, playing single video")
+            return None
+
+        playlist = Playlist(items, shuffle=config.get_playlist_shuffle(), start_item=start_item)
+        engine = PlaylistEngine(
+            playlist,
+            advance=config.get_playlist_advance(),
+            interval=config.get_playlist_interval(),
+            loops=config.get_playlist_loops(),
+            prefetch_lead=config.get_playlist_prefetch_seconds()
+        )
+        logger.info(
+            f"Playlist: {len(playlist)} videos, advance={engine.advance_policy}, "
+            f"shuffle={playlist.shuffle}, prefetch {engine.prefetch_lead:.0f}s ahead"
+        )
+        return engine
+
+    def _scan_playlist_folder(self, folder):
+        """플레이리스트 폴더의 비디오 (카탈로그 재검색 후 인덱스 조회, 실패하면 폴더 목록)"""
+        try:
+            self.catalog.scan(folder)
+            return self.catalog.paths(folder)
+        except sqlite3.Error as e:
+            logger.warning(f"Library catalog unavailable, scanning folder directly: {e}")
+            return scan_folder(folder)
+
+    def load_video(self, video_path, start_position=None):
+        """
+        비디오 로드 (동기 - 시작, deep idle 복귀 시)
+
+        재생 중 비디오 교체는 request_video_swap()으로 백그라운드에서 준비합니다.
+
+        Args:
+            video_path: 비디오 파일 경로
+            start_position: 재생 시작 위치 (초, None이면 resume_playback 설정에 따라 저장된 위치)
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            logger.info(f"Loading video: {os.path.basename(video_path)}")
+
+            # 기존 비디오 캡처 정리 (전환 전 위치 저장)
+            if self.video_capture:
+                self.checkpoint_position(force=True)
+                self.video_capture.release()
+                self.video_capture = None
+
+            # 비디오 메타데이터 (캐시 적중 시 파일을 열지 않음, 미스 시 프로브한 capture를 리더가 재사용)
+            info, probe_cap = open_video(video_path, self.probe_cache)
+            if info is None:
+                logger.error(f"Failed to open video: {video_path}")
+                return False
+
+            # PerformanceMonitor 초기화 (비디오 FPS 기반)
+            # VideoReader 스레드가 decode/grab 지연시간을 기록하므로 캡처보다 먼저 생성
+            if self.performance_monitor is None:
+                self.performance_monitor = self._create_performance_monitor(
+                    config.get_target_fps(), int(info['fps']), config.get_resolution_scale()
+                )
+
+            prepared = self.prepare_video(video_path, start_position, info=info, probe_cap=probe_cap)
+            self.activate_video(prepared)
+
+            logger.info("Video and audio loaded successfully")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to load video: {e}", exc_info=True)
+            return False
+
+    def prepare_video(self, video_path, start_position=None, info=None, probe_cap=None, prefetch_audio=False,
+                      background=None):
+        """
+        비디오 재생 준비 - 프로브, 시작 위치, 디코딩 스레드 시작
+
+        화면/오디오 상태를 바꾸지 않으므로 백그라운드 스레드에서 호출할 수 있습니다.
+
+        Args:
+            video_path: 비디오 파일 경로
+            start_position: 재생 시작 위치 (초, None이면 저장된 위치)
+            info, probe_cap: 이미 프로브한 결과 (None이면 여기서 프로브)
+            prefetch_audio: 오디오 캐시까지 미리 추출 (교체 시 바로 재생)
+            background: 'prefetch'(예약된 다음 비디오 - 저우선순위) 또는 'swap'(바로 교체할 비디오)이면
+                약 1초 분량만 디코딩해 두고 교체 때까지 대기 (지연시간은 'prefetch_*'/'swap_*' 단계로 기록)
+
+        Returns:
+            PreparedVideo: 준비 결과 (열기 실패 시 None)
+        """
+        if info is None:
+            info, probe_cap = open_video(video_path, self.probe_cache)
+            if info is None:
+                logger.error(f"Failed to open video: {video_path}")
+                return None
+
+        video_fps = info['fps']
+        video_duration = info['duration']
+        logger.info(
+            f"Video FPS: {video_fps:.2f}, Duration: {video_duration:.2f}s, Frames: {info['frame_count']}, "
+            f"Size: {info['width']}x{info['height']}, Codec: {info['codec'] or '?'}"
+            f"{' (cached probe)' if probe_cap is None else ''}"
+        )
+
+        # 이어서 재생할 위치
+        if start_position is None:
+            start_position = 0.0
+            if config.get_resume_playback():
+                start_position = self.playback_state.get_position(video_path, video_duration)
+                if start_position > 0:
+                    logger.info(f"Resuming playback at {start_position:.2f}s")
+        if start_position > 0 and info.get('seekable') is False:
+            # 일괄 준비에서 seek가 안 된다고 확인된 파일 (실패할 seek 시도 생략)
+            logger.info("Video is not seekable (cached probe), starting from the beginning")
+            start_position = 0.0
+
+        # 목표 FPS 및 해상도 스케일 (스케일은 컨트롤러가 조절 중인 현재 값)
+        target_fps = config.get_target_fps()
+        logger.info(f"Target FPS: {target_fps}, Resolution scale: {self.performance_monitor.scale}")
+
+        # ThreadedVideoCapture 생성 및 시작
+        capture = ThreadedVideoCapture(
+            video_path,
+            queue_size=60,
+            target_fps=target_fps,
+            video_fps=video_fps,
+            perf_monitor=self.performance_monitor,
+            output_size=self._get_output_size(self.performance_monitor.scale),
+            cap=probe_cap,
+            start_position=start_position
+        )
+        if background:
+            capture.set_background(True, buffer_limit=max(8, min(capture.queue_size, int(video_fps))),
+                                   stage_prefix=background + '_', low_priority=background == 'prefetch')
+        capture.start()
+
+        # 오디오 미리 추출 (교체 시 캐시에서 바로 재생)
+        if prefetch_audio:
+            found = self.audio_manager.prepare_audio(video_path, has_audio=info['has_audio'])
+            if found is not None and found != info['has_audio']:
+                info['has_audio'] = found
+                self.probe_cache.update(video_path, has_audio=found)
+
+        return PreparedVideo(video_path, info, capture, start_position, target_fps)
+
+    def activate_video(self, prepared):
+        """
+        준비된 비디오로 전환 (메인 스레드, 프레임 경계에서 호출)
+
+        Args:
+            prepared: PreparedVideo
+
+        Returns:
+            ThreadedVideoCapture: 교체된 이전 캡처 (호출자가 해제, 없으면 None)
+        """
+        video_path = prepared.video_path
+
+        # 이전 비디오 위치 저장
+        previous = self.video_capture
+        if previous:
+            self.checkpoint_position(force=True)
+
+        self.video_capture = prepared.capture
+        self.video_capture.set_background(False)
+        self.synced_reinit_count = 0
+
+        # 재생 중 교체면 이전 비디오 마지막 프레임에서 크로스페이드
+        if previous and self.last_frame_bgr is not None:
+            self.crossfade.start(self.last_frame_bgr, config.get_transition_seconds())
+        else:
+            self.crossfade.cancel()
+        self.frame_presented = False
+        self.last_frame_bgr = None
+        self.poster_pending = not self.poster_cache.has_poster(video_path)
+
+        self.performance_monitor.set_target_fps(prepared.target_fps)
+        self.performance_monitor.reset_presentation()
+
+        # 오디오 교체 (추출이 필요하면 백그라운드, 끝나면 비디오 위치에서 재생)
+        capture = self.video_capture
+        self.audio_manager.cleanup()
+        self.audio_manager.load_audio_async(
+            video_path, volume=self.current_volume, muted=self.muted,
+            start_position=capture.get_presented_position,
+            has_audio=prepared.info['has_audio'],
+            on_detected=lambda found: self.probe_cache.update(video_path, has_audio=found)
+        )
+
+        # 재생 기록 (SQLite 쓰기는 백그라운드)
+        threading.Thread(
+            target=self._record_play, args=(video_path, dict(prepared.info)),
+            daemon=True, name="CatalogWriter"
+        ).start()
+
+        # 비디오 경로 저장
+        self.video_path = video_path
+        self.video_duration = prepared.info['duration']
+        if self.playlist_engine:
+            self.playlist_engine.start_item(self.video_capture.loop_count)
+        return previous
+
+    def request_video_swap(self, video_path):
+        """
+        재생 중 비디오 교체 요청 (현재 비디오는 계속 재생)
+
+        다음 비디오를 백그라운드에서 준비하고 버퍼가 차면 poll_pending_swap()이 교체합니다.
+        start_prefetch()로 이미 준비 중인 비디오면 그 준비를 그대로 사용합니다.
+        재생 중인 비디오가 없으면(deep idle 등) 바로 동기 로드합니다.
+
+        Args:
+            video_path: 새 비디오 경로
+        """
+        if self.pending_swap:
+            logger.info("Cancelling pending video swap")
+            self.pending_swap.cancel()
+            self.pending_swap = None
+
+        # 미리 준비한 비디오면 그대로 교체에 사용
+        if self.prefetch is not None:
+            if self.prefetch.video_path == video_path and self.video_capture is not None:
+                logger.info(f"Using prefetched video: {os.path.basename(video_path)}")
+                self.pending_swap, self.prefetch = self.prefetch, None
+                self.performance_monitor.record_prefetch('used')
+                return
+            self.cancel_prefetch()
+
+        if self.video_capture is None:
+            self.show_poster(video_path)
+            if not self.load_video(video_path):
+                logger.error("Failed to load video")
+            return
+
+        logger.info(f"Preparing video in background: {os.path.basename(video_path)}")
+        self.pending_swap = VideoPreparer(
+            lambda path: self.prepare_video(path, prefetch_audio=True, background='swap'), video_path
+        ).start()
+
+    def poll_pending_swap(self):
+        """
+        준비가 끝난 비디오로 교체 (메인 루프에서 프레임 시작 시 호출)
+
+        Returns:
+            bool: 이번 프레임에서 교체했는지 여부
+        """
+        preparer = self.pending_swap
+        if preparer is None or not preparer.is_ready():
+            return False
+        self.pending_swap = None
+
+        prepared = preparer.take()
+        if prepared is None:
+            logger.error(f"Failed to prepare {os.path.basename(preparer.video_path)}, keeping current video")
+            return False
+
+        buffered = prepared.buffered_frames()
+        previous = self.activate_video(prepared)
+        release_async(previous)  # 리더 스레드 join은 백그라운드에서
+
+        self.performance_monitor.record_latency('swap_prepare', preparer.elapsed)
+        logger.info(
+            f"Swapped to {os.path.basename(prepared.video_path)} "
+            f"(prepared in {preparer.elapsed * 1000:.0f}ms, {buffered} frames buffered)"
+        )
+        return True
+
+    def update_playlist(self):
+        """
+        플레이리스트 진행 (메인 루프에서 매 프레임 호출)
+
+        교체 prefetch_lead초 전에 다음 항목을 미리 준비하고, 교체 시점에는
+        request_video_swap()이 준비된 캡처를 그대로 사용합니다.
+        """
+        engine = self.playlist_engine
+        capture = self.video_capture
+        if engine is None or capture is None:
+            return
+
+        # 활성 재생 시간만 누적 (idle로 멈춘 시간은 1초로 제한)
+        now = time.monotonic()
+        if self.last_playlist_update is not None:
+            engine.update(min(1.0, now - self.last_playlist_update))
+        self.last_playlist_update = now
+
+        # 사용자 교체가 진행 중이면 그쪽이 우선
+        if self.pending_swap:
+            return
+
+        loop_count = capture.loop_count
+        position = capture.get_presented_position()
+        if self.prefetch is None and engine.should_prefetch(loop_count, position, self.video_duration):
+            self.start_prefetch(engine.playlist.peek_next())
+        if engine.should_advance(loop_count, position, self.video_duration):
+            video_path = engine.playlist.advance()
+            logger.info(f"Playlist advance: {os.path.basename(video_path)}")
+            self.request_video_swap(video_path)
+
+    def update_schedule(self):
+        """
+        시간대별 스케줄 진행 (메인 루프에서 매 프레임 호출)
+
+        다음 전환 schedule_prefetch_seconds 전에 비디오를 미리 준비하고,
+        전환 시각이 되면 handle_video_reload()로 교체합니다.
+        """
+        schedule = self.schedule
+        if schedule is None or self.video_capture is None:
+            return
+
+        now = schedule.clock()
+        if self.schedule_next is None:
+            self.schedule_next = schedule.next_switch(now)
+            logger.info(f"Next scheduled wallpaper: {os.path.basename(self.schedule_next[1])} "
+                        f"at {self.schedule_next[0]:%H:%M:%S}")
+        when, video_path = self.schedule_next
+
+        if now >= when:
+            # 절전 복귀 등으로 여러 전환을 건너뛴 경우에도 지금 시각의 항목으로
+            self.schedule_next = None
+            target = schedule.current_item(now)
+            if target != self.video_path:
+                logger.info(f"Scheduled switch: {os.path.basename(target)}")
+                self.reload_video_path = target
+                self.reload_video_flag = True
+            return
+
+        if self.prefetch is None and video_path != self.video_path and not self.pending_swap and \
+                (when - now).total_seconds() <= self.schedule_prefetch_lead:
+            self.start_prefetch(video_path)
+
+    def start_prefetch(self, video_path):
+        """
+        다음에 재생할 비디오를 미리 준비 (프로브, 오디오 캐시, 포스터, 첫 1초 디코딩)
+
+        교체 시각까지 여유가 있으므로 준비 스레드와 디코딩 스레드의 우선순위를 낮추고 (Windows)
+        재생 속도 이상으로 디코딩하지 않아 재생 중인 비디오의 프레임 시간에 영향을 주지 않습니다.
+
+        교체는 같은 경로로 request_video_swap()을 호출할 때 이 준비를 사용합니다.
+        """
+        logger.info(f"Prefetching next video: {os.path.basename(video_path)}")
+        self.prefetch = VideoPreparer(
+            lambda path: self.prepare_video(path, prefetch_audio=True, background='prefetch'),
+            video_path,
+            on_buffered=self._save_prefetched_poster,
+            low_priority=True
+        ).start()
+        self.prefetch_accounted = False
+        self.performance_monitor.record_prefetch('started')
+
+    def poll_prefetch(self):
+        """prefetch 완료/실패 기록 (메인 루프에서 매 프레임 호출)"""
+        prefetch = self.prefetch
+        if prefetch is None or self.prefetch_accounted or not prefetch.is_ready():
+            return
+        self.prefetch_accounted = True
+        if prefetch.failed:
+            logger.warning(f"Prefetch failed: {os.path.basename(prefetch.video_path)}")
+            self.performance_monitor.record_prefetch('failed')
+        else:
+            logger.info(f"Prefetch ready: {os.path.basename(prefetch.video_path)} in {prefetch.elapsed * 1000:.0f}ms")
+            self.performance_monitor.record_prefetch('ready', prefetch.elapsed)
+
+    def cancel_prefetch(self):
+        """준비 중이거나 준비된 prefetch 버리기 (사용하지 않은 준비로 기록)"""
+        if self.prefetch is None:
+            return
+        self.prefetch.cancel()
+        self.prefetch = None
+        if self.performance_monitor:
+            self.performance_monitor.record_prefetch('wasted')
+
+    def _save_prefetched_poster(self, prepared):
+        """prefetch한 비디오의 첫 프레임을 포스터로 저장 (VideoPreparer 스레드)"""
+        if self.poster_cache.has_poster(prepared.video_path):
+            return
+        frame = prepared.peek_frame()
+        if frame is not None:
+            self.poster_cache.save_poster(prepared.video_path, frame)
+
+    def checkpoint_position(self, force=False):
+        """
+        현재 재생 위치 저장 (PlaybackState가 간격을 제한하므로 매 프레임 호출 가능)
+
+        렌더 스레드에서는 위치만 넘기고 파일 기록은 PlaybackState의 writer 스레드가 합니다.
+        위치는 항상 기록하고 resume_playback 설정은 시작 위치를 정할 때만 적용합니다.
+
+        Args:
+            force: 간격과 무관하게 저장 (전환/종료 시)
+        """
+        if not self.video_capture:
+            return
+        self.playback_state.checkpoint(self.video_path, self.video_capture.get_presented_position(), force=force)
+
+    def show_poster(self, video_path):
+        """
+        캐시된 포스터 프레임을 즉시 화면에 표시
+
+        Args:
+            video_path: 비디오 파일 경로
+
+        Returns:
+            bool: 표시 여부 (포스터가 없으면 False)
+        """
+        if not video_path:
+            return False
+        frame = self.poster_cache.load(video_path, prefer_last=config.get_poster_last_frame())
+        if frame is None:
+            return False
+
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+        surface = pygame.transform.smoothscale(surface, (self.work_area_width, self.work_area_height))
+
+        self.last_frame_surface = surface
+        self.screen.blit(surface, (0, 0))
+        pygame.display.flip()
+        logger.info(f"Poster frame shown: {os.path.basename(video_path)}")
+        return True
+
+    def _save_poster_async(self, video_path, frame):
+        """첫 디코딩 프레임을 포스터로 저장 (JPEG 인코딩은 백그라운드)"""
+        threading.Thread(
+            target=self.poster_cache.save_poster, args=(video_path, frame),
+            daemon=True, name="PosterWriter"
+        ).start()
+
+    def _record_play(self, video_path, info):
+        """카탈로그에 재생 기록 (백그라운드 스레드)"""
+        try:
+            self.catalog.record_play(video_path, info)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record play in library catalog: {e}")
+
+    def _create_performance_monitor(self, target_fps, max_fps, resolution_scale):
+        """
+        설정 기반 PerformanceMonitor 생성 (컨트롤러, 트레이스 포함)
+
+        Args:
+            target_fps: 목표 FPS
+            max_fps: 최대 FPS (비디오 원본 FPS)
+            resolution_scale: 사용자 해상도 스케일 (컨트롤러 복구 상한)
+
+        Returns:
+            PerformanceMonitor
+        """
+        min_fps = 15
+        controller = create_controller(
+            config.get_fps_controller(),
+            min_fps=min_fps,
+            max_fps=max(min_fps, max_fps),
+            min_scale=0.5,
+            max_scale=resolution_scale,
+            cpu_budget=config.get_cpu_budget(),
+            frame_deadline_ms=config.get_frame_deadline_ms(),
+            max_drop_rate=config.get_max_drop_rate()
+        )
+
+        trace_path = None
+        if config.get_controller_trace():
+            trace_path = os.path.join(get_log_dir(), "controller_trace.csv")
+
+        return PerformanceMonitor(
+            target_fps=target_fps,
+            min_fps=min_fps,
+            max_fps=max_fps,
+            controller=controller,
+            scale=resolution_scale,
+            trace_path=trace_path
+        )
+
+    def _get_output_size(self, scale):
+        """
+        해상도 스케일이 적용된 디코딩 출력 크기
+
+        Args:
+            scale: 해상도 스케일 (0.5 ~ 1.0)
+
+        Returns:
+            tuple: (width, height)
+        """
+        return (max(1, int(self.work_area_width * scale)), max(1, int(self.work_area_height * scale)))
+
+    def report_startup_timeline(self):
+        """첫 프레임 표시 시점에 시작 타임라인 기록 및 로그 출력"""
+        first_decode = self.video_capture.first_frame_time if self.video_capture else None
+        if first_decode is not None:
+            self.startup_timeline.mark('first_decode', first_decode)
+        self.startup_timeline.mark('first_present')
+        self.startup_timeline.report(logger)
+
+    def start_metrics_server(self):
+        """설정에서 활성화된 경우 localhost 메트릭 서버 시작"""
+        if not config.get_metrics_enabled():
+            return
+        from metrics_server import MetricsServer
+        self.metrics_server = MetricsServer(self.collect_metrics, port=config.get_metrics_port())
+        if not self.metrics_server.start():
+            self.metrics_server = None
+
+    def start_control_server(self):
+        """설정에서 활성화된 경우 localhost 제어 서버 시작"""
+        if not config.get_control_enabled():
+            return
+        from control_server import ControlServer
+        self.control_server = ControlServer(self.collect_metrics, port=config.get_control_port())
+        if not self.control_server.start():
+            self.control_server = None
+
+    def collect_metrics(self):
+        """
+        메트릭 스냅샷 수집 (MetricsServer 스레드에서 호출)
+
+        렌더 루프와 락을 공유하지 않고 현재 값을 읽기만 합니다.
+
+        Returns:
+            dict: 메트릭 스냅샷
+        """
+        monitor = self.performance_monitor
+        capture = self.video_capture
+
+        metrics = monitor.get_stats() if monitor else {}
+        metrics['idle'] = self.is_idle
+        metrics['paused'] = self.manual_pause
+        metrics['extended_idle'] = self.extended_idle
+
+        if capture:
+            metrics['queue_depth'] = capture.queue.qsize()
+            metrics['queue_size'] = capture.queue_size
+            metrics['loop_count'] = capture.loop_count
+
+            audio_position = self.audio_manager.get_position(self.video_duration)
+            if audio_position is not None:
+                drift = capture.get_presented_position() - audio_position
+                # 루프 경계를 넘는 경우 [-duration/2, duration/2] 범위로 보정
+                half = self.video_duration / 2.0
+                if drift > half:
+                    drift -= self.video_duration
+                elif drift < -half:
+                    drift += self.video_duration
+                metrics['audio_drift_seconds'] = drift
+
+        return metrics
+
+    def start_mouse_thread(self):
+        """마우스 입력 감지 스레드 시작"""
+        if self.input_sampler is None:
+            self.input_sampler = InputSampler(
+                Win32InputSource(), self.hwnd,
+                (self.work_area_left, self.work_area_top, self.work_area_width, self.work_area_height)
+            )
+        self.mouse_thread = threading.Thread(target=self._mouse_input_loop, daemon=True, name="MouseInput")
+        self.mouse_thread.start()
+        logger.info("Mouse input thread started")
+
+    def _mouse_input_loop(self):
+        """
+        마우스 입력 감지 루프 (별도 스레드)
+
+        기능:
+        1. 마우스 위치 감지 및 버튼 호버
+        2. 클릭 감지 (음소거, 설정)
+        3. 볼륨 슬라이더 드래그
+        4. Idle 타이머 관리 (바탕화면이 실제로 보일 때만)
+
+        커서가 멈춰 있으면 폴링 간격을 늘리고(최대 10Hz, idle 5Hz), 아이콘 위에 있거나
+        드래그 중이면 50Hz를 유지합니다. 커서 아래 윈도우 확인은 활동 기록이
+        activity_coalesce초보다 오래되었을 때만 합니다 (idle 판정은 수십 초 단위).
+        """
+        sampler = self.input_sampler
+        ui = self.ui_manager
+        activity_coalesce = 0.5
+        prev_state = False
+        last_click_time = 0
+        is_in_icon_area = False
+
+        while self.running:
+            sample = None
+            try:
+                sample = sampler.sample()
+                if sample is None:
+                    time.sleep(0.1)
+                    continue
+                rel_x, rel_y = sample.rel_x, sample.rel_y
+
+                # 아이콘 영역 호버 체크 (커서가 움직였을 때만 다시 계산)
+                if sample.moved:
+                    is_in_icon_area = ui.update_hover(rel_x, rel_y)
+                if is_in_icon_area:
+                    ui.on_mouse_move()
+
+                # 마우스 움직임 감지 (Idle 타이머 관리)
+                # 바탕화면이 실제로 보이는 상태에서만 마우스 움직임 감지
+                if sample.moved and time.time() - self.last_activity_time > activity_coalesce and \
+                        sampler.in_work_area(sample.x, sample.y):
+                    try:
+                        if sampler.is_desktop_at(sample.x, sample.y):
+                            # 바탕화면이 보이는 상태에서만 idle 타이머 리셋
+                            self.last_activity_time = time.time()
+                    except Exception as e:
+                        logger.error(f"Error checking window under cursor: {e}")
+
+                # 마우스 버튼 상태
+                current_state = sample.button
+
+                # 커서 아래 컨트롤 (UIManager 히트 테스트 맵, 호버 갱신 시 함께 계산)
+                action = ui.hover_action
+
+                # 볼륨 슬라이더 드래그
+                if current_state and ui.show_icons:
+                    if action == 'volume':
+                        self.dragging_volume = True
+                        volume_ratio = ui.volume_at(rel_x)
+                        if volume_ratio != self.current_volume:
+                            self.current_volume = volume_ratio
+                            config.set_volume(volume_ratio)
+                            self.mouse_clicked = True
+                else:
+                    self.dragging_volume = False
+
+                # 클릭 감지 (버튼 눌렀다 뗐을 때)
+                if prev_state and not current_state:
+                    current_time = time.time()
+                    if current_time - last_click_time > 0.3 and ui.show_icons:  # 디바운싱
+                        if action == 'mute':
+                            self.muted = not self.muted
+                            config.set_muted(self.muted)
+                            last_click_time = current_time
+                            self.mouse_clicked = True
+                        elif action == 'settings':
+                            self.settings_clicked = True
+                            last_click_time = current_time
+
+                prev_state = current_state
+
+            except Exception as e:
+                logger.error(f"Error in mouse input loop: {e}")
+                time.sleep(0.1)
+                continue
+
+            # 적응형 폴링 (멈춰 있으면 간격 증가, 움직이거나 UI 위/드래그 중이면 50Hz)
+            hot = is_in_icon_area or self.dragging_volume or prev_state
+            time.sleep(sampler.next_interval(self.is_idle, hot=hot, moved=sample.moved))
+
+        logger.info("Mouse input thread stopped")
+
+    def handle_settings_window(self):
+        """
+        설정 창 처리
+
+        설정 창은 별도 프로세스에서 실행되고, 여기서는 도착한 메시지만 적용합니다
+        (Tk 이벤트 처리나 설정 파일 읽기 없음).
+        """
+        if self.settings_clicked:
+            self.settings_clicked = False
+
+            if self.settings_window is None or not self.settings_window.is_open():
+                logger.info("Opening settings window")
+
+                # 비디오/오디오 싱크를 위해 재시작
+                if self.video_capture:
+                    self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                if self.audio_manager.has_audio:
+                    self.audio_manager.rewind()
+
+                try:
+                    self.settings_window = SettingsProcess().start()
+                except Exception as e:
+                    logger.error(f"Failed to open settings window: {e}", exc_info=True)
+                    self.settings_window = None
+
+        if self.settings_window is None:
+            return
+
+        for message in self.settings_window.poll():
+            self.apply_settings_message(message)
+            if not self.running:
+                break
+
+        if not self.settings_window.is_open():
+            self.settings_window.close(terminate=not self.running)
+            self.settings_window = None
+
+    def apply_settings_message(self, message):
+        """
+        설정 창 메시지 적용 (설정 파일을 다시 읽지 않음)
+
+        Args:
+            message: settings_ipc 메시지 {'type': ..., 'value': ...}
+        """
+        kind, value = message['type'], message['value']
+        if kind == MSG_VOLUME:
+            self.current_volume = float(value)
+            self.mouse_clicked = True  # handle_audio_update가 오디오에 적용
+        elif kind == MSG_MUTED:
+            self.muted = bool(value)
+            self.mouse_clicked = True
+        elif kind == MSG_OPACITY:
+            self.icon_opacity = config.actual_icon_opacity(value)
+            self.ui_manager.set_icon_opacity(self.icon_opacity)
+        elif kind == MSG_FPS:
+            self.set_target_fps(int(value))
+        elif kind == MSG_VIDEO:
+            logger.info(f"Video change requested: {value}")
+            self.reload_video_path = value
+            self.reload_video_flag = True
+        elif kind == MSG_QUIT:
+            logger.info("User requested to quit")
+            self.running = False
+        elif kind == MSG_CLOSED:
+            if (value or {}).get('saved'):
+                logger.info(f"Settings saved - Volume: {int(self.current_volume * 100)}%, Muted: {self.muted}")
+            else:
+                # 취소/창 닫기: 미리보기 값을 버리고 설정 파일 값으로 복원 (창을 닫을 때 한 번)
+                self.reload_settings_from_config()
+
+    def reload_settings_from_config(self):
+        """설정 파일의 볼륨/음소거/투명도/FPS를 다시 적용"""
+        self.current_volume = config.get_volume()
+        self.muted = config.get_muted()
+        self.icon_opacity = config.get_actual_icon_opacity()
+        self.ui_manager.set_icon_opacity(self.icon_opacity)
+        self.mouse_clicked = True
+        self.set_target_fps(config.get_target_fps())
+        logger.info(f"Settings restored - Volume: {int(self.current_volume * 100)}%, Muted: {self.muted}")
+
+    def set_target_fps(self, fps):
+        """목표 FPS 즉시 적용 (컨트롤러와 디코딩 스레드)"""
+        if self.performance_monitor is None or fps == self.performance_monitor.original_target_fps:
+            return
+        self.performance_monitor.set_target_fps(fps)
+        if self.video_capture:
+            self.video_capture.update_fps(self.performance_monitor.target_fps)
+
+    def set_resolution_scale(self, scale):
+        """해상도 스케일 즉시 적용 (컨트롤러 상한과 디코딩 출력 크기)"""
+        if self.performance_monitor is None:
+            return
+        self.performance_monitor.set_scale(scale)
+        if self.video_capture:
+            self.video_capture.set_output_size(self._get_output_size(self.performance_monitor.scale))
+
+    def handle_control_commands(self, commands=None):
+        """
+        제어 서버 명령 적용 (프레임 경계에서 호출)
+
+        Args:
+            commands: 이미 받은 명령 목록 (None이면 대기 없이 큐에서 가져옴)
+        """
+        if self.control_server is None:
+            return
+        if commands is None:
+            commands = self.control_server.pending()
+        for command in commands:
+            try:
+                command.complete(self.apply_control_command(command.command, command.value))
+            except ValueError as e:
+                command.fail(e)
+            except Exception as e:
+                logger.error(f"Control command '{command.command}' failed: {e}", exc_info=True)
+                command.fail(e)
+
+    def apply_control_command(self, command, value):
+        """
+        제어 명령 하나 적용
+
+        Returns:
+            dict: 적용 후 상태 (클라이언트에 응답)
+
+        Raises:
+            ValueError: 지금 적용할 수 없는 명령
+        """
+        logger.info(f"Control command: {command}" + ("" if value is None else f" {value}"))
+        if command == 'pause':
+            self.manual_pause = True
+            return {'paused': True}
+        if command == 'resume':
+            # 사용자 활동으로 취급 (idle 타이머로 바로 다시 멈추지 않도록)
+            self.manual_pause = False
+            self.last_activity_time = time.time()
+            return {'paused': False}
+        if command == 'next':
+            if self.playlist_engine is None:
+                raise ValueError("No playlist is active")
+            return self.queue_video_reload(self.playlist_engine.playlist.advance())
+        if command == 'set-volume':
+            self.current_volume = value
+            self.mouse_clicked = True  # handle_audio_update가 오디오에 적용
+            config.set_volume(value)  # 설정 파일 감시가 이전 값으로 되돌리지 않도록
+            return {'volume': value}
+        if command == 'set-fps':
+            self.set_target_fps(value)
+            return {'target_fps': self.performance_monitor.target_fps if self.performance_monitor else value}
+        if command == 'set-scale':
+            self.set_resolution_scale(value)
+            return {'scale': self.performance_monitor.scale if self.performance_monitor else value}
+        if command == 'open':
+            if not os.path.exists(value):
+                raise ValueError(f"Video file not found: {value}")
+            return self.queue_video_reload(value)
+        if command == 'reload':
+            return self.queue_video_reload(None)
+        raise ValueError(f"Unsupported command: {command}")
+
+    def queue_video_reload(self, video_path):
+        """
+        제어 명령(open, next, reload, 두 번째 실행의 인자)으로 비디오 교체 예약
+
+        교체는 재생 경로의 handle_video_reload에서만 적용되므로, 직접 요청한 교체는 사용자 활동으로
+        취급해 idle 상태에서도 다음 반복에 깨어나 바로 교체합니다.
+        pause 명령으로 멈춘 상태는 resume까지 유지되므로 교체도 그때 적용됩니다 (응답의 deferred).
+
+        Args:
+            video_path: 새 비디오 (None이면 설정 파일의 비디오)
+
+        Returns:
+            dict: video, deferred
+        """
+        self.reload_video_path = video_path
+        self.reload_video_flag = True
+        self.last_activity_time = time.time()
+        return {'video': video_path or config.get_video_path(), 'deferred': self.manual_pause}
+
+    def handle_audio_update(self):
+        """오디오 볼륨/음소거 업데이트, 캡처 재초기화 후 오디오 위치 재동기화"""
+        capture = self.video_capture
+        if capture and capture.reinit_count != self.synced_reinit_count:
+            self.synced_reinit_count = capture.reinit_count
+            self.audio_manager.seek(capture.get_presented_position())
+
+        if self.mouse_clicked:
+            if self.audio_manager.has_audio:
+                if self.muted:
+                    self.audio_manager.set_muted(True)
+                else:
+                    self.audio_manager.set_muted(False)
+                    self.audio_manager.set_volume(self.current_volume)
+            self.mouse_clicked = False
+
+    def handle_video_reload(self):
+        """비디오 재로드 처리"""
+        if not self.reload_video_flag:
+            return
+
+        self.reload_video_flag = False
+        new_video_path = self.reload_video_path or config.get_video_path()
+        self.reload_video_path = None
+
+        if new_video_path and os.path.exists(new_video_path):
+            logger.info(f"Reloading video: {os.path.basename(new_video_path)}")
+
+            # 현재 비디오는 계속 재생하면서 백그라운드에서 준비 후 교체
+            self.request_video_swap(new_video_path)
+        else:
+            logger.error(f"Video file not found: {new_video_path}")
+
+    def check_config_updates(self):
+        """설정 파일 변경 감지 (주기적, 설정 창이 열려 있으면 메시지로 받으므로 건너뜀)"""
+        if self.settings_window is not None:
+            return
+        current_time = time.time()
+        if current_time - self.last_config_check_time < self.config_check_interval:
+            return
+
+        self.last_config_check_time = current_time
+
+        new_volume = config.get_volume()
+        new_muted = config.get_muted()
+        new_icon_opacity = config.get_actual_icon_opacity()
+
+        # 볼륨/음소거 변경
+        if new_volume != self.current_volume or new_muted != self.muted:
+            self.current_volume = new_volume
+            self.muted = new_muted
+            if self.audio_manager.has_audio:
+                if self.muted:
+                    self.audio_manager.set_muted(True)
+                else:
+                    self.audio_manager.set_volume(self.current_volume)
+
+        # 투명도 변경
+        if new_icon_opacity != self.icon_opacity:
+            self.icon_opacity = new_icon_opacity
+            self.ui_manager.set_icon_opacity(new_icon_opacity)
+
+    def check_idle_mode(self):
+        """
+        Idle 모드 체크
+        - 60초 idle 또는 pause 명령: 비디오 멈춤
+        - 5분 idle: 자동 음소거 (복귀 시에도 음소거 유지)
+
+        Returns:
+            bool: Idle 상태 여부
+        """
+        current_time = time.time()
+        idle_duration = current_time - self.last_activity_time
+
+        # 60초 이상 idle 또는 제어 명령으로 멈춤 (비디오 멈춤)
+        if self.manual_pause or idle_duration > self.idle_threshold:
+            if not self.is_idle:
+                self.is_idle = True
+                if self.video_capture:
+                    self.video_capture.pause()
+                if self.performance_monitor:
+                    self.performance_monitor.reset_presentation()
+                logger.info("Playback paused by control command" if self.manual_pause else "Idle mode activated (60s)")
+
+            # 장시간 idle (디코더/오디오 해제)
+            if idle_duration > self.deep_idle_threshold and not self.deep_idle:
+                self.enter_deep_idle()
+
+            # 5분 이상 idle (자동 음소거)
+            if idle_duration > self.extended_idle_threshold:
+                if not self.extended_idle:
+                    self.extended_idle = True
+                    # 음소거 처리 (복귀 시에도 유지됨)
+                    if not self.muted and self.audio_manager.has_audio:
+                        self.muted = True
+                        self.audio_manager.set_muted(True)
+                        config.set_muted(True)
+                        logger.info("Extended idle: Auto-muted (5min, persists on return)")
+
+            return True
+        else:
+            # Activity 복귀 (비디오만 재개, 음소거는 유지)
+            if self.is_idle:
+                self.is_idle = False
+                if self.deep_idle:
+                    self.exit_deep_idle()
+                elif self.video_capture:
+                    self.video_capture.resume()
+                logger.info("Idle mode deactivated (video resumed, mute state preserved)")
+
+            # Extended idle 플래그 리셋 (음소거는 그대로)
+            if self.extended_idle:
+                self.extended_idle = False
+
+            # 주의: last_activity_time은 여기서 갱신하지 않음!
+            # 실제 사용자 활동(마우스/키보드/버튼 클릭)이 있을 때만 갱신됨
+            return False
+
+    def enter_deep_idle(self):
+        """
+        Deep idle 진입 - 디코더, 프레임 버퍼, 오디오 장치 해제
+
+        재생 위치를 저장하고 화면 다시 그리기용 축소 정지 화면만 유지합니다.
+        """
+        logger.info("Deep idle: releasing decoder and audio")
+        if self.pending_swap:
+            # 준비 중인 교체는 취소하고 복귀 후 다시 요청
+            self.reload_video_path = self.pending_swap.video_path
+            self.pending_swap.cancel()
+            self.pending_swap = None
+            self.reload_video_flag = True
+        self.cancel_prefetch()  # 복귀 후 필요하면 다시 준비
+        self.checkpoint_position(force=True)
+        self.deep_idle_position = self.video_capture.get_presented_position() if self.video_capture else 0.0
+
+        if self.last_frame_surface is not None:
+            width, height = self.last_frame_surface.get_size()
+            self.idle_still = pygame.transform.smoothscale(
+                self.last_frame_surface, (max(1, width // 4), max(1, height // 4))
+            )
+        self.last_frame_surface = None
+        self.last_frame_bgr = None
+
+        if self.video_capture:
+            self.video_capture.release()
+            self.video_capture = None
+        self.audio_manager.release_mixer()
+
+        self.deep_idle = True
+
+    def exit_deep_idle(self):
+        """
+        Deep idle 해제 - 저장된 위치에서 재생 복원
+
+        Returns:
+            bool: 복원 성공 여부
+        """
+        restore_start = time.perf_counter()
+        self.deep_idle = False
+        if self.idle_still is not None:
+            self.last_frame_surface = pygame.transform.scale(
+                self.idle_still, (self.work_area_width, self.work_area_height)
+            )
+            self.idle_still = None
+
+        restored = self.load_video(self.video_path, start_position=self.deep_idle_position)
+        elapsed = time.perf_counter() - restore_start
+        if self.performance_monitor:
+            self.performance_monitor.record_latency('deep_idle_restore', elapsed)
+        logger.info(f"Deep idle exit: playback restored at {self.deep_idle_position:.2f}s in {elapsed * 1000:.0f}ms")
+        return restored
+
+    def redraw_idle_still(self):
+        """deep idle 중 창이 다시 노출되면 축소 정지 화면을 확대해 그리기"""
+        if self.idle_still is None:
+            return
+        self.screen.blit(pygame.transform.scale(self.idle_still, (self.work_area_width, self.work_area_height)), (0, 0))
+        pygame.display.flip()
+
+    def process_frame(self):
+        """
+        프레임 처리 및 렌더링
+
+        Returns:
+            bool: 성공 여부
+        """
+        # Idle 모드 처리 (플래그는 main loop에서 이미 설정됨)
+        if self.is_idle:
+            # Idle 상태 - 마지막 프레임 유지
+            if self.last_frame_surface:
+                self.screen.blit(self.last_frame_surface, (0, 0))
+            return True
+
+        # 동적 FPS/해상도 조절
+        if self.performance_monitor:
+            new_fps, changed = self.performance_monitor.adjust_fps()
+            if changed and self.video_capture:
+                if new_fps != self.video_capture.target_fps:
+                    self.video_capture.update_fps(new_fps)
+                output_size = self._get_output_size(self.performance_monitor.scale)
+                if output_size != self.video_capture.output_size:
+                    self.video_capture.set_output_size(output_size)
+
+        # 프레임 읽기
+        if not self.video_capture:
+            return False
+
+        perf_monitor = self.performance_monitor
+        perf_counter = time.perf_counter
+
+        wait_start = perf_counter()
+        ret, frame = self.video_capture.read(timeout=0.05)
+        self.frame_wait_time = perf_counter() - wait_start
+        perf_monitor.record_latency('queue_wait', self.frame_wait_time)
+
+        if not ret or frame is None:
+            # 빈 큐 - 원인 기록 (드롭 수는 다음 표시 시점에 확정)
+            perf_monitor.record_empty_read('loop_stall' if self.video_capture.is_loop_stall() else 'starvation')
+
+            # 프레임 읽기 실패 - 마지막 프레임 유지
+            if self.last_frame_surface:
+                self.screen.blit(self.last_frame_surface, (0, 0))
+            # Queue가 비어있을 때 CPU 사용을 줄이기 위해 대기
+            time.sleep(0.05)
+            self.frame_wait_time += 0.05
+            return True
+
+        # 포스터 프레임 (비디오당 최초 1회) / 종료 시 저장할 마지막 프레임
+        if self.poster_pending:
+            self.poster_pending = False
+            self._save_poster_async(self.video_path, frame)
+        self.last_frame_bgr = frame
+
+        # 비디오 교체 크로스페이드 (디코딩 해상도에서 혼합)
+        if self.crossfade.active:
+            blend_start = perf_counter()
+            frame = self.crossfade.blend(frame, blend_start)
+            perf_monitor.record_latency('crossfade', perf_counter() - blend_start)
+
+        # OpenCV BGR → RGB
+        convert_start = perf_counter()
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # numpy → pygame surface
+        frame = frame.swapaxes(0, 1)  # (height, width, 3) → (width, height, 3)
+        surface = pygame.surfarray.make_surface(frame)
+
+        # pygame.transform.scale로 리사이징
+        scale_start = perf_counter()
+        perf_monitor.record_latency('convert', scale_start - convert_start)
+        surface = pygame.transform.scale(surface, (self.work_area_width, self.work_area_height))
+        perf_monitor.record_latency('scale', perf_counter() - scale_start)
+
+        # 마지막 프레임 저장
+        self.last_frame_surface = surface
+
+        # 화면에 그리기
+        self.screen.blit(surface, (0, 0))
+
+        # 성능 기록 (표시 간격으로 놓친 슬롯 분류)
+        perf_monitor.record_present()
+        self.frame_presented = True
+
+        return True
+
+    def run(self):
+        """메인 실행 루프"""
+        try:
+            logger.info("Starting main loop")
+
+            # 제어 서버 (python main.py ctl ..., 두 번째 실행의 인자 전달)
+            # 비디오 로드 전에 시작 - 받은 명령은 첫 프레임부터 적용
+            self.start_control_server()
+
+            # 비디오 로드
+            if not self.load_video(self.video_path):
+                logger.error("Failed to load initial video")
+                return
+
+            # 마우스 입력 스레드 시작
+            self.start_mouse_thread()
+
+            # 메트릭 서버 (선택)
+            self.start_metrics_server()
+
+            # 샘플링 프로파일러 (선택, 모든 스레드가 시작된 뒤)
+            if self.profile_seconds:
+                from profiler import start_profiling_if_requested
+                self.profiler = start_profiling_if_requested(self.profile_seconds)
+
+            # 메인 루프
+            while self.running:
+                frame_start = time.perf_counter()
+                self.frame_wait_time = 0.0
+
+                # Idle 체크 (가장 먼저 - CPU 절약 + UI 숨김)
+                self.check_idle_mode()  # 비디오 멈춤 + 자동 음소거
+                self.ui_manager.check_idle()  # UI 아이콘 숨김
+
+                # Idle 상태일 때는 최소한의 처리만 수행
+                if self.is_idle:
+                    # pygame 이벤트 처리 (QUIT, deep idle 중 다시 그리기)
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            self.running = False
+                        elif event.type == pygame.VIDEOEXPOSE and self.deep_idle:
+                            self.redraw_idle_still()
+
+                    # Idle 상태에서는 거의 모든 처리를 건너뜀
+                    # 1초 대기 (clock.tick 대신) - 제어 명령이 오면 바로 깨어나 적용
+                    if self.control_server:
+                        self.handle_control_commands(self.control_server.wait(1.0))
+                    else:
+                        time.sleep(1.0)
+                    continue
+
+                # === Active 상태 처리 ===
+
+                # pygame 이벤트 처리
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+
+                # 설정 창 처리
+                self.handle_settings_window()
+                if not self.running:
+                    break
+
+                # 제어 명령 (서버 스레드가 받은 명령을 프레임 경계에서 적용)
+                self.handle_control_commands()
+                if self.manual_pause:
+                    continue  # 다음 반복의 idle 체크에서 멈춤
+
+                # 오디오 업데이트
+                self.handle_audio_update()
+
+                # 비디오 재로드 (준비 완료된 교체는 프레임 경계에서 적용)
+                self.poll_pending_swap()
+                self.poll_prefetch()
+                self.update_schedule()
+                self.handle_video_reload()
+                self.update_playlist()
+
+                # 재생 위치 체크포인트 (5초 간격)
+                self.checkpoint_position()
+
+                # 설정 변경 감지
+                stage_start = time.perf_counter()
+                self.check_config_updates()
+                perf_monitor = self.performance_monitor
+                perf_monitor.record_latency('config_check', time.perf_counter() - stage_start)
+
+                # 프레임 처리
+                self.process_frame()
+
+                # UI 렌더링
+                stage_start = time.perf_counter()
+                self.ui_manager.render(self.screen, self.muted, self.current_volume)
+                perf_monitor.record_latency('ui_render', time.perf_counter() - stage_start)
+
+                # 화면 업데이트
+                stage_start = time.perf_counter()
+                pygame.display.flip()
+                perf_monitor.record_latency('flip', time.perf_counter() - stage_start)
+
+                # 첫 프레임 표시 시 시작 타임라인 출력
+                if self.frame_presented and not self.startup_timeline.reported:
+                    self.report_startup_timeline()
+
+                # 프레임 처리 시간 기록 (컨트롤러 입력, 큐 대기 및 tick 대기 제외)
+                perf_monitor.record_frame_time(time.perf_counter() - frame_start - self.frame_wait_time)
+
+                # FPS 제어
+                self.clock.tick(perf_monitor.target_fps)
+
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user (Ctrl+C)")
+        except Exception as e:
+            logger.critical(f"Fatal error in main loop: {e}", exc_info=True)
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """리소스 정리"""
+        logger.info("Cleaning up resources...")
+
+        # 메트릭/제어 서버 정리
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.control_server:
+            self.control_server.stop()
+
+        # 프로파일러 정리 (진행 중이면 지금까지의 결과 기록)
+        if self.profiler:
+            self.profiler.stop()
+
+        # 설정 창 프로세스 정리
+        if self.settings_window is not None:
+            self.settings_window.close(terminate=True)
+            self.settings_window = None
+
+        # 준비 중인 비디오 교체/플레이리스트 prefetch 취소
+        if self.pending_swap:
+            self.pending_swap.cancel()
+            self.pending_swap = None
+        self.cancel_prefetch()
+
+        # 재생 위치 저장 (다음 시작 시 이어서 재생, 종료 시에는 동기로 기록)
+        try:
+            self.checkpoint_position(force=True)
+            self.playback_state.close()
+        except Exception as e:
+            logger.error(f"Error saving playback position: {e}")
+
+        # 마지막 표시 프레임 저장 (다음 시작 시 포스터로 사용)
+        if self.last_frame_bgr is not None and config.get_poster_last_frame():
+            self.poster_cache.save_last_frame(self.video_path, self.last_frame_bgr)
+
+        # 캐시 사용 기록 저장 (LRU 순서)
+        self.cache.flush()
+
+        # 비디오 캡처 정리
+        if self.video_capture:
+            try:
+                self.video_capture.release()
+            except Exception as e:
+                logger.error(f"Error releasing video capture: {e}")
+
+        # 오디오 정리
+        if self.audio_manager:
+            try:
+                self.audio_manager.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up audio: {e}")
+
+        # pygame 종료
+        try:
+            pygame.quit()
+        except Exception as e:
+            logger.error(f"Error quitting pygame: {e}")
+
+        # 성능 통계 출력
+        if self.performance_monitor:
+            self.performance_monitor.close()
+            stats = self.performance_monitor.get_stats()
+            logger.info("=" * 70)
+            logger.info("Performance Statistics:")
+            logger.info(f"  Total Frames: {stats['total_frames']}")
+            logger.info(f"  Dropped Frames: {stats['dropped_frames']}")
+            logger.info(f"  Drop Rate: {stats['drop_rate']:.2f}%")
+            drop_totals = stats['drops']['total']
+            logger.info("  Drops by Cause: " + ", ".join(f"{cause}={count}" for cause, count in drop_totals.items()))
+            logger.info(f"  Final Target FPS: {stats['target_fps']}")
+            logger.info(f"  Final Resolution Scale: {stats['scale']} ({stats['controller']})")
+            logger.info(f"  Avg CPU Usage: {stats['cpu_avg']:.1f}%")
+            if stats['prefetch']['started']:
+                logger.info("  Prefetch: " + ", ".join(f"{event}={count}" for event, count in stats['prefetch'].items()))
+            if stats['latency']:
+                logger.info("  Stage Latency (ms):        count      p50      p95      p99      max")
+                for stage, latency in stats['latency'].items():
+                    logger.info(
+                        f"    {stage:<22}{latency['count']:>10}"
+                        f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}"
+                        f"{latency['p99']:>9.2f}{latency['max']:>9.2f}"
+                    )
+            logger.info("=" * 70)
+
+        logger.info("Cleanup complete. Exiting.")
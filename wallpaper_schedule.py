@@ -0,0 +1,107 @@
+"""
+시간대별 배경화면 스케줄 모듈
+- "07:00 → 아침 영상, 18:00 → 저녁 영상"처럼 하루 중 시작 시각별로 비디오 지정
+- 현재 재생할 항목과 다음 전환 시각 계산 (자정을 넘어 순환)
+- 시계를 주입할 수 있어 실제 시간을 기다리지 않고 확인 가능
+  (실제 준비/전환은 WallpaperApp이 prefetch와 handle_video_reload로 수행)
+"""
+import datetime
+
+from logger import get_logger
+
+logger = get_logger("Schedule")
+
+
+def parse_time_of_day(text):
+    """
+    'HH:MM' 또는 'HH:MM:SS' → 자정 이후 초
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    parts = [int(part) for part in str(text).split(':')]
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"Invalid time of day: {text}")
+    hours, minutes = parts[0], parts[1]
+    seconds = parts[2] if len(parts) == 3 else 0
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ValueError(f"Invalid time of day: {text}")
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class WallpaperSchedule:
+    """
+    하루 단위 순환 스케줄
+
+    사용 예:
+        schedule = WallpaperSchedule([{'start': '07:00', 'video': morning}, {'start': '19:00', 'video': night}])
+        schedule.current_item()          # 지금 재생할 비디오
+        schedule.next_switch()           # (다음 전환 datetime, 비디오)
+    """
+
+    def __init__(self, entries, clock=None):
+        """
+        Args:
+            entries: [{'start': 'HH:MM', 'video': 경로}, ...] (순서 무관, 잘못된 항목은 건너뜀)
+            clock: 현재 시각(datetime)을 반환하는 함수 (None이면 datetime.datetime.now)
+        """
+        self.clock = clock or datetime.datetime.now
+        self.entries = []  # [(자정 이후 초, 비디오 경로)] 시작 시각 순
+        for entry in entries:
+            try:
+                start = parse_time_of_day(entry['start'])
+                video = entry['video']
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid schedule entry {entry!r}: {e}")
+                continue
+            if video:
+                self.entries.append((start, video))
+        self.entries.sort(key=lambda item: item[0])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _seconds_of_day(self, now):
+        return now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+
+    def _index_at(self, now):
+        """now에 해당하는 항목 인덱스 (첫 항목 이전이면 전날 마지막 항목)"""
+        seconds = self._seconds_of_day(now)
+        index = len(self.entries) - 1
+        for i, (start, _) in enumerate(self.entries):
+            if start <= seconds:
+                index = i
+            else:
+                break
+        return index
+
+    def current_item(self, now=None):
+        """
+        지금 재생할 비디오
+
+        Returns:
+            str: 비디오 경로 (스케줄이 비었으면 None)
+        """
+        if not self.entries:
+            return None
+        now = self.clock() if now is None else now
+        return self.entries[self._index_at(now)][1]
+
+    def next_switch(self, now=None):
+        """
+        다음 전환 시각과 비디오
+
+        Returns:
+            tuple: (datetime, 비디오 경로) - 스케줄이 비었으면 (None, None)
+        """
+        if not self.entries:
+            return None, None
+        now = self.clock() if now is None else now
+        index = (self._index_at(now) + 1) % len(self.entries)
+        start, video = self.entries[index]
+
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        when = midnight + datetime.timedelta(seconds=start)
+        if when <= now:
+            when += datetime.timedelta(days=1)
+        return when, video